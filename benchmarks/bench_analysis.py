@@ -0,0 +1,58 @@
+import numpy as np
+
+from growth.spatial.triangulation import LocalTriangulation
+from .common import seed, build_culture
+
+
+class TriangulationSuite:
+    """
+    Benchmarks for triangulating cell positions and filtering edges.
+    """
+
+    params = [1000, 10000]
+    param_names = ['num_points']
+
+    def setup(self, num_points):
+        seed(num_points)
+        radius = np.sqrt(np.random.random(num_points))
+        theta = 2 * np.pi * np.random.random(num_points)
+        self.x, self.y = radius * np.cos(theta), radius * np.sin(theta)
+        self.triangulation = LocalTriangulation(self.x, self.y)
+
+    def time_construct(self, num_points):
+        LocalTriangulation(self.x, self.y)
+
+    def time_filter(self, num_points):
+        self.triangulation.edges
+
+
+class MetricsSuite:
+    """
+    Benchmarks for patch, clone and contact metrics evaluated on a grown culture. The per-generation cache is cleared before each evaluation.
+    """
+
+    params = [500]
+    param_names = ['population']
+
+    def setup(self, population):
+        self.culture = build_culture(population)
+
+    def time_heterogeneity(self, population):
+        self.culture.clear_cache()
+        self.culture.heterogeneity
+
+    def time_patches(self, population):
+        self.culture.clear_cache()
+        self.culture.get_patches().sizes
+
+    def time_clones(self, population):
+        self.culture.clear_cache()
+        self.culture.get_clone_sizes()
+
+    def time_clone_sizes_per_patch(self, population):
+        self.culture.clear_cache()
+        self.culture.clone_sizes_per_patch
+
+    def peakmem_clone_sizes_per_patch(self, population):
+        self.culture.clear_cache()
+        self.culture.clone_sizes_per_patch
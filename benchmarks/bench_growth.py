@@ -0,0 +1,46 @@
+from growth import Culture
+from growth.cells import Inoculum
+from .common import seed
+
+
+class GrowthSuite:
+    """
+    Benchmarks for growing a culture to a target population.
+    """
+
+    params = [100, 250, 500]
+    param_names = ['population']
+    timeout = 600
+
+    def setup(self, population):
+        seed(population)
+
+    def grow(self, population):
+        culture = Culture(reference_population=population)
+        culture.grow(population, division_rate=0.2, recombination_rate=0.2)
+        return culture
+
+    def time_grow(self, population):
+        self.grow(population)
+
+    def peakmem_grow(self, population):
+        self.grow(population)
+
+
+class InoculationSuite:
+    """
+    Benchmarks for seeding large starter populations.
+    """
+
+    params = [1000, 10000, 100000]
+    param_names = ['population']
+
+    def setup(self, population):
+        seed(population)
+
+    def time_disk(self, population):
+        Inoculum.disk(population, reference_population=population).cells
+
+    def time_colonies(self, population):
+        centers = [(-1, 0), (1, 0), (0, 1), (0, -1)]
+        Inoculum.colonies(centers, population // 4, reference_population=population).cells
@@ -0,0 +1,30 @@
+from os.path import dirname, abspath
+from os import environ
+import subprocess
+import sys
+
+
+# repository root, prepended to the path of each interpreter
+ROOT = dirname(dirname(abspath(__file__)))
+
+
+def import_module(name):
+    """ Import module <name> in a fresh interpreter, so that no modules are cached. """
+    env = dict(environ)
+    env['PYTHONPATH'] = ROOT + ':' + env.get('PYTHONPATH', '')
+    subprocess.run([sys.executable, '-c', 'import '+name], env=env, check=True)
+
+
+class ImportSuite:
+    """
+    Benchmarks for importing the package in a fresh interpreter. Runtimes include interpreter startup. The simulation module is all that a headless worker such as run_job.py imports.
+    """
+
+    params = ['numpy', 'growth', 'growth.sweep.simulation', 'growth.microscopy']
+    param_names = ['module']
+
+    def setup(self, name):
+        pass
+
+    def time_import(self, name):
+        import_module(name)
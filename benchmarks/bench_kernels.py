@@ -0,0 +1,72 @@
+import numpy as np
+
+from growth import kernels
+from growth.cells.cells import Cell
+from growth.cells.clones import encode_lineages
+from .common import seed
+
+
+class KernelSuite:
+    """
+    Benchmarks comparing the NumPy and Numba kernel backends. Each kernel is called once during setup so that compilation is excluded from the timings.
+    """
+
+    params = ['numpy', 'numba']
+    param_names = ['backend']
+
+    # number of cells, edges or pixels per kernel call
+    size = 100000
+
+    def setup(self, backend):
+        if backend not in kernels.available_backends():
+            raise NotImplementedError('Backend {:s} is not installed.'.format(backend))
+        kernels.set_backend(backend)
+        seed(0)
+
+        N = self.size
+        self.xy = np.random.random((N, 2))
+        self.chromosomes = np.random.randint(0, 2**8, size=(N, 2))
+        self.recombined = np.random.randint(0, 2**8, size=N)
+        self.jitter = np.random.normal(scale=1e-7, size=(N, 2, 2))
+        self.cells = [Cell(xy, chromosomes) for xy, chromosomes in zip(self.xy[:N//10], self.chromosomes)]
+
+        theta = np.sort(2 * np.pi * np.random.random(N))
+        self.polygon = np.vstack((np.cos(theta), np.sin(theta))).T
+        self.edges = np.random.randint(0, N, size=(3*N, 2))
+        self.nodes = np.random.randint(0, N, size=N//10)
+
+        depths = np.random.randint(10, 20, size=N)
+        self.lineages = [''.join(np.random.choice(['0', '1'], size=d)) for d in depths]
+
+        self.im = np.zeros((1000, 1000))
+        self.rows = np.random.randint(0, 1000, size=N)
+        self.cols = np.random.randint(0, 1000, size=N)
+        self.values = np.random.random(N)
+
+        # compile kernels
+        self.time_divide(backend)
+        self.time_polygon_centroid(backend)
+        self.time_first_edges(backend)
+        self.time_encode_lineages(backend)
+        self.time_accumulate(backend)
+
+    def teardown(self, backend):
+        kernels.set_backend()
+
+    def time_divide(self, backend):
+        kernels.divide(self.xy, self.chromosomes, self.recombined, self.jitter)
+
+    def time_divide_cells(self, backend):
+        Cell.divide_cells(self.cells, recombination_rate=0.5)
+
+    def time_polygon_centroid(self, backend):
+        kernels.polygon_centroid(self.polygon)
+
+    def time_first_edges(self, backend):
+        kernels.first_edges(self.edges, self.nodes)
+
+    def time_encode_lineages(self, backend):
+        encode_lineages(self.lineages)
+
+    def time_accumulate(self, backend):
+        kernels.accumulate(self.im, self.rows, self.cols, self.values)
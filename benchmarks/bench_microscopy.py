@@ -0,0 +1,73 @@
+from growth.measure import MeasurementGenerator
+from growth.microscopy import SyntheticMicroscopy
+from growth import precision
+from .common import seed, build_culture
+
+
+class MeasurementSuite:
+    """
+    Benchmarks for generating synthetic measurements.
+    """
+
+    params = [500]
+    param_names = ['population']
+
+    def setup(self, population):
+        self.culture = build_culture(population)
+        seed()
+
+    def time_measure(self, population):
+        MeasurementGenerator(self.culture, ambiguity=0.1, rho=0.0)
+
+
+class MicroscopySuite:
+    """
+    Benchmarks for rendering and measuring synthetic microscopy.
+    """
+
+    params = [500]
+    param_names = ['population']
+
+    def setup(self, population):
+        culture = build_culture(population)
+        seed()
+        self.data = culture.measure(ambiguity=0.1)
+        self.image = SyntheticMicroscopy(self.data, seed=0)
+
+    def time_render(self, population):
+        SyntheticMicroscopy(self.data, bleedthrough=0.1, seed=0)
+
+    def time_segment_statistics(self, population):
+        self.image.reset_masks()
+        self.image.measure_statistics()
+
+    def peakmem_render(self, population):
+        SyntheticMicroscopy(self.data, bleedthrough=0.1, seed=0)
+
+
+class PrecisionSuite:
+    """
+    Benchmarks for measurement and microscopy in double and single precision.
+    """
+
+    params = ['double', 'single']
+    param_names = ['precision']
+
+    def setup(self, name):
+        precision.set_precision(name)
+        culture = build_culture(500)
+        seed()
+        self.culture = culture
+        self.data = culture.measure(ambiguity=0.1)
+
+    def teardown(self, name):
+        precision.set_precision()
+
+    def time_render(self, name):
+        SyntheticMicroscopy(self.data, bleedthrough=0.1, seed=0)
+
+    def peakmem_render(self, name):
+        SyntheticMicroscopy(self.data, bleedthrough=0.1, seed=0)
+
+    def peakmem_measure(self, name):
+        MeasurementGenerator(self.culture, ambiguity=0.1, rho=0.0)
@@ -0,0 +1,28 @@
+from functools import lru_cache
+import pickle
+import numpy as np
+
+from growth import Culture
+
+
+# fixed seed shared by all benchmarks
+SEED = 0
+
+
+def seed(offset=0):
+    """ Reset the global random number generator. """
+    np.random.seed(SEED + offset)
+
+
+@lru_cache(maxsize=None)
+def _grow_culture(population):
+    """ Returns serialized culture grown to <population> cells. """
+    seed(population)
+    culture = Culture(reference_population=population)
+    culture.grow(population, division_rate=0.2, recombination_rate=0.2)
+    return pickle.dumps(culture, protocol=-1)
+
+
+def build_culture(population):
+    """ Returns fresh copy of a culture grown to <population> cells with a fixed seed. """
+    return pickle.loads(_grow_culture(population))
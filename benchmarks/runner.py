@@ -0,0 +1,238 @@
+"""
+Standalone runner for the asv-style benchmark suite.
+
+Usage:
+
+    python -m benchmarks.runner                  # run and compare to baseline
+    python -m benchmarks.runner --save           # run and overwrite baseline
+    python -m benchmarks.runner -k Metrics       # run matching benchmarks only
+    python -m benchmarks.runner --scaling        # time/memory vs cell count
+
+The same modules may be run with asv via the asv.conf.json at the repository root.
+"""
+
+from os.path import join, dirname, abspath, exists
+from argparse import ArgumentParser
+from importlib import import_module
+from time import perf_counter
+import tracemalloc
+import inspect
+import json
+import gc
+import numpy as np
+import pandas as pd
+
+from growth import Culture
+from .common import seed
+
+
+# benchmark modules
+MODULES = ('bench_growth', 'bench_analysis', 'bench_microscopy', 'bench_kernels',
+           'bench_imports')
+
+# default baseline path
+BASELINE = join(dirname(abspath(__file__)), 'baseline.json')
+
+
+def discover(pattern=None):
+    """
+    Returns list of (name, class, method name, parameter) benchmarks.
+
+    Args:
+
+        pattern (str) - only include benchmarks whose name contains <pattern>
+
+    """
+    benchmarks = []
+    for module_name in MODULES:
+        module = import_module('.'+module_name, __package__)
+        for class_name, cls in inspect.getmembers(module, inspect.isclass):
+            if not class_name.endswith('Suite'):
+                continue
+            for method in dir(cls):
+                if not method.startswith(('time_', 'peakmem_')):
+                    continue
+                for param in getattr(cls, 'params', [None]):
+                    name = '{:s}.{:s}.{:s}({})'.format(
+                        module_name, class_name, method, param)
+                    if pattern is None or pattern in name:
+                        benchmarks.append((name, cls, method, param))
+    return benchmarks
+
+
+def measure(cls, method, param, repeat=3):
+    """
+    Run a single benchmark.
+
+    Args:
+
+        cls (type) - benchmark suite
+
+        method (str) - benchmark method name, prefixed by time_ or peakmem_
+
+        param - benchmark parameter
+
+        repeat (int) - number of timed repetitions
+
+    Returns:
+
+        value (float) - minimum runtime in seconds, or peak traced memory in MB. NaN if the benchmark is skipped by raising NotImplementedError during setup.
+
+    """
+    instance = cls()
+    args = () if param is None else (param,)
+    try:
+        instance.setup(*args)
+    except NotImplementedError:
+        return np.nan
+    func = getattr(instance, method)
+    teardown = getattr(instance, 'teardown', lambda *args: None)
+
+    # measure peak memory allocated during a single call
+    if method.startswith('peakmem_'):
+        gc.collect()
+        tracemalloc.start()
+        func(*args)
+        _, peak = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+        teardown(*args)
+        return peak / 2**20
+
+    # measure minimum runtime, resetting state before each repetition
+    times = []
+    for _ in range(repeat):
+        instance.setup(*args)
+        start = perf_counter()
+        func(*args)
+        times.append(perf_counter() - start)
+    teardown(*args)
+    return min(times)
+
+
+def run(pattern=None, repeat=3, verbose=True):
+    """ Returns dictionary of benchmark results keyed by name. """
+    results = {}
+    for name, cls, method, param in discover(pattern):
+        results[name] = measure(cls, method, param, repeat=repeat)
+        if verbose:
+            print('{:<70s} {:10.4f}'.format(name, results[name]))
+    return results
+
+
+def compare(results, baseline, tolerance=1.5):
+    """
+    Compare results against a baseline.
+
+    Args:
+
+        results (dict) - benchmark results keyed by name
+
+        baseline (dict) - baseline results keyed by name
+
+        tolerance (float) - ratio to baseline above which a benchmark is flagged as a regression
+
+    Returns:
+
+        comparison (pd.DataFrame) - result, baseline and ratio for each benchmark
+
+    """
+    names = sorted(results.keys())
+    comparison = pd.DataFrame({
+        'result': [results[k] for k in names],
+        'baseline': [baseline.get(k, np.nan) for k in names]}, index=names)
+    comparison['ratio'] = comparison.result / comparison.baseline
+    comparison['regression'] = comparison.ratio > tolerance
+    return comparison
+
+
+def scaling_report(populations=(125, 250, 500, 1000), repeat=1):
+    """
+    Measure growth runtime and peak memory against cell count.
+
+    Args:
+
+        populations (iterable) - target population sizes
+
+        repeat (int) - number of repetitions per population, minimum runtime is reported
+
+    Returns:
+
+        report (pd.DataFrame) - population, runtime (s), peak traced memory (MB) and the local log-log scaling exponent of each
+
+    """
+    rows = []
+    for population in populations:
+        times, peaks = [], []
+        for _ in range(repeat):
+            seed(population)
+            gc.collect()
+            tracemalloc.start()
+            start = perf_counter()
+            culture = Culture(reference_population=population)
+            culture.grow(population, division_rate=0.2, recombination_rate=0.2)
+            times.append(perf_counter() - start)
+            peaks.append(tracemalloc.get_traced_memory()[1] / 2**20)
+            tracemalloc.stop()
+        rows.append(dict(target=population,
+                         population=culture.size,
+                         time=min(times),
+                         peakmem=min(peaks)))
+
+    report = pd.DataFrame(rows)
+    log_size = np.log(report.population)
+    for key in ('time', 'peakmem'):
+        exponent = np.diff(np.log(report[key])) / np.diff(log_size)
+        report[key+'_exponent'] = np.append(np.nan, exponent)
+    return report
+
+
+def main():
+    parser = ArgumentParser(description='Run growth benchmarks.')
+    parser.add_argument('-k', '--pattern', default=None,
+                        help='Only run benchmarks whose name contains PATTERN.')
+    parser.add_argument('-r', '--repeat', type=int, default=3,
+                        help='Number of timed repetitions.')
+    parser.add_argument('-b', '--baseline', default=BASELINE,
+                        help='Baseline results file.')
+    parser.add_argument('-t', '--tolerance', type=float, default=1.5,
+                        help='Ratio to baseline flagged as a regression.')
+    parser.add_argument('--save', action='store_true',
+                        help='Overwrite baseline with new results.')
+    parser.add_argument('--scaling', action='store_true',
+                        help='Report runtime and memory against cell count.')
+    parser.add_argument('-o', '--output', default=None,
+                        help='Write scaling report to csv file.')
+    args = parser.parse_args()
+
+    if args.scaling:
+        report = scaling_report()
+        print(report.to_string(index=False))
+        if args.output is not None:
+            report.to_csv(args.output, index=False)
+        return 0
+
+    results = run(args.pattern, repeat=args.repeat)
+
+    if args.save:
+        baseline = {}
+        if exists(args.baseline):
+            with open(args.baseline, 'r') as file:
+                baseline = json.load(file)
+        baseline.update(results)
+        with open(args.baseline, 'w') as file:
+            json.dump(baseline, file, indent=2, sort_keys=True)
+        return 0
+
+    if not exists(args.baseline):
+        print('No baseline found at {:s}.'.format(args.baseline))
+        return 0
+
+    with open(args.baseline, 'r') as file:
+        baseline = json.load(file)
+    comparison = compare(results, baseline, tolerance=args.tolerance)
+    print(comparison.to_string(float_format='{:.4f}'.format))
+    return int(comparison.regression.any())
+
+
+if __name__ == '__main__':
+    raise SystemExit(main())
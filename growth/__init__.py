@@ -1 +1,22 @@
-from .cells import Culture
+from importlib import import_module
+
+
+# subpackages and modules, imported upon first access
+SUBMODULES = ('cells', 'imports', 'kernels', 'measure', 'microscopy',
+              'precision', 'spatial', 'sweep', 'visualization')
+
+# attributes exported by the package, keyed by the submodule defining them
+ATTRIBUTES = {'Culture': 'cells'}
+
+
+def __getattr__(name):
+    """ Import submodules and exported attributes upon first access, so that importing the package alone is cheap. """
+    if name in ATTRIBUTES:
+        return getattr(import_module('.'+ATTRIBUTES[name], __name__), name)
+    if name in SUBMODULES:
+        return import_module('.'+name, __name__)
+    raise AttributeError('module {!r} has no attribute {!r}'.format(__name__, name))
+
+
+def __dir__():
+    return sorted(set(globals()) | set(SUBMODULES) | set(ATTRIBUTES))
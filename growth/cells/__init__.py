@@ -1 +1,2 @@
 from .cultures import Culture
+from .inoculum import Inoculum
@@ -1,10 +1,63 @@
 from os.path import join
 import numpy as np
-from functools import reduce
-from operator import add
+
+from .. import kernels
+from .. import precision
+
+
+# largest number of loci packed into a chromosome
+MAX_LOCI = 62
+
+
+def founder_chromosomes(num_loci=1, genotype=1):
+    """ Returns bit-packed chromosomes of a cell carrying <genotype> marked alleles at each of <num_loci> loci. """
+    assert 1 <= num_loci <= MAX_LOCI, 'Number of loci must lie between 1 and {:d}.'.format(MAX_LOCI)
+    assert genotype in (0, 1, 2), 'Genotype must be 0, 1 or 2.'
+    marked = (1 << num_loci) - 1
+    return np.array([marked * (genotype == 2), marked * (genotype >= 1)], dtype=np.int64)
+
+
+def pack_loci(flags):
+    """ Returns integer with bit l set for each True entry l in the last dimension of <flags>. """
+    flags = np.asarray(flags, dtype=np.int64)
+    return (flags << np.arange(flags.shape[-1], dtype=np.int64)).sum(axis=-1)
+
+
+def unpack_genotypes(chromosomes, num_loci=1):
+    """
+    Returns number of marked alleles at each locus.
+
+    Args:
+
+        chromosomes (np.ndarray[int64]) - bit-packed homologous chromosomes of each cell, N x 2
+
+        num_loci (int) - number of loci
+
+    Returns:
+
+        genotypes (np.ndarray[int64]) - genotype of each cell at each locus, N x num_loci
+
+    """
+    shifts = np.arange(num_loci, dtype=np.int64)
+    chromosomes = np.asarray(chromosomes, dtype=np.int64).reshape(-1, 2, 1)
+    return ((chromosomes >> shifts) & 1).sum(axis=1)
 
 
 class Cell:
+    """
+    Individual cell.
+
+    Alleles of each of several independent loci are bit-packed into a pair of homologous chromosomes, such that bit l of each chromosome holds the allele at locus l. The first locus corresponds to the original single-locus model.
+
+    Attributes:
+
+        xy (np.ndarray[float]) - position
+
+        chromosomes (np.ndarray[int64]) - bit-packed homologous chromosomes
+
+        lineage (str) - binary lineage, one character per generation
+
+    """
 
     def __init__(self, xy=None, chromosomes=None, lineage=''):
 
@@ -13,12 +66,12 @@ class Cell:
 
         # set chromosomes
         if chromosomes is None:
-            chromosomes = np.array([0, 1])
+            chromosomes = founder_chromosomes(1)
         self.chromosomes = chromosomes
 
         # set position
         if xy is None:
-            xy = np.zeros(2, dtype=float)
+            xy = np.zeros(2, dtype=precision.get_dtype())
         self.xy = xy
 
     @property
@@ -27,40 +80,50 @@ class Cell:
 
     @property
     def genotype(self):
-        return self.chromosomes.sum()
+        """ Number of marked alleles at the first locus. """
+        return (self.chromosomes & 1).sum()
+
+    def get_genotypes(self, num_loci=1):
+        """ Returns number of marked alleles at each of <num_loci> loci. """
+        return unpack_genotypes(self.chromosomes, num_loci)[0]
 
     @property
     def phenotype(self):
         return np.random.normal(loc=self.genotype, scale=1.)
 
-    def copy(self):
-        """ Returns copy of cell. """
-        return self.__class__(self.xy, self.chromosomes, self.lineage)
+    def copy(self, xy=None):
+        """ Returns copy of cell, placed at <xy> if provided. """
+        if xy is None:
+            xy = self.xy
+        return self.__class__(xy, self.chromosomes, self.lineage)
 
     def set_xy(self, xy):
         self.xy = xy
 
-    def recombine(self, rate=0.):
-
-        # duplicate chromosomes
-        chromosomes = np.tile(self.chromosomes, 2)
+    def recombine(self, rate=0., num_loci=1):
+        """
+        Returns chromosomes of both daughters, each locus recombining independently with probability <rate>. Recombination sorts the alleles of a locus between daughters, such that the first daughter receives two unmarked alleles and the second daughter two marked alleles.
+        """
 
-        # recombination
-        if np.random.random() <= rate:
-            chromosomes.sort()
+        # draw recombination events for each locus
+        mask = pack_loci(np.random.random(num_loci) <= rate)
 
-        return chromosomes
+        # duplicate chromosomes, sorting recombined loci
+        a, b = self.chromosomes
+        low, high = a & b, a | b
+        return np.array([(a & ~mask) | (low & mask), (b & ~mask) | (low & mask),
+                         (a & ~mask) | (high & mask), (b & ~mask) | (high & mask)])
 
-    def divide(self, recombination_rate=0., reference_population=1000):
+    def divide(self, recombination_rate=0., reference_population=1000, num_loci=1):
 
-        # set average spacing between cells
-        spacing = np.sqrt(2/reference_population) / 1e5
+        # set displacement of daughters, relative to average spacing between cells
+        spacing = np.sqrt(2/reference_population) * precision.get_jitter()
 
         # perform recombination
-        chromosomes = self.recombine(rate=recombination_rate)
+        chromosomes = self.recombine(rate=recombination_rate, num_loci=num_loci)
 
         # determine child positions
-        jitter = np.random.normal(scale=spacing, size=(2, 2))
+        jitter = np.random.normal(scale=spacing, size=(2, 2)).astype(self.xy.dtype)
         xy_a, xy_b = self.xy+jitter[0], self.xy+jitter[1]
 
         # instantiate children
@@ -69,17 +132,43 @@ class Cell:
 
         return [daughter_a, daughter_b]
 
-    def grow(self, max_generation=3, **kwargs):
+    @classmethod
+    def divide_cells(cls, cells, recombination_rate=0., reference_population=1000, num_loci=1):
         """
-        Recursive growth.
+        Divide each of <cells> at once. Equivalent to calling divide on each cell, but random numbers are drawn for all cells together and daughter positions and chromosomes are computed by a single kernel call.
+
+        Returns:
+
+            daughters (list of tuple) - pair of daughter cells for each cell
+
         """
+        if len(cells) == 0:
+            return []
+
+        # set displacement of daughters, relative to average spacing between cells
+        spacing = np.sqrt(2/reference_population) * precision.get_jitter()
+        dtype = precision.get_dtype()
 
-        # stopping criterion
-        if self.generation >= max_generation:
-            return [self]
+        # draw recombination events and child positions
+        N = len(cells)
+        recombined = pack_loci(np.random.random((N, num_loci)) <= recombination_rate)
+        jitter = np.random.normal(scale=spacing, size=(N, 2, 2)).astype(dtype)
 
-        # divide
-        else:
-            children = self.divide(**kwargs)
-            recurse = lambda x: x.grow(max_generation=max_generation, **kwargs)
-            return reduce(add, map(recurse, children))
+        xy = np.array([cell.xy for cell in cells], dtype=dtype)
+        chromosomes = np.array([cell.chromosomes for cell in cells], dtype=np.int64)
+        xy, chromosomes = kernels.divide(xy, chromosomes, recombined, jitter)
+
+        # instantiate children
+        return [(cls(xy[i, 0], chromosomes[i, 0], cell.lineage+'0'),
+                 cls(xy[i, 1], chromosomes[i, 1], cell.lineage+'1'))
+                for i, cell in enumerate(cells)]
+
+    def grow(self, max_generation=3, **kwargs):
+        """
+        Returns all descendants of the cell in generation <max_generation>, ordered by lineage. Each generation is divided at once (see divide_cells).
+        """
+        cells = [self]
+        for _ in range(max_generation - self.generation):
+            children = self.divide_cells(cells, **kwargs)
+            cells = [cell for pair in children for cell in pair]
+        return cells
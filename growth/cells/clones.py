@@ -0,0 +1,124 @@
+import numpy as np
+
+from .. import kernels
+
+
+def encode_lineages(lineages):
+    """
+    Encode lineage strings as integer positions in a binary tree, with the common ancestor at position 1 and the daughters of position p at positions 2p and 2p+1.
+
+    Args:
+
+        lineages (list of str) - binary lineage of each cell, e.g. '0110'
+
+    Returns:
+
+        codes (np.ndarray[int64]) - tree position of each cell
+
+        depths (np.ndarray[int]) - generation of each cell
+
+    """
+    lineages = np.asarray(lineages, dtype=str)
+    N = len(lineages)
+    max_depth = max(lineages.dtype.itemsize // 4, 1)
+    assert max_depth < 63, 'Lineages deeper than 62 generations are not supported.'
+
+    # view characters as an N x max_depth array of unicode code points
+    chars = np.ascontiguousarray(lineages).view(np.uint32).reshape(N, -1)
+    chars = np.ascontiguousarray(chars[:, :max_depth])
+
+    return kernels.encode_lineages(chars)
+
+
+def label_clones(lineages, genotypes, include=(0, 2)):
+    """
+    Label coherent clones, i.e. sets of cells descended from a common ancestor through lineages that all share a single genotype.
+
+    Each internal node of the phylogenetic tree takes the genotype of its daughters if both daughters share a genotype, or genotype 1 otherwise. A clone comprises all leaves beneath the shallowest node carrying their genotype. Multiple loci are labeled in a single traversal of the tree.
+
+    Args:
+
+        lineages (list of str) - binary lineage of each cell
+
+        genotypes (np.ndarray[int]) - cell genotypes, length N, or N x L for L loci
+
+        include (tuple) - genotypes for which clones are labeled
+
+    Returns:
+
+        labels (np.ndarray[int]) - clone label of each cell, ordered by genotype, with -1 denoting cells of excluded genotypes. Length N, or N x L with labels numbered from zero within each locus.
+
+    """
+    genotypes = np.asarray(genotypes)
+    shape = genotypes.shape
+    genotypes = genotypes.reshape(len(genotypes), -1)
+    L = genotypes.shape[1]
+    codes, depths = encode_lineages(lineages)
+    max_depth = depths.max() if depths.size > 0 else 0
+
+    # traverse tree from bottom to top, assigning genotypes to ancestors
+    levels = [None] * (max_depth + 1)
+    leaf_positions = [None] * (max_depth + 1)
+    parent_codes = np.array([], dtype=np.int64)
+    parent_genotypes = np.empty((0, L), dtype=genotypes.dtype)
+    for depth in range(max_depth, -1, -1):
+
+        # merge leaves with ancestors of deeper nodes
+        leaves = (depths == depth).nonzero()[0]
+        level_codes = np.concatenate((codes[leaves], parent_codes))
+        level_genotypes = np.concatenate((genotypes[leaves], parent_genotypes))
+        order = np.argsort(level_codes, kind='stable')
+        level_codes = level_codes[order]
+        level_genotypes = level_genotypes[order]
+        levels[depth] = (level_codes, level_genotypes)
+
+        # store position of each leaf within the sorted level
+        positions = np.empty(len(order), dtype=np.int64)
+        positions[order] = np.arange(len(order))
+        leaf_positions[depth] = (leaves, positions[:len(leaves)])
+
+        if depth == 0:
+            break
+
+        # siblings are adjacent once sorted
+        left_codes, right_codes = level_codes[0::2], level_codes[1::2]
+        if len(level_codes) % 2 != 0 or (left_codes & 1).any() or (right_codes != left_codes + 1).any():
+            raise ValueError('Phylogenetic tree is incomplete.')
+        left, right = level_genotypes[0::2], level_genotypes[1::2]
+        parent_codes = level_codes[0::2] >> 1
+        parent_genotypes = np.where(left == right, left, 1).astype(genotypes.dtype)
+
+    # traverse tree from top to bottom, propagating clone roots
+    roots = [np.repeat(levels[0][0][:, None], L, axis=1)]
+    for depth in range(1, max_depth + 1):
+        level_codes, level_genotypes = levels[depth]
+        above_codes, above_genotypes = levels[depth-1]
+        parents = np.searchsorted(above_codes, level_codes >> 1)
+        inherit = level_genotypes == above_genotypes[parents]
+        roots.append(np.where(inherit, roots[depth-1][parents], level_codes[:, None]))
+
+    # assign clone root to each leaf
+    leaf_roots = np.empty((len(codes), L), dtype=np.int64)
+    for depth, (leaves, positions) in enumerate(leaf_positions):
+        leaf_roots[leaves] = roots[depth][positions]
+
+    # enumerate clones within each locus, ordered by genotype
+    labels = -np.ones((len(codes), L), dtype=np.int64)
+    for locus in range(L):
+        offset = 0
+        for genotype in include:
+            selected = (genotypes[:, locus] == genotype).nonzero()[0]
+            unique_roots, inverse = np.unique(leaf_roots[selected, locus], return_inverse=True)
+            labels[selected, locus] = inverse + offset
+            offset += len(unique_roots)
+
+    return labels.reshape(shape)
+
+
+def count_pairs(a, b):
+    """ Returns number of cells sharing each observed pair of <a> and <b> labels, ordered by <a> then <b>. """
+    if len(a) == 0:
+        return np.array([], dtype=np.int64)
+    codes = a.astype(np.int64) * (b.max() + 1) + b
+    _, counts = np.unique(codes, return_counts=True)
+    return counts
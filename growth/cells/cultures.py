@@ -1,17 +1,26 @@
 from copy import deepcopy
 import pickle
+from time import time
 import numpy as np
 from functools import reduce
-from collections import Counter
 from operator import add
 import networkx as nx
-import pandas as pd
+from ..imports import lazy_import
+pd = lazy_import('pandas')
 
-from .patches import Patches
+from .patches import Patches, label_patches
+from .clones import label_clones, count_pairs
+from .profiling import CultureProfiling, get_memory
+from .scheduler import DivisionScheduler, RelaxationScheduler
 from .phylogeny import Phylogeny
-from .cells import Cell
+from .cells import Cell, founder_chromosomes, unpack_genotypes
+from .inoculum import Inoculum
+from .. import precision
 from ..spatial.triangulation import LocalTriangulation
 from ..spatial.points import Points
+from ..spatial.index import SpatialIndex
+from ..spatial.edges import EdgeStatistics
+from ..spatial.relaxation import LocalRelaxation, GlobalRelaxation, MultilevelRelaxation
 from ..measure import MeasurementGenerator
 from ..microscopy import SyntheticMicroscopy
 from ..visualization.culture import CultureVisualization
@@ -19,6 +28,21 @@ from ..visualization.culture import CultureVisualization
 
 class CultureProperties:
 
+    @property
+    def cache(self):
+        """
+        Structures derived from the current generation. The cache is discarded whenever the generation or population size changes, and when cells are moved.
+        """
+        key = (self.generation, self.size)
+        if getattr(self, '_cache_key', None) != key:
+            self._cache = {}
+            self._cache_key = key
+        return self._cache
+
+    def clear_cache(self):
+        """ Discard structures derived from the current generation. """
+        self._cache_key = None
+
     @property
     def cells(self):
         """ Current generation of cells. """
@@ -53,10 +77,28 @@ class CultureProperties:
     def generation(self):
         return len(self.history) - 1
 
+    @property
+    def chromosomes(self):
+        """ Bit-packed homologous chromosomes of each cell, N x 2. """
+        if 'chromosomes' not in self.cache:
+            chromosomes = np.array([cell.chromosomes for cell in self.cells], dtype=np.int64)
+            self.cache['chromosomes'] = chromosomes
+        return self.cache['chromosomes'].copy()
+
+    @property
+    def locus_genotypes(self):
+        """ Cell genotypes at each locus, N x num_loci. """
+        if 'locus_genotypes' not in self.cache:
+            genotypes = unpack_genotypes(self.chromosomes, self.num_loci)
+            self.cache['locus_genotypes'] = genotypes
+        return self.cache['locus_genotypes'].copy()
+
     @property
     def genotypes(self):
-        """ Cell genotypes. """
-        return np.array([cell.genotype for cell in self.cells])
+        """ Cell genotypes at the first locus. """
+        if 'genotypes' not in self.cache:
+            self.cache['genotypes'] = self.locus_genotypes[:, 0]
+        return self.cache['genotypes'].copy()
 
     @property
     def num_recombinant_cells(self):
@@ -71,17 +113,43 @@ class CultureProperties:
     @property
     def xy(self):
         """ Cell positions. """
-        return np.vstack([cell.xy for cell in self.cells])
+        if 'xy' not in self.cache:
+            self.cache['xy'] = np.vstack([cell.xy for cell in self.cells])
+        return self.cache['xy'].copy()
+
+    @property
+    def points(self):
+        """ Cell positions with cached convex hull. """
+        if 'points' not in self.cache:
+            self.cache['points'] = Points(self.xy)
+        return self.cache['points']
 
     @property
     def triangulation(self):
         """ Delaunay triangulation with edge-length filtering. """
-        return LocalTriangulation(*self.xy.T)
+        if 'triangulation' not in self.cache:
+            self.cache['triangulation'] = LocalTriangulation(*self.xy.T)
+        return self.cache['triangulation']
+
+    @property
+    def edges(self):
+        """ Filtered edges between locally adjacent cells. """
+        if 'edges' not in self.cache:
+            self.cache['edges'] = self.triangulation.edges
+        return self.cache['edges']
+
+    @property
+    def edge_statistics(self):
+        """ Statistics describing contacts between adjacent cells. """
+        if 'edge_statistics' not in self.cache:
+            args = (self.edges, self.genotypes, self.triangulation)
+            self.cache['edge_statistics'] = EdgeStatistics(*args)
+        return self.cache['edge_statistics']
 
     @property
     def xy_graph(self):
         """ Graph of locally adjacent cells. """
-        return nx.Graph(self.triangulation.edges.tolist())
+        return nx.Graph(self.edges.tolist())
 
     @property
     def weighted_xy_graph(self):
@@ -94,7 +162,7 @@ class CultureProperties:
         weights = np.ones(weighted.size, dtype=np.float64) + weighted*weighting
 
         # compile weighted edge list
-        edge_list = self.triangulation.edges.tolist()
+        edge_list = self.edges.tolist()
         edges = [edge+[{'weight': w}] for edge, w in zip(edge_list, weights)]
 
         return nx.Graph(edges)
@@ -109,9 +177,17 @@ class CultureProperties:
     @property
     def heterogeneity(self):
         """ Returns fraction of edges that connect differing genotypes. """
-        edges = np.array(self.xy_graph.edges)
-        num_edges = np.not_equal(*self.genotypes[edges].T).sum()
-        return num_edges / self.size
+        return self.edge_statistics.heterogeneity
+
+    @property
+    def contact_matrix(self):
+        """ Number of edges between each pair of genotypes. """
+        return self.edge_statistics.contact_matrix
+
+    @property
+    def interface_matrix(self):
+        """ Total interface length between each pair of genotypes. """
+        return self.edge_statistics.interface_matrix
 
     @property
     def percent_heterozygous(self):
@@ -152,18 +228,144 @@ class CultureProperties:
         """ Returns indices of cells with <genotype>.  """
         return (self.genotypes==genotype).nonzero()[0]
 
+    @property
+    def locus_patch_labels(self):
+        """ Label of the contiguous single-genotype patch containing each cell at each locus, N x num_loci. """
+        if 'locus_patch_labels' not in self.cache:
+            edges = self.edge_statistics.edges
+            labels = label_patches(edges, self.locus_genotypes)
+            self.cache['locus_patch_labels'] = labels
+        return self.cache['locus_patch_labels']
+
+    @property
+    def patch_labels(self):
+        """ Label of the contiguous single-genotype patch containing each cell. """
+        return self.locus_patch_labels[:, 0]
+
     def parse_patches(self, genotype):
         """ Returns properties for patches of specified <genotype>.  """
-        patches = self.xy_graph.subgraph(self.select(genotype))
-        return {
-            'number': nx.connected.number_connected_components(patches),
-            'sizes': [len(c) for c in nx.connected_components(patches)],
-            'nodes': [np.array(c) for c in nx.connected_components(patches)]}
+        return self.get_patches((genotype,)).data[genotype]
+
+    def get_patches(self, genotypes=(0, 2), locus=0):
+        """ Patches instance for <locus>. """
+        edge_statistics = self.edge_statistics
+        if locus != 0:
+            edge_statistics = self.get_edge_statistics(locus)
+        return Patches(self.locus_patch_labels[:, locus],
+                       self.locus_genotypes[:, locus],
+                       include=genotypes,
+                       edge_statistics=edge_statistics,
+                       cell_area=np.pi/self.reference_population)
+
+    def get_edge_statistics(self, locus=0):
+        """ Statistics describing contacts between adjacent cells at <locus>. """
+        if locus == 0:
+            return self.edge_statistics
+        genotypes = self.locus_genotypes[:, locus]
+        return EdgeStatistics(self.edges, genotypes, self.triangulation)
+
+    @property
+    def locus_statistics(self):
+        """ Recombinant fraction, patch, clone and contact statistics at each locus. """
+        rows = []
+        for locus in range(self.num_loci):
+            genotypes = self.locus_genotypes[:, locus]
+            patches = self.get_patches((0, 2), locus=locus)
+            clone_sizes = self.get_clone_sizes(locus=locus)
+            rows.append(dict(
+                locus=locus,
+                percent_heterozygous=(genotypes==1).sum() / self.size,
+                num_patches=patches.num_patches,
+                mean_patch_size=patches.mean_patch_size,
+                num_clones=len(clone_sizes),
+                mean_clone_size=np.mean(clone_sizes) if len(clone_sizes) > 0 else np.nan,
+                heterogeneity=self.get_edge_statistics(locus).heterogeneity))
+        return pd.DataFrame(rows).set_index('locus')
+
+
+class CultureNeighbourhoods:
+    """
+    Methods for neighbourhood queries on the current generation of cells.
+    """
+
+    @property
+    def spatial_index(self):
+        """ Spatial index of current cell positions, updated incrementally as cells divide and move. """
+        if 'spatial_index' not in self.cache:
+            index = getattr(self, '_spatial_index', None)
+            if index is None:
+                index = SpatialIndex(self.xy, skin=self.cell_radius/2)
+                self._spatial_index = index
+            else:
+                index.update(self.xy)
+            self.cache['spatial_index'] = index
+        return self.cache['spatial_index']
+
+    def get_neighbours(self, radius=None):
+        """
+        Returns all pairs of distinct cells separated by no more than <radius>.
+
+        Args:
+
+            radius (float) - search radius, defaults to two cell radii
+
+        Returns:
+
+            pairs (np.ndarray[int]) - (i, j) cell index pairs listed in both orders, M x 2
+
+        """
+        if radius is None:
+            radius = 2 * self.cell_radius
+        pairs = self.spatial_index.query_pairs(radius)
+        return np.vstack((pairs, pairs[:, ::-1]))
+
+    def local_density(self, radius=None):
+        """ Number of neighbouring cells within <radius> of each cell. """
+        pairs = self.get_neighbours(radius)
+        return np.bincount(pairs[:, 0], minlength=self.size)
 
-    def get_patches(self, genotypes=(0, 2)):
-        """ Patches instance. """
-        data = {g: self.parse_patches(g) for g in genotypes}
-        return Patches(data)
+    def local_composition(self, radius=None):
+        """
+        Returns the genotype composition of the neighbourhood surrounding each cell.
+
+        Args:
+
+            radius (float) - search radius, defaults to two cell radii
+
+        Returns:
+
+            composition (np.ndarray[float]) - fraction of neighbours with each genotype (0, 1, 2), N x 3. Cells without neighbours are assigned NaN.
+
+        """
+        pairs = self.get_neighbours(radius)
+        genotypes = self.genotypes[pairs[:, 1]]
+        counts = np.bincount(pairs[:, 0]*3 + genotypes, minlength=3*self.size)
+        counts = counts.reshape(self.size, 3)
+        with np.errstate(invalid='ignore', divide='ignore'):
+            return counts / counts.sum(axis=1, keepdims=True)
+
+    def nearest_neighbours(self, k=6):
+        """
+        Returns the <k> nearest neighbours of each cell.
+
+        Args:
+
+            k (int) - number of neighbours
+
+        Returns:
+
+            distances (np.ndarray[float]) - distance to each neighbour, N x k
+
+            indices (np.ndarray[int]) - index of each neighbour, N x k
+
+        """
+        distances, indices = self.spatial_index.query_knn(self.xy, k=k+1)
+        return distances[:, 1:], indices[:, 1:]
+
+    def nearest_neighbour_genotypes(self, k=6):
+        """ Genotypes of the <k> nearest neighbours of each cell, N x k. """
+        _, indices = self.nearest_neighbours(k)
+        return self.genotypes[indices]
 
 
 class CultureMeasurements:
@@ -301,50 +503,50 @@ class CloneCounting:
         """ Phylogenetic tree. """
         return nx.Graph(self.dendrogram_edges)
 
-    def get_clones(self):
-        """ Returns list of recombinant clones. """
-
-        genotypes = self.genotype_dict
-        G = self.dendrogram
-        G_0 = G.subgraph([k for k,v in genotypes.items() if v == 0])
-        G_2 = G.subgraph([k for k,v in genotypes.items() if v == 2])
-
-        clones = []
-        clones += [c for c in nx.connected_components(G_0)]
-        clones += [c for c in nx.connected_components(G_2)]
+    @property
+    def locus_clone_labels(self):
+        """ Label of the coherent recombinant clone containing each cell at each locus, with -1 denoting heterozygous cells, N x num_loci. """
+        if 'locus_clone_labels' not in self.cache:
+            labels = label_clones(self.lineages, self.locus_genotypes, include=(0, 2))
+            self.cache['locus_clone_labels'] = labels
+        return self.cache['locus_clone_labels']
 
-        leaf_nodes = set(self.lineages)
+    @property
+    def clone_labels(self):
+        """ Label of the coherent recombinant clone containing each cell, with -1 denoting heterozygous cells. """
+        return self.locus_clone_labels[:, 0]
 
-        return [clone.intersection(leaf_nodes) for clone in clones]
+    def get_clones(self):
+        """ Returns list of recombinant clones. """
+        labels = self.clone_labels
+        order = np.argsort(labels, kind='stable')
+        counts = np.bincount(labels[labels >= 0])
+        starts = np.cumsum(counts) - counts + (labels < 0).sum()
+        lineages = np.array(self.lineages, dtype=object)[order]
+        return [set(lineages[i:i+n]) for i, n in zip(starts, counts)]
 
     def get_patches_list(self):
         """ Returns list of patches. """
+        return [set(nodes) for nodes in self.get_patches((0, 2)).nodes]
 
-        G_0 = self.xy_graph.subgraph(self.select(0))
-        G_2 = self.xy_graph.subgraph(self.select(2))
-
-        clones = []
-        clones += [c for c in nx.connected_components(G_0)]
-        clones += [c for c in nx.connected_components(G_2)]
-
-        return clones
-
-    def get_clone_sizes(self, factor=None):
+    def get_clone_sizes(self, factor=None, locus=0):
         """
-        Returns number of cells per coherent clone, with optional scaling factor used to exclude border region.
+        Returns number of cells per coherent clone at <locus>, with optional scaling factor used to exclude border region.
         """
 
+        labels = self.locus_clone_labels[:, locus]
         if factor == 1.0 or factor is None:
-            return [len(c) for c in self.get_clones()]
+            return np.bincount(labels[labels >= 0]).tolist()
 
         # compile scaling mask
-        mask = Points(self.xy).get_scale_mask(factor)
-        included = set(np.array(self.lineages)[mask])
+        mask = self.points.get_scale_mask(factor)
+        num_clones = labels.max() + 1
 
         # filter clone size list
-        sizes = [len(c.intersection(included)) for c in self.get_clones()]
+        included = labels[mask & (labels >= 0)]
+        sizes = np.bincount(included, minlength=num_clones)
 
-        return [s for s in sizes if s > 0]
+        return sizes[sizes > 0].tolist()
 
     @property
     def mean_clone_size(self):
@@ -364,50 +566,64 @@ class CloneCounting:
     @property
     def clone_sizes_per_patch(self):
         """ Clone sizes per distinct recombinant patch. """
-
-        to_clone = {}
-        for clone_id, members in enumerate(self.get_clones()):
-            for member in members:
-                to_clone[member] = clone_id
-
-        patches_list = self.get_patches_list()
-
-        clone_sizes = []
-        for patches in patches_list:
-            clone_ids = [to_clone[self.lineages[patch]] for patch in patches]
-            clone_sizes += list(Counter(clone_ids).values())
-
-        return clone_sizes
+        recombinant = self.clone_labels >= 0
+        patch_labels = self.patch_labels[recombinant]
+        clone_labels = self.clone_labels[recombinant]
+        counts = count_pairs(patch_labels, clone_labels)
+        return counts.tolist()
 
 
 class Culture(CultureProperties,
+              CultureNeighbourhoods,
               CultureVisualization,
               CultureMeasurements,
-              CloneCounting):
+              CloneCounting,
+              CultureProfiling):
+
+    # number of independent loci tracked per cell
+    num_loci = 1
 
     def __init__(self,
                  starter=None,
                  scaling=1,
                  reference_population=1000,
+                 num_loci=1,
                  **kwargs):
         """
         Args:
 
+            starter (list of Cell or Inoculum) - initial population, if None seed with four heterozygous cells
+
             reference_population (int) - number of cells in unit circle
 
+            num_loci (int) - number of independent loci tracked per cell, each recombining independently upon division
+
         """
 
         # seed with four heterozygous cells
         if starter is None:
-            starter = self.inoculate(**kwargs)
+            starter = self.inoculate(num_loci=num_loci, **kwargs)
+        elif isinstance(starter, Inoculum):
+            num_loci = starter.num_loci
+            starter = starter.cells
         self.history = [starter]
 
         # set population size scaling
         self.scaling = scaling
         self.reference_population = reference_population
+        self.num_loci = num_loci
 
     def __add__(self, b):
-        return self.__class__(self.cells + b.cells)
+        return self.__class__(self.cells + b.cells, num_loci=self.num_loci)
+
+    def __getstate__(self):
+        """ Exclude cached structures from serialization. """
+        state = self.__dict__.copy()
+        state.pop('_cache', None)
+        state.pop('_cache_key', None)
+        state.pop('_spatial_index', None)
+        state.pop('_daughters', None)
+        return state
 
     def filter_edges(self, factor=1.0):
         """
@@ -420,11 +636,14 @@ class Culture(CultureProperties,
         """
 
         # compile scaling mask
-        mask = Points(self.xy).get_scale_mask(factor)
+        mask = self.points.get_scale_mask(factor)
         cells = np.array(self.cells)[mask]
 
         # instantiate
-        child = Culture(starter=cells, scaling=self.scaling, reference_population=self.reference_population)
+        child = Culture(starter=cells,
+                        scaling=self.scaling,
+                        reference_population=self.reference_population,
+                        num_loci=self.num_loci)
 
         return child
 
@@ -453,7 +672,8 @@ class Culture(CultureProperties,
 
         culture = self.__class__(
             scaling=self.scaling,
-            reference_population=self.reference_population)
+            reference_population=self.reference_population,
+            num_loci=self.num_loci)
 
         # assign history to culture
         if t is None:
@@ -466,16 +686,23 @@ class Culture(CultureProperties,
     def freeze(self, t):
         """ Returns snapshot of culture at generation <t>. """
         cells = self.history[t]
-        culture = self.__class__(scaling=float(len(cells))/self.size)
+        culture = self.__class__(scaling=float(len(cells))/self.size, num_loci=self.num_loci)
         culture.history = [cells]
         return culture
 
     @staticmethod
-    def inoculate(N=2, **kwargs):
-        """ Inoculate with <N> generations of heterozygous cells. """
-        return Cell().grow(max_generation=N, **kwargs)
-
-    def move(self, center=None, weight='weight'):
+    def inoculate(N=2, num_loci=1, **kwargs):
+        """ Inoculate with <N> generations of cells heterozygous at each of <num_loci> loci. """
+        founder = Cell(chromosomes=founder_chromosomes(num_loci))
+        return founder.grow(max_generation=N, num_loci=num_loci, **kwargs)
+
+    def move(self, center=None, weight='weight',
+             relaxation='global',
+             ring_size=2,
+             max_strain=0.3,
+             min_separation=0.2,
+             max_displacement=2.,
+             maxiter=None):
         """
         Update cell positions.
 
@@ -483,65 +710,390 @@ class Culture(CultureProperties,
 
             center (np.ndarray[float]) - center position
 
+            weight (str) - edge attribute used as edge length, if None all edges have unit length
+
+            relaxation (str) - if 'local', only relax the neighbourhood of newly divided cells, falling back to global relaxation when the local solution is overly strained, crowded or displaced. If 'multilevel', relax a hierarchy of coarsened graphs from coarsest to finest, which scales to much larger colonies than 'global'.
+
+            ring_size (int) - number of rings of neighbours relaxed around newly divided cells
+
+            max_strain (float) - mean relative deviation of local edge lengths from their targets above which global relaxation is triggered
+
+            min_separation (float) - smallest distance between neighbouring cells, in edge lengths, below which global relaxation is triggered
+
+            max_displacement (float) - largest local displacement, in edge lengths, above which global relaxation is triggered
+
+            maxiter (int) - maximum number of optimizer iterations, if None relax until converged
+
+        Returns:
+
+            record (dict) - relaxation trace entry, see relaxation_trace
+
         """
 
-        # fix centerpoint
-        if center is None:
-           center = np.zeros(2, dtype=float)
+        # attempt local relaxation
+        if relaxation == 'local':
+            thresholds = (max_strain, min_separation, max_displacement)
+            if self.relax_locally(weight, ring_size, *thresholds, maxiter=maxiter):
+                return self.relaxation_records[-1]
 
         # determine scaling (colony radius)
         radius = np.sqrt(self.size/self.reference_population)
 
+        # triangulate
+        with self.profile('triangulation'):
+            _ = self.triangulation
+
         # build graph
-        if weight is not None:
-            graph = self.weighted_xy_graph
-        else:
-            graph = self.xy_graph
+        with self.profile('graph'):
+            if weight is not None:
+                graph = self.weighted_xy_graph
+            else:
+                graph = self.xy_graph
+            edges = np.array(graph.edges(), dtype=np.int64)
+            weights = None
+            if weight is not None:
+                weights = np.array([w for _, _, w in graph.edges(data=weight, default=1.)])
 
         # run relaxation
-        xy_dict = nx.kamada_kawai_layout(
-            graph,
-            pos=dict(enumerate(self.xy)),
-            center=center,
-            scale=radius,
-            weight=weight)
+        mode = 'multilevel' if relaxation == 'multilevel' else 'global'
+        with self.profile('relaxation'):
+            if mode == 'multilevel':
+                relaxation = MultilevelRelaxation(self.xy, edges, weights)
+            else:
+                relaxation = GlobalRelaxation(self.xy, edges, weights)
+            xy = relaxation.run(center=center, scale=radius, maxiter=maxiter)
+
+        # update cell positions, replacing rather than modifying cells and lists shared with earlier generations or branches
+        xy = xy.astype(precision.get_dtype())
+        self.history[-1] = [cell.copy(xy[i]) for i, cell in enumerate(self.cells)]
+        self.clear_cache()
+
+        return self.record_relaxation(mode, relaxation)
+
+    def relax_locally(self, weight='weight', ring_size=2,
+                      max_strain=0.3,
+                      min_separation=0.2,
+                      max_displacement=2.,
+                      maxiter=None):
+        """
+        Relax the neighbourhood of cells created in the latest division, holding all other cells fixed.
+
+        Args:
+
+            weight (str) - if None, all edges have unit length, otherwise heterotypic edges are lengthened as in the weighted graph
 
-        # update cell positions
-        _ = [cell.set_xy(xy_dict[i]) for i, cell in enumerate(self.cells)]
+            ring_size (int) - number of rings of neighbours relaxed around newly divided cells
+
+            max_strain (float) - largest acceptable mean relative deviation of local edge lengths from their targets
+
+            min_separation (float) - smallest acceptable distance between neighbouring cells, in edge lengths
+
+            max_displacement (float) - largest acceptable local displacement, in edge lengths
+
+            maxiter (int) - maximum number of optimizer iterations, if None relax until converged
+
+        Returns:
+
+            relaxed (bool) - if False, local relaxation was rejected and cells were not moved
+
+        """
+
+        daughters = getattr(self, '_daughters', None)
+        if daughters is None or (len(daughters) > 0 and daughters.max() >= self.size):
+            return False
+        if len(daughters) == 0:
+            self.record_relaxation('local')
+            return True
+
+        # lengthen heterotypic edges
+        with self.profile('triangulation'):
+            edges = self.edges
+        weights = None
+        if weight is not None:
+            genotypes = self.genotypes[edges]
+            weights = 1 + 0.1 * (genotypes[:, 0] != genotypes[:, 1])
+
+        with self.profile('relaxation'):
+            local = LocalRelaxation(self.xy, edges, daughters,
+                                    k=ring_size,
+                                    weights=weights)
+            xy = local.run(maxiter=maxiter)
+
+        # reject overly strained, crowded or displaced configurations
+        if local.strain > max_strain or local.separation < min_separation:
+            return False
+        if local.displacement > max_displacement:
+            return False
+
+        # update positions of free cells, replacing rather than modifying cells and lists shared with earlier generations or branches
+        cells = list(self.cells)
+        xy = xy.astype(precision.get_dtype())
+        for i in local.free:
+            cells[i] = cells[i].copy(xy[i])
+        self.history[-1] = cells
+        self.clear_cache()
+        self.record_relaxation('local', local)
+        return True
+
+    @property
+    def relaxation_records(self):
+        """ List of relaxation trace entries, one per generation. """
+        if '_relaxation_records' not in self.__dict__:
+            self._relaxation_records = []
+        return self._relaxation_records
+
+    @property
+    def relaxation_trace(self):
+        """
+        Table describing the relaxation performed in each generation, including its mode ('global', 'multilevel', 'local' or 'skipped'), stress energy, number of optimizer iterations, whether the optimizer converged, the resultant strain and separation between cells, and the fraction of overlapping cells beforehand (if evaluated).
+        """
+        columns = ['generation', 'population', 'mode', 'energy', 'iterations', 'converged', 'strain', 'separation', 'overlap']
+        return pd.DataFrame(self.relaxation_records, columns=columns)
+
+    def record_relaxation(self, mode, relaxation=None):
+        """
+        Append entry to the relaxation trace.
+
+        Args:
+
+            mode (str) - 'global', 'multilevel', 'local' or 'skipped'
+
+            relaxation (LocalRelaxation, GlobalRelaxation or MultilevelRelaxation) - completed relaxation, if any
+
+        Returns:
+
+            record (dict) - relaxation trace entry
+
+        """
+        record = dict(generation=self.generation, population=self.size, mode=mode)
+        for key in ('energy', 'iterations', 'converged', 'strain', 'separation'):
+            record[key] = getattr(relaxation, key, None)
+        self.relaxation_records.append(record)
+        return record
 
     def divide(self, division_rate=0.1, recombination_rate=0.1):
 
         # select cells for division
-        divided = np.random.random(len(self.parents)) < division_rate
+        parents = self.parents
+        divided = np.random.random(len(parents)) < division_rate
+        dividing = [parents[i] for i in divided.nonzero()[0]]
+        children = iter(Cell.divide_cells(dividing, recombination_rate=recombination_rate, num_loci=self.num_loci))
 
         # create next generation
-        for index, parent in enumerate(self.parents):
+        daughters = []
+        for index, parent in enumerate(parents):
 
             # if cell divided, pass children to next generation
             if divided[index]:
-                children = parent.divide(recombination_rate=recombination_rate)
-                self.cells.extend(children)
+                daughters.extend([len(self.cells), len(self.cells)+1])
+                self.cells.extend(next(children))
 
             # otherwise, pass cell to next generation
             else:
-                self.cells.append(parent.copy())
+                self.cells.append(parent)
+
+        # store indices of newly divided cells
+        self._daughters = np.array(daughters, dtype=np.int64)
 
     def update(self,
                division_rate=0.1,
                recombination_rate=0.1,
+               scheduler=None,
                **kwargs):
+        if self.profiling:
+            self.profiler.start(self.generation + 1)
         self.history.append([])
-        self.divide(division_rate, recombination_rate)
-        self.move(**kwargs)
+        with self.profile('division'):
+            self.divide(division_rate, recombination_rate)
+        if scheduler is None:
+            self.move(**kwargs)
+        else:
+            scheduler.step(self, **kwargs)
+        if self.profiling:
+            self.profiler.stop(self.size)
 
     def grow(self,
              min_population=10,
              max_iters=None,
+             walltime=None,
+             max_memory=None,
+             checkpoint_path=None,
+             checkpoint_interval=None,
+             relax_interval=1,
+             max_overlap=None,
+             maxiter=None,
              **kwargs):
+        """
+        Grow culture until it reaches <min_population> cells or exhausts its budget.
+
+        Before each generation, its runtime is predicted from that of the previous generation, scaled by the square of the population growth over the previous generation. The memory used by the culture is likewise measured as the growth in resident memory since growth started, and is predicted to scale with the square of the population growth. Growth stops early, before the first generation if need be, if either prediction would exceed its budget or the walltime is already spent. A checkpoint is then saved so that growth may be resumed by calling grow again on the loaded checkpoint.
+
+        Relaxation may be performed less often, or less thoroughly, than once per generation by setting <relax_interval>, <max_overlap> and <maxiter> (see RelaxationScheduler). The culture is always relaxed before growth stops. The stress energy and convergence of each relaxation are logged in relaxation_trace.
+
+        Args:
+
+            min_population (int) - target population size
+
+            max_iters (int) - maximum number of generations
+
+            walltime (float) - time budget, seconds
+
+            max_memory (float) - budget for the resident memory currently in use by the process (not its peak), GB
+
+            checkpoint_path (str) - path passed to save() when checkpointing
+
+            checkpoint_interval (float) - seconds between periodic checkpoints
+
+            relax_interval (int) - largest number of generations between relaxations
+
+            max_overlap (float) - fraction of overlapping cells above which relaxation is performed regardless of <relax_interval>
+
+            maxiter (int) - maximum number of optimizer iterations per relaxation
+
+            kwargs: keyword arguments for update
+
+        Returns:
+
+            completed (bool) - if True, culture reached <min_population>
+
+        """
+
+        start_time = last_checkpoint = time()
+        start_memory = memory = get_memory()
+        duration, growth = None, 1.
+
+        scheduler = RelaxationScheduler(relax_interval, max_overlap, maxiter=maxiter)
+        move_kwargs = {k: v for k, v in kwargs.items() if k not in ('division_rate', 'recombination_rate')}
+
         i = 0
         while self.size < min_population:
-            self.update(**kwargs)
+
+            # stop if next generation is not expected to fit within budget
+            budget = (start_time, duration, start_memory, memory, growth)
+            if self._exceeds_budget(*budget, walltime, max_memory):
+                scheduler.finish(self, **move_kwargs)
+                if checkpoint_path is not None:
+                    self.save(checkpoint_path)
+                return False
+
+            # run generation
+            generation_start, size = time(), self.size
+            self.update(scheduler=scheduler, **kwargs)
+            duration = time() - generation_start
+            memory = get_memory()
+            growth = self.size / size
+
+            # save periodic checkpoint
+            if checkpoint_path is not None and checkpoint_interval is not None:
+                if time() - last_checkpoint >= checkpoint_interval:
+                    self.save(checkpoint_path)
+                    last_checkpoint = time()
+
             if max_iters is not None:
                 i += 1
                 if i >= max_iters:
                     break
+
+        scheduler.finish(self, **move_kwargs)
+
+        return self.size >= min_population
+
+    def grow_events(self,
+                    min_population=10,
+                    division_rate=0.1,
+                    recombination_rate=0.1,
+                    relax_interval=1,
+                    max_iters=None,
+                    **kwargs):
+        """
+        Grow culture until it reaches <min_population> cells using an event-driven division scheduler. Only dividing cells are visited, and cell positions are relaxed once every <relax_interval> generations, or as soon as the target population is reached.
+
+        Each relaxation appends one entry to the culture history, so history is indexed by relaxation rather than by generation. Cells that neither divide nor move are shared between successive entries rather than copied. With a <relax_interval> of one, the history follows the same distribution as that produced by grow.
+
+        Args:
+
+            min_population (int) - target population size
+
+            division_rate (float) - probability that a cell divides in any given generation
+
+            recombination_rate (float) - probability of recombination upon division
+
+            relax_interval (int) - number of generations between relaxations
+
+            max_iters (int) - maximum number of relaxations
+
+            kwargs: keyword arguments for move
+
+        Returns:
+
+            generations (int) - number of generations elapsed
+
+        """
+
+        scheduler = DivisionScheduler(division_rate, recombination_rate, self.num_loci)
+
+        generations, i = 0, 0
+        while self.size < min_population:
+
+            if self.profiling:
+                self.profiler.start(self.generation + 1)
+
+            # advance population until the next relaxation
+            with self.profile('division'):
+                cells = list(self.cells)
+                generations += scheduler.run(cells,
+                                             num_generations=relax_interval,
+                                             max_population=min_population)
+                self.history.append(cells)
+                self._daughters = scheduler.daughters
+
+            # relax positions
+            self.move(**kwargs)
+
+            if self.profiling:
+                self.profiler.stop(self.size)
+
+            if max_iters is not None:
+                i += 1
+                if i >= max_iters:
+                    break
+
+        return generations
+
+    @staticmethod
+    def _exceeds_budget(start_time, duration, start_memory, memory, growth, walltime, max_memory):
+        """
+        Returns True if the next generation is not expected to fit within the walltime or memory budget.
+
+        Args:
+
+            start_time (float) - time at which growth started
+
+            duration (float) - runtime of the previous generation, None before the first generation
+
+            start_memory (float) - resident memory currently in use when growth started, MB
+
+            memory (float) - resident memory currently in use after the previous generation, MB
+
+            growth (float) - population growth over the previous generation
+
+            walltime (float) - time budget, seconds
+
+            max_memory (float) - resident memory budget, GB, compared with the predicted resident memory in MB divided by 1024
+
+        """
+
+        # predict runtime, stopping if the walltime is already spent
+        if walltime is not None:
+            predicted = 0. if duration is None else duration * growth**2
+            if time() - start_time + predicted >= walltime:
+                return True
+
+        # predict resident memory in MB, counting memory in use before growth started, and compare in GB
+        if max_memory is not None:
+            used = max(memory - start_memory, 0.)
+            predicted = start_memory + used * growth**2
+            if predicted / 1024 > max_memory:
+                return True
+
+        return False
@@ -0,0 +1,263 @@
+import numpy as np
+
+from .cells import Cell, founder_chromosomes
+from .clones import encode_lineages
+from .. import precision
+
+
+# angle between successive points of a sunflower spiral
+GOLDEN_ANGLE = np.pi * (3 - np.sqrt(5))
+
+
+def get_lineages(size):
+    """
+    Returns lineages of the leaves of a full binary tree with <size> leaves, ordered depth-first. Leaf depths differ by at most one generation.
+
+    Args:
+
+        size (int) - number of leaves
+
+    Returns:
+
+        lineages (np.ndarray[str]) - binary lineage of each leaf
+
+    """
+    assert size >= 1, 'Tree must contain at least one leaf.'
+
+    # the first <num_split> nodes of the deepest complete level divide once more
+    depth = int(np.log2(size))
+    num_split = size - 2**depth
+    split = np.arange(2**depth) < num_split
+    counts = 1 + split
+    nodes = np.repeat(np.arange(2**depth), counts)
+    children = np.arange(size) - np.repeat(np.cumsum(counts) - counts, counts)
+
+    # write lineages as unicode code points, with trailing nulls for shallower leaves
+    chars = np.zeros((size, depth+1), dtype=np.uint32)
+    shifts = np.arange(depth-1, -1, -1)
+    chars[:, :depth] = ord('0') + ((nodes[:, None] >> shifts) & 1)
+    deeper = np.repeat(split, counts)
+    chars[deeper, depth] = ord('0') + children[deeper]
+
+    return chars.view('U{:d}'.format(depth+1)).ravel()
+
+
+def assign_lineages(xy, lineages):
+    """
+    Match positions to lineages by recursive bisection, such that the descendants of each ancestor occupy a contiguous region and sister cells are adjacent.
+
+    Each ancestor's region is split along its longest dimension, in proportion to the number of descendants of each of its daughters.
+
+    Args:
+
+        xy (np.ndarray[float]) - positions, N x 2
+
+        lineages (np.ndarray[str]) - lineages ordered depth-first, length N
+
+    Returns:
+
+        order (np.ndarray[int]) - index of the position assigned to each lineage
+
+    """
+    codes, depths = encode_lineages(lineages)
+    order = np.arange(len(codes))
+    for depth in range(depths.max()):
+
+        # group lineages by ancestor at current depth
+        ancestors = codes >> np.clip(depths - depth, 0, None)
+        group = np.append(0, np.cumsum(ancestors[1:] != ancestors[:-1]))
+        starts = np.append(0, (np.diff(group) > 0).nonzero()[0] + 1)
+
+        # sort positions within each group along its longest dimension
+        positions = xy[order]
+        extent = np.maximum.reduceat(positions, starts) - np.minimum.reduceat(positions, starts)
+        axis = extent.argmax(axis=1)[group]
+        key = positions[np.arange(len(order)), axis]
+        order = order[np.lexsort((key, group))]
+
+    return order
+
+
+def disk(size, reference_population=1000, center=(0, 0)):
+    """
+    Returns <size> evenly spaced positions filling a disk at the density of a relaxed culture.
+
+    Positions follow a sunflower spiral whose radius matches the scale to which a culture of <size> cells is relaxed.
+
+    Args:
+
+        size (int) - number of positions
+
+        reference_population (int) - number of cells in unit circle
+
+        center (array like) - disk center
+
+    Returns:
+
+        xy (np.ndarray[float]) - positions, size x 2
+
+    """
+    radius = np.sqrt(size / reference_population)
+    indices = np.arange(size)
+    r = radius * np.sqrt((indices + 0.5) / size)
+    theta = indices * GOLDEN_ANGLE
+    return np.stack((r*np.cos(theta), r*np.sin(theta)), axis=1) + center
+
+
+def strip(size, reference_population=1000, aspect=4., center=(0, 0)):
+    """
+    Returns <size> positions on a hexagonal lattice filling a horizontal strip at the density of a relaxed culture.
+
+    Args:
+
+        size (int) - number of positions
+
+        reference_population (int) - number of cells in unit circle
+
+        aspect (float) - ratio of strip length to width
+
+        center (array like) - strip center
+
+    Returns:
+
+        xy (np.ndarray[float]) - positions, size x 2
+
+    """
+
+    # lattice spacing, each cell occupying an area of pi / reference_population
+    spacing = np.sqrt(2*np.pi / (np.sqrt(3)*reference_population))
+    width = np.sqrt(size * np.pi / reference_population / aspect)
+    num_rows = max(int(round(width / (spacing*np.sqrt(3)/2))), 1)
+    num_columns = int(np.ceil(size / num_rows))
+
+    # fill rows in turn, offsetting alternate rows by half a spacing
+    row, column = np.divmod(np.arange(size), num_columns)
+    x = (column + 0.5*(row % 2)) * spacing
+    y = row * spacing * np.sqrt(3) / 2
+    xy = np.stack((x, y), axis=1)
+
+    return xy - xy.mean(axis=0) + center
+
+
+class Inoculum:
+    """
+    Starter population defined by arrays of cell positions, chromosomes and lineages.
+
+    Lineages form a full binary tree in which sister cells occupy adjacent positions, so clone and phylogeny analyses apply from the first generation. Separate founder colonies descend from distinct branches of a common tree.
+
+    Attributes:
+
+        xy (np.ndarray[float]) - cell positions, N x 2
+
+        chromosomes (np.ndarray[int64]) - bit-packed homologous chromosomes, N x 2
+
+        lineages (np.ndarray[str]) - binary lineage of each cell
+
+        num_loci (int) - number of loci packed into each chromosome
+
+    """
+
+    def __init__(self, xy, chromosomes, lineages, num_loci=1):
+        """
+        Instantiate inoculum.
+
+        Args:
+
+            xy (np.ndarray[float]) - cell positions, N x 2
+
+            chromosomes (np.ndarray[int64]) - bit-packed homologous chromosomes, N x 2
+
+            lineages (np.ndarray[str]) - binary lineage of each cell
+
+            num_loci (int) - number of loci packed into each chromosome
+
+        """
+        self.xy = np.asarray(xy, dtype=precision.get_dtype())
+        self.chromosomes = np.asarray(chromosomes, dtype=np.int64)
+        self.lineages = np.asarray(lineages, dtype=str)
+        self.num_loci = num_loci
+
+    def __len__(self):
+        return len(self.xy)
+
+    @classmethod
+    def from_positions(cls, xy, genotype=1, num_loci=1):
+        """
+        Returns inoculum descended from a single founder, placing cells at positions <xy>.
+
+        Args:
+
+            xy (np.ndarray[float]) - cell positions, N x 2
+
+            genotype (int) - number of marked alleles at each locus
+
+            num_loci (int) - number of loci packed into each chromosome
+
+        """
+        xy = np.asarray(xy, dtype=np.float64)
+        lineages = get_lineages(len(xy))
+        order = assign_lineages(xy, lineages)
+        chromosomes = np.tile(founder_chromosomes(num_loci, genotype), (len(xy), 1))
+        return cls(xy[order], chromosomes, lineages, num_loci)
+
+    @classmethod
+    def disk(cls, size, reference_population=1000, center=(0, 0), **kwargs):
+        """ Returns inoculum of <size> cells filling a disk. Keyword arguments are passed to from_positions. """
+        xy = disk(size, reference_population, center)
+        return cls.from_positions(xy, **kwargs)
+
+    @classmethod
+    def strip(cls, size, reference_population=1000, aspect=4., center=(0, 0), **kwargs):
+        """ Returns inoculum of <size> cells filling a strip. Keyword arguments are passed to from_positions. """
+        xy = strip(size, reference_population, aspect, center)
+        return cls.from_positions(xy, **kwargs)
+
+    @classmethod
+    def combine(cls, inocula):
+        """
+        Returns a single inoculum comprising several founder colonies. The lineages of each colony are prefixed by those of a common tree with one leaf per colony.
+
+        Args:
+
+            inocula (list of Inoculum) - founder colonies, all with the same number of loci
+
+        """
+        num_loci = inocula[0].num_loci
+        assert all(x.num_loci == num_loci for x in inocula), 'Colonies must share the same number of loci.'
+        prefixes = get_lineages(len(inocula))
+        lineages = [np.char.add(prefix, x.lineages) for prefix, x in zip(prefixes, inocula)]
+        return cls(np.vstack([x.xy for x in inocula]),
+                   np.vstack([x.chromosomes for x in inocula]),
+                   np.concatenate(lineages),
+                   num_loci)
+
+    @classmethod
+    def colonies(cls, centers, size, reference_population=1000, genotypes=1, num_loci=1):
+        """
+        Returns inoculum comprising a disk-shaped founder colony about each of <centers>.
+
+        Args:
+
+            centers (array like) - colony centers, M x 2
+
+            size (int or array like) - number of cells per colony
+
+            reference_population (int) - number of cells in unit circle
+
+            genotypes (int or array like) - number of marked alleles in each colony
+
+            num_loci (int) - number of loci packed into each chromosome
+
+        """
+        centers = np.asarray(centers, dtype=np.float64).reshape(-1, 2)
+        sizes = np.broadcast_to(size, len(centers))
+        genotypes = np.broadcast_to(genotypes, len(centers))
+        inocula = [cls.disk(n, reference_population, center, genotype=g, num_loci=num_loci)
+                   for center, n, g in zip(centers, sizes, genotypes)]
+        return cls.combine(inocula)
+
+    @property
+    def cells(self):
+        """ List of cells. """
+        return [Cell(xy, chromosomes, lineage) for xy, chromosomes, lineage
+                in zip(self.xy, self.chromosomes, self.lineages.tolist())]
@@ -1,17 +1,112 @@
 from functools import reduce
-from operator import add
 import numpy as np
+from scipy.sparse import coo_matrix
+from scipy.sparse.csgraph import connected_components
+
+
+def label_patches(edges, genotypes):
+    """
+    Label contiguous patches of cells sharing a genotype in a single pass. Multiple loci are labeled at once by treating each locus as a separate copy of the cell graph.
+
+    Args:
+
+        edges (np.ndarray[int]) - (from, to) pairs of adjacent cells, M x 2
+
+        genotypes (np.ndarray[int]) - cell genotypes, length N, or N x L for L loci
+
+    Returns:
+
+        labels (np.ndarray[int]) - patch label of each cell, length N, or N x L with labels numbered from zero within each locus
+
+    """
+    genotypes = np.asarray(genotypes)
+    N = len(genotypes)
+    by_locus = genotypes.reshape(N, -1).T
+    L = len(by_locus)
+    edges = np.asarray(edges).reshape(-1, 2)
+
+    # connect adjacent cells sharing a genotype at each locus
+    same = by_locus[:, edges[:, 0]] == by_locus[:, edges[:, 1]]
+    loci, indices = same.nonzero()
+    edges = edges[indices] + (loci * N)[:, None]
+    weights = np.ones(len(edges), dtype=np.int8)
+    graph = coo_matrix((weights, (edges[:, 0], edges[:, 1])), shape=(N*L, N*L))
+    _, labels = connected_components(graph.tocsr(), directed=False)
+
+    # components never span loci, so each locus spans a contiguous range of labels
+    labels = labels.reshape(L, N)
+    labels = labels - labels.min(axis=1, keepdims=True)
+    return labels.T.reshape(genotypes.shape)
 
 
 class Patches:
-    """ Methods for analyzing patch patterns. """
+    """
+    Methods for analyzing patch patterns.
+
+    Attributes:
+
+        labels (np.ndarray[int]) - patch label of each cell
+
+        genotypes (np.ndarray[int]) - cell genotypes
+
+        include (tuple) - genotypes whose patches are analyzed
+
+        edge_statistics (EdgeStatistics) - contacts between adjacent cells, required for patch perimeters
+
+        cell_area (float) - area of an individual cell, required for compactness
+
+    """
+
+    def __init__(self, labels, genotypes,
+                 include=(0, 2),
+                 edge_statistics=None,
+                 cell_area=None):
+        """
+        Args:
 
-    def __init__(self, data):
-        self.data = data
+            labels (np.ndarray[int]) - patch label of each cell
+
+            genotypes (np.ndarray[int]) - cell genotypes
+
+            include (tuple) - genotypes whose patches are analyzed
+
+            edge_statistics (EdgeStatistics) - contacts between adjacent cells
+
+            cell_area (float) - area of an individual cell
+
+        """
+        self.labels = labels
+        self.genotypes = genotypes
+        self.include = tuple(include)
+        self.edge_statistics = edge_statistics
+        self.cell_area = cell_area
+
+        # count cells per patch and determine each patch's genotype
+        num_labels = labels.max() + 1 if labels.size > 0 else 0
+        self.counts = np.bincount(labels, minlength=num_labels)
+        self.patch_genotypes = np.zeros(num_labels, dtype=genotypes.dtype)
+        self.patch_genotypes[labels] = genotypes
+
+        # select patches of included genotypes, ordered by genotype
+        patch_ids = [(self.patch_genotypes == g).nonzero()[0] for g in include]
+        self.patch_ids = np.concatenate(patch_ids + [np.array([], int)])
 
     @property
     def keys(self):
-        return self.data.keys()
+        return self.include
+
+    @property
+    def data(self):
+        """ Dictionary of patch properties keyed by genotype. """
+        nodes = self.nodes
+        data = {}
+        for g in self.include:
+            selected = self.patch_genotypes[self.patch_ids] == g
+            data[g] = {
+                'number': int(selected.sum()),
+                'sizes': self.counts[self.patch_ids[selected]].tolist(),
+                'nodes': [n for n, s in zip(nodes, selected) if s]}
+        return data
 
     def apply(self, func, join):
         """ Apply to recombinant patches. """
@@ -20,11 +115,19 @@ class Patches:
     @property
     def num_patches(self):
         """ Number of patches. """
-        return self.apply(lambda x: x['number'], join=add)
+        return len(self.patch_ids)
 
     @property
     def sizes(self):
-        return self.apply(lambda x: x['sizes'], join=add)
+        """ Number of cells in each patch. """
+        return self.counts[self.patch_ids]
+
+    @property
+    def nodes(self):
+        """ Indices of cells in each patch. """
+        order = np.argsort(self.labels, kind='stable')
+        starts = np.cumsum(self.counts) - self.counts
+        return [order[starts[p]:starts[p]+self.counts[p]] for p in self.patch_ids]
 
     @property
     def mean_patch_size(self):
@@ -38,3 +141,33 @@ class Patches:
     def size_variation(self):
         sizes = self.sizes
         return np.std(sizes) / np.mean(sizes)
+
+    def _perimeter(self, weights=None):
+        """ Returns sum of <weights> over edges bounding each patch. """
+        assert self.edge_statistics is not None, 'Edge statistics required.'
+        edges = self.edge_statistics.edges
+        labels = self.labels[edges]
+        boundary = labels[:, 0] != labels[:, 1]
+        if weights is not None:
+            weights = np.tile(weights[boundary], 2)
+        n = len(self.counts)
+        perimeter = np.bincount(labels[boundary].T.ravel(), weights, minlength=n)
+        return perimeter[self.patch_ids]
+
+    @property
+    def boundary_edges(self):
+        """ Number of edges connecting each patch to neighbouring cells. """
+        return self._perimeter()
+
+    @property
+    def perimeters(self):
+        """ Length of the interface between each patch and neighbouring cells. Boundaries with the exterior of the culture are not included. """
+        return self._perimeter(self.edge_statistics.interface_lengths)
+
+    @property
+    def compactness(self):
+        """ Isoperimetric quotient of each patch, equal to one for a disk. """
+        assert self.cell_area is not None, 'Cell area required.'
+        areas = self.sizes * self.cell_area
+        with np.errstate(invalid='ignore', divide='ignore'):
+            return 4 * np.pi * areas / self.perimeters**2
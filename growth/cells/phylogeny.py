@@ -1,5 +1,6 @@
 import networkx as nx
-import matplotlib.pyplot as plt
+from ..imports import lazy_import
+plt = lazy_import('matplotlib.pyplot')
 
 
 class Dendrogram:
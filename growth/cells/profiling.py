@@ -0,0 +1,122 @@
+from time import perf_counter
+from os import sysconf
+from contextlib import contextmanager, nullcontext
+from ..imports import lazy_import
+pd = lazy_import('pandas')
+
+try:
+    import resource
+except ImportError:
+    resource = None
+
+
+def get_peak_memory():
+    """ Returns peak resident memory of the current process in MB. """
+    if resource is None:
+        return float('nan')
+    return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024
+
+
+def get_memory():
+    """ Returns current resident memory of the current process in MB, or the peak resident memory where the current value is unavailable. """
+    try:
+        with open('/proc/self/statm', 'r') as file:
+            pages = int(file.read().split()[1])
+    except (OSError, ValueError, IndexError):
+        return get_peak_memory()
+    return pages * sysconf('SC_PAGE_SIZE') / 2**20
+
+
+class GrowthProfiler:
+    """
+    Records the time spent in each phase of every growth generation, along with the population size and peak memory usage after each generation.
+
+    Attributes:
+
+        records (list of dict) - one record per generation
+
+        current (dict) - record for the generation in progress
+
+    """
+
+    # phases of a growth generation, in order of execution
+    phases = ('division', 'triangulation', 'graph', 'relaxation')
+
+    def __init__(self):
+        self.records = []
+        self.current = None
+
+    def __len__(self):
+        return len(self.records)
+
+    def start(self, generation):
+        """ Begin recording <generation>. """
+        self.current = {'generation': generation}
+        self.current.update({phase: 0. for phase in self.phases})
+        self._start_time = perf_counter()
+
+    def stop(self, population):
+        """ Finish recording the current generation. """
+        self.current['total'] = perf_counter() - self._start_time
+        self.current['population'] = population
+        self.current['memory'] = get_peak_memory()
+        self.records.append(self.current)
+        self.current = None
+
+    @contextmanager
+    def phase(self, name):
+        """ Context manager adding elapsed time to phase <name> of the current generation. """
+        start_time = perf_counter()
+        try:
+            yield
+        finally:
+            if self.current is not None:
+                elapsed = perf_counter() - start_time
+                self.current[name] = self.current.get(name, 0.) + elapsed
+
+    def to_dataframe(self):
+        """ Returns table of records, one row per generation. """
+        columns = ['generation', 'population'] + list(self.phases)
+        columns += ['total', 'memory']
+        return pd.DataFrame(self.records, columns=columns)
+
+    def summary(self):
+        """ Returns total time spent in each phase along with its fraction of the total. """
+        data = self.to_dataframe()
+        times = data[list(self.phases)+['total']].sum()
+        return pd.DataFrame({'time': times, 'fraction': times / times['total']})
+
+    def save(self, path):
+        """ Save records to a csv file at <path>. """
+        self.to_dataframe().to_csv(path, index=False)
+
+
+class CultureProfiling:
+    """
+    Methods for toggling growth instrumentation. When disabled, each instrumented phase enters a null context so that no timing or memory queries are performed.
+    """
+
+    @property
+    def profiler(self):
+        """ GrowthProfiler instance, or None if profiling is disabled. """
+        return self.__dict__.get('_profiler', None)
+
+    @property
+    def profiling(self):
+        """ If True, growth is instrumented. """
+        return self.profiler is not None
+
+    def enable_profiling(self):
+        """ Instrument growth, retaining any existing records. """
+        if self.profiler is None:
+            self._profiler = GrowthProfiler()
+
+    def disable_profiling(self):
+        """ Stop instrumenting growth and discard records. """
+        self.__dict__.pop('_profiler', None)
+
+    def profile(self, phase):
+        """ Returns context manager timing <phase> of the current generation. """
+        if self.profiler is None:
+            return nullcontext()
+        return self.profiler.phase(phase)
@@ -0,0 +1,234 @@
+import numpy as np
+
+from .cells import Cell
+from ..spatial.relaxation import get_overlap
+
+
+class DivisionScheduler:
+    """
+    Event-driven scheduler for cell division.
+
+    Rather than testing every cell for division in every generation, each cell is assigned the generation in which it next divides, drawn from a geometric distribution with success probability <division_rate>. Only cells whose division falls due are visited, and unchanged cells are neither tested nor copied.
+
+    The geometric distribution is memoryless, so pending division times may be discarded and redrawn at any point without altering the distribution of growth trajectories. The number of cells dividing in each generation therefore follows the same distribution as under per-generation Bernoulli trials.
+
+    Pending divisions are bucketed by generation and persist between runs, so each generation only touches the cells due to divide. Successive runs must therefore be passed the population returned by the previous run, with any new cells appended.
+
+    Attributes:
+
+        division_rate (float) - probability that a cell divides in any given generation
+
+        recombination_rate (float) - probability of recombination upon division
+
+        num_loci (int) - number of independent loci tracked per cell
+
+        daughters (np.ndarray[int]) - indices of cells created during the latest run
+
+        generation (int) - number of generations elapsed over all runs
+
+        size (int) - number of cells whose next division is scheduled
+
+        pending (dict) - arrays of indices of cells due to divide, keyed by generation
+
+    """
+
+    def __init__(self, division_rate=0.1, recombination_rate=0.1, num_loci=1):
+        """
+        Instantiate scheduler.
+
+        Args:
+
+            division_rate (float) - probability that a cell divides in any given generation
+
+            recombination_rate (float) - probability of recombination upon division
+
+            num_loci (int) - number of independent loci tracked per cell
+
+        """
+        self.division_rate = division_rate
+        self.recombination_rate = recombination_rate
+        self.num_loci = num_loci
+        self.daughters = np.array([], dtype=np.int64)
+        self.generation = 0
+        self.size = 0
+        self.pending = {}
+
+    def draw(self, size):
+        """ Returns number of generations until each of <size> cells divides. """
+        if self.division_rate <= 0:
+            return np.full(size, np.iinfo(np.int64).max // 2, dtype=np.int64)
+        if self.division_rate >= 1:
+            return np.ones(size, dtype=np.int64)
+        return np.random.geometric(self.division_rate, size).astype(np.int64)
+
+    def schedule(self, indices, generations):
+        """
+        Schedule division of cells <indices> in <generations>.
+
+        Args:
+
+            indices (np.ndarray[int]) - cell indices
+
+            generations (np.ndarray[int]) - generation in which each cell divides
+
+        """
+        order = np.argsort(generations, kind='stable')
+        indices, generations = indices[order], generations[order]
+        keys, starts = np.unique(generations, return_index=True)
+        for key, bucket in zip(keys.tolist(), np.split(indices, starts[1:])):
+            self.pending.setdefault(key, []).append(bucket)
+
+    def run(self, cells, num_generations=1, max_population=None):
+        """
+        Advance population by up to <num_generations> generations, modifying <cells> in place. Each dividing cell is replaced by its first daughter, and its second daughter is appended.
+
+        Args:
+
+            cells (list of Cell) - population
+
+            num_generations (int) - maximum number of generations
+
+            max_population (int) - if provided, stop after the first generation in which the population reaches this size
+
+        Returns:
+
+            generations (int) - number of generations elapsed
+
+        """
+
+        # discard pending divisions if the population does not extend the previous one
+        if len(cells) < self.size:
+            self.pending, self.size = {}, 0
+
+        # schedule next division of any cells not yet scheduled
+        if len(cells) > self.size:
+            indices = np.arange(self.size, len(cells))
+            self.schedule(indices, self.draw(len(indices)) + self.generation)
+            self.size = len(cells)
+
+        daughters = []
+        for generation in range(1, num_generations+1):
+            self.generation += 1
+
+            # divide cells whose division falls due in this generation
+            buckets = self.pending.pop(self.generation, [])
+            dividing = np.sort(np.concatenate(buckets)) if buckets else np.array([], dtype=np.int64)
+            children = Cell.divide_cells([cells[index] for index in dividing],
+                                         recombination_rate=self.recombination_rate,
+                                         num_loci=self.num_loci)
+            second = []
+            for index, (a, b) in zip(dividing, children):
+                cells[index] = a
+                second.append(b)
+            appended = np.arange(len(cells), len(cells)+len(second))
+            daughters.extend(dividing)
+            daughters.extend(appended)
+            cells.extend(second)
+
+            # schedule divisions of both daughters
+            delays = self.draw(2*len(dividing)) + self.generation
+            self.schedule(np.concatenate((dividing, appended)), delays)
+            self.size = len(cells)
+
+            if max_population is not None and len(cells) >= max_population:
+                break
+
+        self.daughters = np.unique(np.array(daughters, dtype=np.int64))
+
+        return generation
+
+
+class RelaxationScheduler:
+    """
+    Adaptive control of how often, and how hard, cell positions are relaxed.
+
+    Relaxation is skipped for up to <interval> - 1 consecutive generations, provided the fraction of overlapping cells remains below <max_overlap>. Each relaxation is capped at <maxiter> optimizer iterations. A relaxation that fails to converge within its cap is followed by another relaxation in the next generation, regardless of the interval. Whenever a generation has been skipped, local relaxation is replaced by global relaxation because it only accounts for the latest divisions.
+
+    Attributes:
+
+        interval (int) - largest number of generations between relaxations
+
+        max_overlap (float) - fraction of overlapping cells above which relaxation is performed regardless of the interval, if None overlap is not evaluated
+
+        overlap_distance (float) - distance between neighbouring cells, relative to the typical spacing between adjacent cells, below which they overlap
+
+        maxiter (int) - maximum number of optimizer iterations per relaxation, if None relax until converged
+
+        pending (int) - number of generations since the last relaxation
+
+    """
+
+    def __init__(self, interval=1, max_overlap=None, overlap_distance=0.5, maxiter=None):
+        """
+        Instantiate scheduler.
+
+        Args:
+
+            interval (int) - largest number of generations between relaxations
+
+            max_overlap (float) - fraction of overlapping cells above which relaxation is performed regardless of the interval
+
+            overlap_distance (float) - distance between neighbouring cells, relative to the typical spacing between adjacent cells, below which they overlap
+
+            maxiter (int) - maximum number of optimizer iterations per relaxation
+
+        """
+        self.interval = interval
+        self.max_overlap = max_overlap
+        self.overlap_distance = overlap_distance
+        self.maxiter = maxiter
+        self.pending = 0
+        self._unconverged = False
+
+    def get_overlap(self, culture):
+        """ Returns fraction of overlapping cells in <culture>. """
+        distance = self.overlap_distance * 2 * culture.cell_radius
+        return get_overlap(culture.xy, distance)
+
+    def step(self, culture, **kwargs):
+        """
+        Relax <culture> if due.
+
+        Args:
+
+            culture (Culture) - culture whose latest generation has just divided
+
+            kwargs: keyword arguments for Culture.move
+
+        Returns:
+
+            record (dict) - relaxation trace entry
+
+        """
+
+        # evaluate overlap
+        overlap = None
+        if self.max_overlap is not None:
+            overlap = self.get_overlap(culture)
+
+        # skip relaxation while within interval and overlap tolerance
+        due = self._unconverged or self.pending + 1 >= self.interval
+        if not due and (overlap is None or overlap <= self.max_overlap):
+            self.pending += 1
+            record = culture.record_relaxation('skipped')
+            record['overlap'] = overlap
+            return record
+
+        return self.relax(culture, overlap=overlap, **kwargs)
+
+    def relax(self, culture, overlap=None, **kwargs):
+        """ Relax <culture> within the iteration cap and return its relaxation trace entry. """
+        if self.pending > 0 and kwargs.get('relaxation') == 'local':
+            kwargs['relaxation'] = 'global'
+        record = culture.move(maxiter=self.maxiter, **kwargs)
+        record['overlap'] = overlap
+        self.pending = 0
+        self._unconverged = record['converged'] is not None and not record['converged']
+        return record
+
+    def finish(self, culture, **kwargs):
+        """ Relax <culture> if its latest generation was skipped, replacing the corresponding trace entry. """
+        if self.pending == 0:
+            return None
+        overlap = culture.relaxation_records.pop()['overlap']
+        return self.relax(culture, overlap=overlap, **kwargs)
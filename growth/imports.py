@@ -0,0 +1,42 @@
+"""
+Deferred imports of heavy dependencies.
+
+Plotting, statistical distributions and data frames are not needed to grow a culture, yet importing matplotlib.pyplot, scipy.stats and pandas dominates the time taken to import the package. Modules that use them bind a LazyModule in their place, which imports the underlying module upon first attribute access. A headless simulation worker therefore never pays for them.
+"""
+
+from importlib import import_module
+
+
+class LazyModule:
+    """
+    Placeholder for a module that is imported upon first attribute access.
+
+    Attributes:
+
+        name (str) - fully qualified module name
+
+    """
+
+    def __init__(self, name):
+        self.name = name
+        self._module = None
+
+    def __repr__(self):
+        return 'LazyModule({:s})'.format(self.name)
+
+    @property
+    def module(self):
+        """ Underlying module, imported upon first access. """
+        if self._module is None:
+            self._module = import_module(self.name)
+        return self._module
+
+    def __getattr__(self, attribute):
+        if attribute.startswith('__') or attribute in ('name', '_module'):
+            raise AttributeError(attribute)
+        return getattr(self.module, attribute)
+
+
+def lazy_import(name):
+    """ Returns LazyModule for module <name>. """
+    return LazyModule(name)
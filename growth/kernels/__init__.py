@@ -0,0 +1,116 @@
+"""
+Kernels for the innermost loops of growth simulation and analysis.
+
+Each kernel is implemented with NumPy and, if available, with Numba. The backend is selected at runtime via set_backend, or by the GROWTH_BACKEND environment variable. By default, Numba is used when it is installed, and NumPy otherwise. Both backends return identical results.
+"""
+
+from os import environ
+from importlib import import_module
+
+
+# available kernel backends, in order of preference
+BACKENDS = ('numba', 'numpy')
+
+# active backend module, resolved upon first use
+_backend = None
+
+
+def available_backends():
+    """ Returns names of backends that may be imported. """
+    available = []
+    for name in BACKENDS:
+        try:
+            import_module('.'+name+'_kernels', __name__)
+        except ImportError:
+            continue
+        available.append(name)
+    return available
+
+
+def set_backend(name=None):
+    """
+    Select kernel backend.
+
+    Args:
+
+        name (str) - 'numba', 'numpy' or 'auto', defaults to the GROWTH_BACKEND environment variable or 'auto'. If 'auto', Numba is used when it is installed.
+
+    """
+    global _backend
+    if name is None:
+        name = environ.get('GROWTH_BACKEND', 'auto')
+    if name == 'auto':
+        name = available_backends()[0]
+    assert name in BACKENDS, 'Backend must be one of {}.'.format(BACKENDS)
+    _backend = import_module('.'+name+'_kernels', __name__)
+
+
+def get_backend():
+    """ Returns name of active kernel backend. """
+    if _backend is None:
+        set_backend()
+    return _backend.__name__.rsplit('.', 1)[-1][:-len('_kernels')]
+
+
+def _get_module():
+    """ Returns active kernel backend module. """
+    if _backend is None:
+        set_backend()
+    return _backend
+
+
+def divide(xy, chromosomes, recombined, jitter):
+    """
+    Positions and chromosomes of the daughters of <N> dividing cells.
+
+    Args:
+
+        xy (np.ndarray[float]) - parent positions, N x 2
+
+        chromosomes (np.ndarray[int64]) - bit-packed parent chromosomes, N x 2
+
+        recombined (np.ndarray[int64]) - bit mask of loci whose alleles are sorted between daughters, length N
+
+        jitter (np.ndarray[float]) - displacement of each daughter from its parent, N x 2 x 2
+
+    Returns:
+
+        xy (np.ndarray[float]) - daughter positions, N x 2 x 2
+
+        chromosomes (np.ndarray[int64]) - bit-packed daughter chromosomes, N x 2 x 2
+
+    """
+    return _get_module().divide(xy, chromosomes, recombined, jitter)
+
+
+def polygon_centroid(points):
+    """ Returns area centroid of the polygonal chain through <points> (N x 2) as a length 2 array. """
+    return _get_module().polygon_centroid(points)
+
+
+def first_edges(edges, nodes):
+    """ Returns index of the first of <edges> (M x 2) containing each of <nodes>, or -1 if none do. """
+    return _get_module().first_edges(edges, nodes)
+
+
+def encode_lineages(chars):
+    """
+    Encode lineages as integer positions in a binary tree.
+
+    Args:
+
+        chars (np.ndarray[uint32]) - unicode code points of each lineage, zero-padded, N x D
+
+    Returns:
+
+        codes (np.ndarray[int64]) - tree position of each cell
+
+        depths (np.ndarray[int64]) - generation of each cell
+
+    """
+    return _get_module().encode_lineages(chars)
+
+
+def accumulate(im, rows, cols, values):
+    """ Add <values> to pixels of <im> at <rows> and <cols> in place, summing over repeated pixels. """
+    _get_module().accumulate(im, rows, cols, values)
@@ -0,0 +1,101 @@
+import numpy as np
+from numba import njit
+
+
+@njit(cache=True)
+def divide(xy, chromosomes, recombined, jitter):
+    """ Positions and chromosomes of the daughters of <N> dividing cells. """
+    N = xy.shape[0]
+    daughter_xy = np.empty((N, 2, 2), dtype=xy.dtype)
+    daughter_chromosomes = np.empty((N, 2, 2), dtype=chromosomes.dtype)
+    for i in range(N):
+        a, b = chromosomes[i, 0], chromosomes[i, 1]
+
+        # recombination sorts alleles of each recombined locus between daughters
+        mask = recombined[i]
+        low, high = a & b, a | b
+        daughter_chromosomes[i, 0, 0] = (a & ~mask) | (low & mask)
+        daughter_chromosomes[i, 0, 1] = (b & ~mask) | (low & mask)
+        daughter_chromosomes[i, 1, 0] = (a & ~mask) | (high & mask)
+        daughter_chromosomes[i, 1, 1] = (b & ~mask) | (high & mask)
+
+        for j in range(2):
+            for k in range(2):
+                daughter_xy[i, j, k] = xy[i, k] + jitter[i, j, k]
+
+    return daughter_xy, daughter_chromosomes
+
+
+@njit(cache=True)
+def polygon_centroid(points):
+    """ Returns area centroid of the polygonal chain through <points>. """
+    N = points.shape[0]
+    shift_x, shift_y = 0., 0.
+    for i in range(N):
+        shift_x += points[i, 0]
+        shift_y += points[i, 1]
+    shift_x, shift_y = shift_x / N, shift_y / N
+
+    # polygon's signed area, centroid's x and y
+    area, C_x, C_y = 0., 0., 0.
+    for i in range(N-1):
+        x0, y0 = points[i, 0]-shift_x, points[i, 1]-shift_y
+        x1, y1 = points[i+1, 0]-shift_x, points[i+1, 1]-shift_y
+        s = x0 * y1 - x1 * y0
+        area += s
+        C_x += (x0 + x1) * s
+        C_y += (y0 + y1) * s
+    A = 0.5 * area
+
+    centroid = np.empty(2, dtype=np.float64)
+    centroid[0] = shift_x + C_x / (6.0 * A)
+    centroid[1] = shift_y + C_y / (6.0 * A)
+    return centroid
+
+
+@njit(cache=True)
+def first_edges(edges, nodes):
+    """ Returns index of the first of <edges> containing each of <nodes>, or -1 if none do. """
+    size = 0
+    for i in range(edges.shape[0]):
+        size = max(size, edges[i, 0]+1, edges[i, 1]+1)
+    for i in range(nodes.shape[0]):
+        size = max(size, nodes[i]+1)
+
+    # visit edges in reverse so that the first occurrence is retained
+    first = -np.ones(size, dtype=np.int64)
+    for i in range(edges.shape[0]-1, -1, -1):
+        first[edges[i, 1]] = i
+        first[edges[i, 0]] = i
+
+    indices = np.empty(nodes.shape[0], dtype=np.int64)
+    for i in range(nodes.shape[0]):
+        indices[i] = first[nodes[i]]
+    return indices
+
+
+@njit(cache=True)
+def encode_lineages(chars):
+    """ Encode lineages as integer positions in a binary tree. """
+    N, D = chars.shape
+    codes = np.empty(N, dtype=np.int64)
+    depths = np.empty(N, dtype=np.int64)
+    for i in range(N):
+        code, depth = 1, 0
+        for j in range(D):
+            if chars[i, j] == 0:
+                break
+            code = code << 1
+            if chars[i, j] == 49:
+                code += 1
+            depth += 1
+        codes[i] = code
+        depths[i] = depth
+    return codes, depths
+
+
+@njit(cache=True)
+def accumulate(im, rows, cols, values):
+    """ Add <values> to pixels of <im> in place. """
+    for i in range(values.shape[0]):
+        im[rows[i], cols[i]] += values[i]
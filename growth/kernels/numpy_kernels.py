@@ -0,0 +1,55 @@
+import numpy as np
+
+
+def divide(xy, chromosomes, recombined, jitter):
+    """ Positions and chromosomes of the daughters of <N> dividing cells. """
+
+    # duplicate chromosomes, sorting alleles of recombined loci between daughters
+    mask = recombined.reshape(-1, 1, 1)
+    low = (chromosomes[:, 0] & chromosomes[:, 1]).reshape(-1, 1, 1)
+    high = (chromosomes[:, 0] | chromosomes[:, 1]).reshape(-1, 1, 1)
+    sorted_alleles = np.concatenate((low, high), axis=1)
+    duplicated = (chromosomes[:, None, :] & ~mask) | (sorted_alleles & mask)
+
+    return xy[:, None, :] + jitter, duplicated
+
+
+def polygon_centroid(points):
+    """ Returns area centroid of the polygonal chain through <points>. """
+
+    # polygon's signed area, centroid's x and y
+    shift = points.mean(axis=0)
+    x0, y0 = points[:-1, 0]-shift[0], points[:-1, 1]-shift[1]
+    x1, y1 = points[1:, 0]-shift[0], points[1:, 1]-shift[1]
+    s = x0 * y1 - x1 * y0
+    A = 0.5 * s.sum()
+    C_x = ((x0 + x1) * s).sum() / (6.0 * A)
+    C_y = ((y0 + y1) * s).sum() / (6.0 * A)
+    return shift + np.array([C_x, C_y])
+
+
+def first_edges(edges, nodes):
+    """ Returns index of the first of <edges> containing each of <nodes>, or -1 if none do. """
+    flat = np.asarray(edges).ravel()
+    unique, positions = np.unique(flat, return_index=True)
+    index = np.clip(np.searchsorted(unique, nodes), 0, max(len(unique)-1, 0))
+    found = unique[index] == nodes if len(unique) > 0 else np.zeros(len(nodes), dtype=bool)
+    return np.where(found, positions[index] // 2, -1)
+
+
+def encode_lineages(chars):
+    """ Encode lineages as integer positions in a binary tree. """
+    depths = (chars != 0).sum(axis=1)
+
+    # accumulate bits, most significant first, then prepend leading one
+    powers = depths[:, None] - 1 - np.arange(chars.shape[1])[None, :]
+    bits = (chars == ord('1')) & (powers >= 0)
+    codes = (bits * (np.int64(1) << np.clip(powers, 0, None))).sum(axis=1)
+    codes += np.int64(1) << depths
+
+    return codes.astype(np.int64), depths.astype(np.int64)
+
+
+def accumulate(im, rows, cols, values):
+    """ Add <values> to pixels of <im> in place. """
+    np.add.at(im, (rows, cols), values)
@@ -1,9 +1,11 @@
 import numpy as np
-import pandas as pd
+from ..imports import lazy_import
+pd = lazy_import('pandas')
 
 from .sampling import LognormalSampler, MultiLognormalSampler
 from .conditional import ConditionedLognormalSampler
 from .conditional import ConditionedMultiLognormalSampler
+from .. import precision
 
 
 class MeasurementGenerator:
@@ -40,6 +42,10 @@ class MeasurementGenerator:
         # generate measurements
         self.generate_measurements()
 
+        # store measurements at the active precision
+        columns = self.data.select_dtypes('float').columns
+        self.data[columns] = self.data[columns].astype(precision.get_dtype())
+
     @property
     def N(self):
         """ Number of samples. """
@@ -1,6 +1,7 @@
 import numpy as np
-import scipy.stats as st
-import matplotlib.pyplot as plt
+from ..imports import lazy_import
+st = lazy_import('scipy.stats')
+plt = lazy_import('matplotlib.pyplot')
 from matplotlib.colors import Normalize
 
 
@@ -1 +1,4 @@
 from .microscopy import SyntheticMicroscopy
+from .tiles import TiledSyntheticMicroscopy
+from .pipeline import MicroscopyPipeline
+from .statistics import SegmentStatistics
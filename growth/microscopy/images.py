@@ -1,8 +1,10 @@
 import numpy as np
-import matplotlib.pyplot as plt
+from ..imports import lazy_import
+plt = lazy_import('matplotlib.pyplot')
 from copy import deepcopy
 
 from ..measure import ConditionedLognormalSampler
+from .. import precision
 
 
 class ScalarImage:
@@ -42,7 +44,7 @@ class ScalarImage:
 
     def initialize(self):
         """ Initialize blank image. """
-        self.im = np.zeros((self.height, self.width), dtype=np.float64)
+        self.im = np.zeros((self.height, self.width), dtype=precision.get_dtype())
 
     def fill(self, mu=0.1, sigma=0.1):
         """
@@ -59,7 +61,7 @@ class ScalarImage:
         self.im[:, :] = pixels
 
     @staticmethod
-    def _render(im, vmin=0, vmax=None, cmap=plt.cm.Greys, size=5, ax=None):
+    def _render(im, vmin=0, vmax=None, cmap=None, size=5, ax=None):
         """
         Render image.
 
@@ -69,7 +71,7 @@ class ScalarImage:
 
             vmin, vmax (int) - colormap bounds
 
-            cmap (matplotlib.ColorMap or str) - if value is 'r', 'g', or 'b', use RGB colorscheme
+            cmap (matplotlib.ColorMap or str) - if value is 'r', 'g', or 'b', use RGB colorscheme, defaults to greyscale
 
             size (int) - image panel size, in inches
 
@@ -83,6 +85,9 @@ class ScalarImage:
         if vmax is None:
             vmax = im.max()
 
+        if cmap is None:
+            cmap = plt.cm.Greys
+
         # render image
         if type(cmap) == str:
             assert cmap in 'rgb', 'Color not recognized.'
@@ -1,11 +1,12 @@
+from concurrent.futures import ThreadPoolExecutor
 import numpy as np
-import matplotlib.pyplot as plt
-from scipy.ndimage import maximum_filter
-from scipy.ndimage import binary_dilation
-from scipy.ndimage import measurements
+from ..imports import lazy_import
+plt = lazy_import('matplotlib.pyplot')
 
 from .images import ScalarImage, DependentScalarImage
-from .nucleus import Nucleus, NucleusLabel, disk
+from .nucleus import NucleusRasterizer
+from .statistics import SegmentStatistics
+from .. import precision
 
 
 class SyntheticImage(ScalarImage):
@@ -27,6 +28,10 @@ class SyntheticImage(ScalarImage):
 
         height, width (int) - image dimensions, in pixels
 
+        seed (int or np.random.SeedSequence) - seed for per-channel random number generators
+
+    Segmentation and foreground masks are computed once per set of centroids and nuclear radius, then cached until either is reassigned.
+
     """
 
     def __init__(self, data,
@@ -34,7 +39,8 @@ class SyntheticImage(ScalarImage):
                  bg_noise=0.3,
                  radius=6,
                  height=1000,
-                 width=1000):
+                 width=1000,
+                 seed=None):
         """
         Instantiate synthetic image from a set of synthetic measurements.
 
@@ -50,11 +56,16 @@ class SyntheticImage(ScalarImage):
 
             height, width (int) - image dimensions, in pixels
 
+            seed (int or np.random.SeedSequence) - if provided, each channel is drawn from an independent, deterministic random number stream. Otherwise the global numpy generator is used.
+
         """
 
         # instantiate a scalar image
         super().__init__(height=height, width=width)
 
+        # set random number generators
+        self.set_seed(seed)
+
         # store data
         self.data = data
 
@@ -84,6 +95,55 @@ class SyntheticImage(ScalarImage):
         """ Number of fluorescence channels. """
         return self.im.shape[0]
 
+    @property
+    def centroids(self):
+        """ Nuclear positions in image. """
+        return self._centroids
+
+    @centroids.setter
+    def centroids(self, centroids):
+        """ Set nuclear positions and discard cached masks. """
+        self._centroids = centroids
+        self.reset_masks()
+
+    @property
+    def radius(self):
+        """ Nuclear radius, in pixels. """
+        return self._radius
+
+    @radius.setter
+    def radius(self, radius):
+        """ Set nuclear radius and discard cached masks. """
+        self._radius = radius
+        self.reset_masks()
+
+    def set_seed(self, seed=None):
+        """ Assign an independent random number generator to each channel. """
+        self.seed = seed
+        if seed is None:
+            self.rngs = None
+        else:
+            if not isinstance(seed, np.random.SeedSequence):
+                seed = np.random.SeedSequence(seed)
+            streams = seed.spawn(self.num_channels)
+            self.rngs = [np.random.default_rng(s) for s in streams]
+
+    def get_rng(self, channel=0):
+        """ Returns random number generator for <channel>. """
+        if getattr(self, 'rngs', None) is None:
+            return np.random
+        return self.rngs[channel]
+
+    def reset_masks(self):
+        """ Discard cached segmentation and foreground masks. """
+        self._segmentation = None
+        self._foreground_mask = None
+
+    @property
+    def rasterizer(self):
+        """ Rasterizer for drawing all nuclei at once. """
+        return NucleusRasterizer(radius=self.radius)
+
     @property
     def num_nuclei(self):
         """ Number of nuclei. """
@@ -92,16 +152,16 @@ class SyntheticImage(ScalarImage):
     @property
     def segmentation(self):
         """ Segment label mask. """
-        mask = np.ones((self.shape), dtype=np.int64) * -1
-        mask[tuple(self.centroids.T)] = np.arange(self.num_nuclei)
-        return maximum_filter(mask, footprint=disk(self.radius))
+        if getattr(self, '_segmentation', None) is None:
+            self._segmentation = self._build_segmentation()
+        return self._segmentation
 
     @property
     def foreground_mask(self):
         """ Foreground mask. """
-        mask = np.zeros((self.shape), dtype=bool)
-        mask[tuple(self.centroids.T)] = True
-        return binary_dilation(mask, structure=disk(self.radius))
+        if getattr(self, '_foreground_mask', None) is None:
+            self._foreground_mask = self.segmentation >= 0
+        return self._foreground_mask
 
     @property
     def foreground_pixels(self):
@@ -143,13 +203,19 @@ class SyntheticImage(ScalarImage):
     def initialize(self):
         """ Initialize blank image. """
         shape = (1, self.height, self.width)
-        self.im = np.zeros(shape, dtype=np.float64)
+        self.im = np.zeros(shape, dtype=precision.get_dtype())
 
     def _measure(self, channel):
         """ Returns measured <channel> level in for each contour. """
-        labels = self.segmentation
-        index = np.arange(self.num_nuclei)
-        return measurements.mean(self.im[channel], labels=labels, index=index)
+        im, labels = self.im[channel], self.segmentation
+        return SegmentStatistics(im, labels, self.num_nuclei).mean[0]
+
+    def measure_statistics(self):
+        """
+        Returns area along with mean, std, median and integrated intensity of every channel within each contour. Columns are prefixed by channel index, e.g. ch1_mean, and rows are aligned with the measurement data.
+        """
+        statistics = SegmentStatistics(self.im, self.segmentation, self.num_nuclei)
+        return statistics.to_dataframe(index=self.data.index)
 
     def measure(self):
         """ Returns measured fluorescence level in each contour. """
@@ -159,7 +225,8 @@ class SyntheticImage(ScalarImage):
         """
         Fill background of specified channel with values sampled from a lognormal distribution.
         """
-        pixels = np.exp(np.random.normal(np.log(mu), sigma, size=self.shape))
+        rng = self.get_rng(channel)
+        pixels = np.exp(rng.normal(np.log(mu), sigma, size=self.shape))
         self.im[channel, :, :] = pixels
 
     def fill(self, mu, sigma):
@@ -177,14 +244,9 @@ class SyntheticImage(ScalarImage):
             im (2D np.ndarray[np.int64]) - segmentation mask
 
         """
-        mask = np.ones((self.shape), dtype=np.int64) * -1
-        for i in range(self.num_nuclei):
-            xy = self.centroids[i]
-            nucleus = NucleusLabel(xy, label=i, radius=self.radius)
-            nucleus.draw(mask)
-        return mask
+        return self.rasterizer.label(self.shape, self.centroids)
 
-    def _draw_nuclei(self, im, means, stds, replace=True):
+    def _draw_nuclei(self, im, means, stds, replace=True, rng=None):
         """
         Draw individal nuclei on specified channel of the image.
 
@@ -198,11 +260,12 @@ class SyntheticImage(ScalarImage):
 
             replace (bool) - if True, replace existing pixels
 
+            rng (np.random.Generator) - random number generator
+
         """
-        for i in range(self.num_nuclei):
-            xy = self.centroids[i]
-            nucleus = Nucleus(xy, means[i], stds[i], radius=self.radius)
-            nucleus.draw(im, replace=replace)
+        self.rasterizer.draw(im, self.centroids, means, stds,
+                             replace=replace,
+                             rng=rng)
 
     def draw_nuclei(self, means, stds):
         """
@@ -214,7 +277,7 @@ class SyntheticImage(ScalarImage):
             stds (np.ndarray[float]) - std dev of log-transformed pixel values within each nucleus
 
         """
-        self._draw_nuclei(self.im[0], means, stds)
+        self._draw_nuclei(self.im[0], means, stds, rng=self.get_rng(0))
 
     def render(self, ax=None, size=2, vmax=None, **kwargs):
         """
@@ -249,19 +312,47 @@ class SyntheticImage(ScalarImage):
 
         return fig
 
-    def render_mask(self, attribute, **kwargs):
+    def build_attribute_masks(self, attributes):
         """
-        Render image masked by specified nucleus <attribute>.
+        Returns images in which each nucleus is filled with its value of each of several <attributes>. Segment labels are matched to the measurement index, each attribute retains its dtype, and background pixels or segments absent from the index are masked.
+
+        Args:
+
+            attributes (list of str) - nucleus attributes
+
+        Returns:
+
+            masks (dict) - {attribute: np.ma.MaskedArray} pairs
+
         """
 
-        indices, values = self.data.index.values, self.data[attribute]
-        segment_to_label = dict(zip(indices, values))
-        segment_to_label[-1] = -1
-        segment_to_label = np.vectorize(segment_to_label.get)
+        # map segment labels to rows of the measurement data, the last entry (label -1) being the background
+        positions = self.data.index.get_indexer(np.arange(len(self.centroids)))
+        rows = np.append(positions, -1)[self.segmentation]
+        background = rows < 0
+        rows[background] = 0
+
+        # fill each nucleus with its attribute values
+        masks = {}
+        for attribute in attributes:
+            values = self.data[attribute].to_numpy()
+            if len(values) == 0:
+                im = np.zeros(rows.shape, dtype=values.dtype)
+            else:
+                im = values[rows]
+            masks[attribute] = np.ma.MaskedArray(im, background)
+
+        return masks
 
-        label_mask = segment_to_label(self.segmentation)
-        label_mask = np.ma.MaskedArray(label_mask, label_mask==-1)
+    def build_attribute_mask(self, attribute):
+        """ Returns image in which each nucleus is filled with its <attribute> value. """
+        return self.build_attribute_masks([attribute])[attribute]
 
+    def render_mask(self, attribute, **kwargs):
+        """
+        Render image masked by specified nucleus <attribute>.
+        """
+        label_mask = self.build_attribute_mask(attribute)
         return self._render(label_mask.T, **kwargs)
 
 
@@ -276,7 +367,9 @@ class SyntheticMicroscopy(SyntheticImage):
                  bg_noise=0.3,
                  radius=6,
                  height=1000,
-                 width=1000):
+                 width=1000,
+                 seed=None,
+                 num_threads=1):
         """
         Instantiate synthetic image from a set of synthetic measurements.
 
@@ -294,6 +387,10 @@ class SyntheticMicroscopy(SyntheticImage):
 
             height, width (int) - image dimensions, in pixels
 
+            seed (int or np.random.SeedSequence) - if provided, each channel is drawn from an independent, deterministic random number stream
+
+            num_threads (int) - number of threads used to draw channels concurrently
+
         """
 
         # instantiate image
@@ -302,15 +399,14 @@ class SyntheticMicroscopy(SyntheticImage):
                          bg_noise=bg_noise,
                          radius=radius,
                          height=height,
-                         width=width)
+                         width=width,
+                         seed=seed)
 
         # set bleedthrough coefficient
         self.bleedthrough = bleedthrough
 
         # draw image channels
-        self.draw_nuclear_stain()
-        self.draw_clonal_marker()
-        self.draw_control()
+        self.draw_channels(num_threads=num_threads)
 
     def __getitem__(self, channel):
         """ Returns SyntheticImage of <channel>. """
@@ -321,17 +417,23 @@ class SyntheticMicroscopy(SyntheticImage):
             radius=self.radius,
             height=self.height,
             width=self.width)
-        return super().from_channel(*args, **kwargs)
+        image = super().from_channel(*args, **kwargs)
+
+        # share cached masks
+        image._segmentation = self.segmentation
+        image._foreground_mask = self.foreground_mask
+
+        return image
 
     @property
     def foreground_pixels(self):
         """ Return all pixels from foreground. """
-        return self.im[np.stack((self.foreground_mask,) * 3)]
+        return self.im[:, self.foreground_mask].ravel()
 
     @property
     def background_pixels(self):
         """ Return all pixels from background. """
-        return self.im[~np.stack((self.foreground_mask,) * 3)]
+        return self.im[:, ~self.foreground_mask].ravel()
 
     @property
     def max(self):
@@ -352,7 +454,7 @@ class SyntheticMicroscopy(SyntheticImage):
 
     def initialize(self):
         """ Initialize blank image. """
-        self.im = np.zeros((3, self.height, self.width), dtype=np.float64)
+        self.im = np.zeros((3, self.height, self.width), dtype=precision.get_dtype())
 
     def measure(self, channel):
         """ Returns measured level of <channel> in each contour. """
@@ -376,7 +478,8 @@ class SyntheticMicroscopy(SyntheticImage):
             stds (np.ndarray[float]) - std dev of log-transformed pixel values within each nucleus
 
         """
-        self._draw_nuclei(self.im[channel], means, stds)
+        rng = self.get_rng(channel)
+        self._draw_nuclei(self.im[channel], means, stds, rng=rng)
 
     def add_correlated_fluorescence(self, src, dst, rho=1.):
         """
@@ -411,13 +514,38 @@ class SyntheticMicroscopy(SyntheticImage):
 
         # sample background pixels
         mu, sigma = np.log(self.bg_level), self.bg_noise
-        background = np.exp(np.random.normal(mu, sigma, size=self.shape))
+        rng = self.get_rng(dst)
+        background = np.exp(rng.normal(mu, sigma, size=self.shape))
 
         # evaluate bleed
         bleed = self.im[src]
 
         self.im[dst] = self.im[dst] + (rho*bleed+(1-rho) * background)
 
+    def draw_channels(self, num_threads=1):
+        """
+        Draw all image channels.
+
+        Args:
+
+            num_threads (int) - if greater than one, the nuclear stain, clonal marker and control nuclei are drawn concurrently in a thread pool before bleedthrough is added. Results are only reproducible if the image is seeded.
+
+        """
+
+        if num_threads <= 1:
+            self.draw_nuclear_stain()
+            self.draw_clonal_marker()
+            self.draw_control()
+
+        else:
+            steps = (self.draw_nuclear_stain,
+                     self.draw_clonal_marker,
+                     self.draw_control_nuclei)
+            with ThreadPoolExecutor(max_workers=num_threads) as executor:
+                futures = [executor.submit(step) for step in steps]
+                _ = [future.result() for future in futures]
+            self.add_bleedthrough(1, 2, rho=self.bleedthrough)
+
     def draw_nuclear_stain(self):
         """ Draw synthetic nuclear stain. """
 
@@ -440,13 +568,17 @@ class SyntheticMicroscopy(SyntheticImage):
         stds = self.data['clonal_marker_std'].values
         self.draw_nuclei(channel=1, means=means, stds=stds)
 
+    def draw_control_nuclei(self):
+        """ Draw synthetic control protein nuclei. """
+        means = self.data['control'].values
+        stds = self.data['control_std'].values
+        self.draw_nuclei(channel=2, means=means, stds=stds)
+
     def draw_control(self):
         """ Draw synthetic control protein. """
 
         # draw nuclei
-        means = self.data['control'].values
-        stds = self.data['control_std'].values
-        self.draw_nuclei(channel=2, means=means, stds=stds)
+        self.draw_control_nuclei()
 
         # add bleedthrough
         self.add_bleedthrough(1, 2, rho=self.bleedthrough)
@@ -2,6 +2,7 @@ import numpy as np
 from copy import deepcopy
 
 from ..measure import LognormalSampler
+from .. import kernels
 
 
 def disk(radius, dtype=int):
@@ -16,6 +17,139 @@ def disk(radius, dtype=int):
     return np.array((X ** 2 + Y ** 2) <= radius ** 2, dtype=dtype)
 
 
+class NucleusRasterizer:
+    """
+    Class for drawing many equally sized nuclei on an existing image at once.
+
+    The disk stencil is computed once, and the pixel indices spanned by all nuclei are formed with a single broadcast. Pixels are ordered nucleus by nucleus, matching the order in which individual Nucleus instances are drawn.
+
+    Attributes:
+
+        radius (int) - nuclear radius, in pixels
+
+        offsets (np.ndarray[int]) - pixel offsets spanned by a nucleus, P x 2
+
+    """
+
+    def __init__(self, radius=6):
+        """
+
+        Args:
+
+            radius (int) - nuclear radius, in pixels
+
+        """
+        self.radius = radius
+
+        # define pixel offsets spanned by disk stencil
+        L = np.arange(-radius, radius+1)
+        xx, yy = np.meshgrid(L, L)
+        circle_mask = disk(radius).astype(bool)
+        self.offsets = np.stack((xx[circle_mask], yy[circle_mask]), axis=1)
+
+    @property
+    def num_pixels(self):
+        """ Number of pixels per nucleus. """
+        return len(self.offsets)
+
+    def build_fill_indices(self, centroids, shape):
+        """
+        Returns pixel indices spanned by all nuclei.
+
+        Args:
+
+            centroids (np.ndarray[int]) - nuclear positions in image, N x 2
+
+            shape (tuple) - image shape
+
+        Returns:
+
+            indices (tuple) - row and column indices of all pixels, ordered by nucleus
+
+            within (np.ndarray[bool]) - mask of pixels that lie within the image, length N*P
+
+        """
+        xy = centroids.astype(np.int64).reshape(-1, 1, 2) + self.offsets
+        xx, yy = xy[..., 0].ravel(), xy[..., 1].ravel()
+        within = (xx >= 0) & (xx < shape[0]) & (yy >= 0) & (yy < shape[1])
+        return (xx[within], yy[within]), within
+
+    def label(self, shape, centroids):
+        """
+        Returns segmentation mask in which each nucleus is labeled by its index. Where nuclei overlap, the pixel takes the largest label. Background pixels are labeled -1.
+
+        Args:
+
+            shape (tuple) - image shape
+
+            centroids (np.ndarray[int]) - nuclear positions in image, N x 2
+
+        Returns:
+
+            mask (2D np.ndarray[np.int64]) - segmentation mask
+
+        """
+        mask = np.ones(shape, dtype=np.int64) * -1
+        indices, within = self.build_fill_indices(centroids, shape)
+        labels = np.repeat(np.arange(len(centroids)), self.num_pixels)
+        np.maximum.at(mask, indices, labels[within])
+        return mask
+
+    def sample(self, means, stds, rng=None):
+        """
+        Sample the log-normally distributed values of all nuclear pixels in a single call.
+
+        Args:
+
+            means (np.ndarray[float]) - mean fluorescence level for each nucleus
+
+            stds (np.ndarray[float]) - std dev of log-transformed pixel values within each nucleus
+
+            rng (np.random.Generator) - random number generator, defaults to the global numpy generator
+
+        Returns:
+
+            values (np.ndarray[float]) - pixel values, ordered by nucleus
+
+        """
+        if rng is None:
+            rng = np.random
+        mu = np.repeat(np.log(means), self.num_pixels)
+        sigma = np.repeat(stds, self.num_pixels)
+        return rng.lognormal(mu, sigma, size=mu.size)
+
+    def draw(self, im, centroids, means, stds, replace=False, rng=None):
+        """
+        Sample individual pixel values for all nuclei and add them to <im>.
+
+        Args:
+
+            im (np.ndarray[float]) - 2D array of image pixels
+
+            centroids (np.ndarray[int]) - nuclear positions in image, N x 2
+
+            means (np.ndarray[float]) - mean fluorescence level for each nucleus
+
+            stds (np.ndarray[float]) - std dev of log-transformed pixel values within each nucleus
+
+            replace (bool) - if True, replace existing pixel values
+
+            rng (np.random.Generator) - random number generator, defaults to the global numpy generator
+
+        """
+        indices, within = self.build_fill_indices(centroids, im.shape)
+        values = self.sample(means, stds, rng=rng)[within]
+
+        # overlapping pixels take the value of the nucleus with the largest index, matching label
+        if replace:
+            pixels = np.ravel_multi_index(indices, im.shape)
+            _, last = np.unique(pixels[::-1], return_index=True)
+            visible = pixels.size - 1 - last
+            im[indices[0][visible], indices[1][visible]] = values[visible]
+        else:
+            kernels.accumulate(im, *indices, values)
+
+
 class NucleusLabel:
     """
     Class for drawing an individual nucleus label on an existing image.
@@ -0,0 +1,129 @@
+from concurrent.futures import ThreadPoolExecutor, ProcessPoolExecutor
+from time import time
+import numpy as np
+
+from .microscopy import SyntheticMicroscopy
+
+
+def render_field(data, seed, kwargs):
+    """ Returns SyntheticMicroscopy rendered from <data> with <seed>. """
+    return SyntheticMicroscopy(data, seed=seed, **kwargs)
+
+
+class MicroscopyPipeline:
+    """
+    Class for rendering synthetic microscopy for many independent fields, e.g. one per simulation in a sweep.
+
+    Fields are rendered concurrently in a thread or process pool, and the channels of each field may in turn be drawn concurrently. Each field is assigned its own random number stream spawned from a single seed, so results do not depend on the number of workers or the order in which fields complete.
+
+    Attributes:
+
+        fields (list of pd.DataFrame) - synthetic measurements for each field
+
+        seeds (list of np.random.SeedSequence) - random number stream for each field
+
+        max_workers (int) - number of fields rendered concurrently
+
+        processes (bool) - if True, render fields in a process pool
+
+        microscopy_kwargs (dict) - keyword arguments for SyntheticMicroscopy
+
+    """
+
+    def __init__(self, fields,
+                 seed=None,
+                 max_workers=None,
+                 processes=False,
+                 **microscopy_kwargs):
+        """
+        Instantiate pipeline.
+
+        Args:
+
+            fields (list of pd.DataFrame) - synthetic measurements for each field
+
+            seed (int) - seed from which per-field random number streams are spawned
+
+            max_workers (int) - number of fields rendered concurrently, defaults to the executor's default
+
+            processes (bool) - if True, render fields in a process pool rather than a thread pool
+
+            microscopy_kwargs: keyword arguments for SyntheticMicroscopy, e.g. bleedthrough or num_threads
+
+        """
+        self.fields = list(fields)
+        self.seeds = np.random.SeedSequence(seed).spawn(len(self.fields))
+        self.max_workers = max_workers
+        self.processes = processes
+        self.microscopy_kwargs = microscopy_kwargs
+
+    @classmethod
+    def from_cultures(cls, cultures, ambiguity=0.1, rho=0.0,
+                      measurement_kwargs={}, **kwargs):
+        """
+        Instantiate pipeline from a list of cultures.
+
+        Args:
+
+            cultures (iterable) - Culture instances
+
+            ambiguity (float) - clonal marker ambiguity coefficient
+
+            rho (float) - expression capacity correlation coefficient
+
+            measurement_kwargs (dict) - keyword arguments for measurement generation
+
+            kwargs: keyword arguments for pipeline
+
+        """
+        fields = [c.measure(ambiguity, rho, **measurement_kwargs) for c in cultures]
+        return cls(fields, **kwargs)
+
+    @property
+    def num_fields(self):
+        """ Number of fields. """
+        return len(self.fields)
+
+    @property
+    def executor(self):
+        """ Executor used to render fields. """
+        if self.processes:
+            return ProcessPoolExecutor(max_workers=self.max_workers)
+        return ThreadPoolExecutor(max_workers=self.max_workers)
+
+    def render(self):
+        """
+        Render all fields.
+
+        Returns:
+
+            images (list of SyntheticMicroscopy) - rendered images, ordered by field
+
+        """
+        kwargs = [self.microscopy_kwargs] * self.num_fields
+        with self.executor as executor:
+            images = executor.map(render_field, self.fields, self.seeds, kwargs)
+            return list(images)
+
+    def benchmark(self, repeats=1):
+        """
+        Time rendering of all fields.
+
+        Args:
+
+            repeats (int) - number of times all fields are rendered
+
+        Returns:
+
+            timing (dict) - number of images rendered, total runtime (seconds) and throughput (images per second)
+
+        """
+        start = time()
+        for _ in range(repeats):
+            _ = self.render()
+        runtime = time() - start
+        num_images = repeats * self.num_fields
+        return {
+            'images': num_images,
+            'runtime': runtime,
+            'images_per_second': num_images / runtime}
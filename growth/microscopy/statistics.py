@@ -0,0 +1,137 @@
+import numpy as np
+from ..imports import lazy_import
+pd = lazy_import('pandas')
+
+
+class SegmentStatistics:
+    """
+    Class for evaluating pixel statistics of every labeled segment in a multichannel image. All statistics are computed with bincount-style reductions over a single extraction of the labeled pixels, rather than one scan of the image per channel and statistic.
+
+    Attributes:
+
+        labels (np.ndarray[int]) - segment label of each labeled pixel, length M
+
+        pixels (np.ndarray[float]) - values of each labeled pixel, C x M
+
+        num_labels (int) - number of segments
+
+    """
+
+    def __init__(self, im, segmentation, num_labels=None):
+        """
+        Extract labeled pixels.
+
+        Args:
+
+            im (np.ndarray[float]) - image, C x height x width or height x width
+
+            segmentation (np.ndarray[int]) - segment label mask, height x width, in which background pixels are labeled -1
+
+            num_labels (int) - number of segments, defaults to the largest label plus one
+
+        """
+        if len(im.shape) == 2:
+            im = im.reshape(1, *im.shape)
+        mask = segmentation >= 0
+        self.labels = segmentation[mask]
+        self.pixels = im[:, mask].astype(np.float64)
+        if num_labels is None:
+            num_labels = self.labels.max() + 1 if self.labels.size > 0 else 0
+        self.num_labels = num_labels
+
+    @property
+    def num_channels(self):
+        """ Number of channels. """
+        return self.pixels.shape[0]
+
+    def _sum(self, weights):
+        """ Returns sum of <weights> within each segment. """
+        return np.bincount(self.labels, weights, minlength=self.num_labels)
+
+    @property
+    def area(self):
+        """ Number of pixels in each segment. """
+        return np.bincount(self.labels, minlength=self.num_labels)
+
+    @property
+    def integrated(self):
+        """ Integrated intensity of each segment, C x N. """
+        return np.vstack([self._sum(x) for x in self.pixels])
+
+    @property
+    def mean(self):
+        """ Mean intensity of each segment, C x N. """
+        with np.errstate(invalid='ignore', divide='ignore'):
+            return self.integrated / self.area
+
+    @property
+    def std(self):
+        """ Standard deviation of pixel intensities within each segment, C x N. """
+        return self._std(self.mean)
+
+    def _std(self, mean):
+        """ Returns standard deviation about segment <mean> intensities. """
+        residuals = self.pixels - mean[:, self.labels]
+        variance = np.vstack([self._sum(x) for x in residuals**2])
+        with np.errstate(invalid='ignore', divide='ignore'):
+            return np.sqrt(variance / self.area)
+
+    @property
+    def median(self):
+        """ Median pixel intensity within each segment, C x N. """
+
+        area = self.area
+        starts = np.cumsum(area) - area
+        lower = starts + (area - 1) // 2
+        upper = starts + area // 2
+        empty = area == 0
+
+        # sort pixels by segment, then by value
+        median = np.empty((self.num_channels, self.num_labels), dtype=np.float64)
+        for channel, values in enumerate(self.pixels):
+            ordered = values[np.lexsort((values, self.labels))]
+            if ordered.size == 0:
+                median[channel] = np.nan
+                continue
+            low = ordered[np.clip(lower, 0, ordered.size-1)]
+            high = ordered[np.clip(upper, 0, ordered.size-1)]
+            median[channel] = (low + high) / 2
+            median[channel][empty] = np.nan
+
+        return median
+
+    def to_dataframe(self, index=None, channel_names=None):
+        """
+        Returns table of segment statistics.
+
+        Args:
+
+            index (array like) - row index, one entry per segment
+
+            channel_names (list of str) - name of each channel, defaults to ch0, ch1, ...
+
+        Returns:
+
+            data (pd.DataFrame) - area along with mean, std, median and integrated intensity for each channel
+
+        """
+
+        if channel_names is None:
+            channel_names = ['ch{:d}'.format(i) for i in range(self.num_channels)]
+
+        area = self.area
+        integrated = self.integrated
+        with np.errstate(invalid='ignore', divide='ignore'):
+            mean = integrated / area
+        statistics = dict(
+            mean=mean,
+            std=self._std(mean),
+            median=self.median,
+            integrated=integrated)
+
+        data = {'area': area}
+        for channel, name in enumerate(channel_names):
+            for key, values in statistics.items():
+                data['{:s}_{:s}'.format(name, key)] = values[channel]
+
+        return pd.DataFrame(data, index=index)
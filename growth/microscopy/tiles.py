@@ -0,0 +1,301 @@
+from tempfile import mkstemp
+from os import close
+import numpy as np
+
+from .images import ScalarImage
+from .nucleus import NucleusRasterizer
+from .. import precision
+
+
+class TiledSyntheticMicroscopy(ScalarImage):
+    """
+    Class allows for construction of very large synthetic microscope images given a set of synthetic measurements. The image is rendered one tile at a time and written to an on-disk array, so memory usage is bounded by the tile size rather than the image size.
+
+    Nuclei are assigned to every tile within one radius of their centroid, so nuclei crossing tile edges are drawn in each tile they overlap. Nuclear levels are measured within each tile prior to casting and merged across tiles.
+
+    Attributes:
+
+        data (pd.DataFrame) - position and mean expression level of each cell
+
+        centroids (np.ndarray[int]) - nuclear positions in image
+
+        path (str) - path to on-disk image array (.npy)
+
+        dtype (np.dtype) - image data type
+
+        scale (float) - multiplier applied to pixel values before casting to an integer data type
+
+        tile_size (int) - tile width, in pixels
+
+        bleedthrough (float) - bleedthrough coefficient
+
+        bg_level (float) - background level (mean of log-transformed level)
+
+        bg_noise (float) - background noise (std dev of log-transformed level)
+
+        radius (int) - nuclear radius, in pixels
+
+        height, width (int) - image dimensions, in pixels
+
+        seed (int or np.random.SeedSequence) - seed from which per-tile random number streams are spawned
+
+    """
+
+    def __init__(self, data,
+                 bleedthrough=0.0,
+                 bg_level=0.2,
+                 bg_noise=0.3,
+                 radius=6,
+                 height=1000,
+                 width=1000,
+                 tile_size=1024,
+                 path=None,
+                 dtype=np.float32,
+                 scale=None,
+                 seed=None):
+        """
+        Instantiate and render tiled synthetic image from a set of synthetic measurements.
+
+        Args:
+
+            data (pd.DataFrame) - position and mean expression level of each cell
+
+            bleedthrough (float) - bleedthrough coefficient, implemented as the pseudo correlation coefficient between the clonal marker and the control protein channel
+
+            bg_level (float) - background level (mean of log-transformed level)
+
+            bg_noise (float) - background noise (std dev of log-transformed level)
+
+            radius (int) - nuclear radius, in pixels
+
+            height, width (int) - image dimensions, in pixels
+
+            tile_size (int) - tile width, in pixels
+
+            path (str) - path to on-disk image array (.npy), if None a temporary file is used
+
+            dtype (np.dtype) - image data type, e.g. np.float32 or np.uint16
+
+            scale (float) - multiplier applied to pixel values before casting. Defaults to 1 for floating point types and to a value that spans intensities up to 16 for integer types.
+
+            seed (int or np.random.SeedSequence) - if provided, each tile is drawn from an independent, deterministic random number stream. Otherwise the global numpy generator is used.
+
+        """
+
+        assert tile_size > 2*radius, 'Tiles must be wider than a nucleus.'
+
+        # set image storage
+        if path is None:
+            fd, path = mkstemp(suffix='.npy')
+            close(fd)
+        self.path = path
+        self.dtype = np.dtype(dtype)
+        if scale is None:
+            if self.dtype.kind in 'iu':
+                scale = np.iinfo(self.dtype).max / 16
+            else:
+                scale = 1.
+        self.scale = scale
+
+        # instantiate on-disk image
+        super().__init__(height=height, width=width)
+
+        # store data and parameters
+        self.data = data
+        self.bleedthrough = bleedthrough
+        self.bg_level = bg_level
+        self.bg_noise = bg_noise
+        self.radius = radius
+        self.tile_size = tile_size
+        self.seed = seed
+
+        # define nuclear positions
+        self.centroids = self.center_xycoords(data[['x', 'y']].values)
+        self.data['centroid_x'] = self.centroids[:, 0]
+        self.data['centroid_y'] = self.centroids[:, 1]
+
+        # render image
+        self.render_tiles()
+
+    def __getitem__(self, channel):
+        """ Returns on-disk array of <channel>. """
+        return self.im[channel]
+
+    @property
+    def num_nuclei(self):
+        """ Number of nuclei. """
+        return len(self.data)
+
+    @property
+    def rasterizer(self):
+        """ Rasterizer for drawing all nuclei at once. """
+        return NucleusRasterizer(radius=self.radius)
+
+    @property
+    def tile_shape(self):
+        """ Number of tiles along each image dimension. """
+        return tuple(-(-n // self.tile_size) for n in self.shape)
+
+    @property
+    def num_tiles(self):
+        """ Number of tiles. """
+        return int(np.prod(self.tile_shape))
+
+    def initialize(self):
+        """ Initialize blank on-disk image. """
+        shape = (3, self.height, self.width)
+        self.im = np.lib.format.open_memmap(
+            self.path, mode='w+', dtype=self.dtype, shape=shape)
+
+    def get_tile_bounds(self, tile_id):
+        """ Returns (x0, x1, y0, y1) pixel bounds of <tile_id>. """
+        i, j = np.unravel_index(tile_id, self.tile_shape)
+        x0, y0 = i*self.tile_size, j*self.tile_size
+        x1 = min(x0+self.tile_size, self.shape[0])
+        y1 = min(y0+self.tile_size, self.shape[1])
+        return x0, x1, y0, y1
+
+    def assign_nuclei(self):
+        """
+        Assign each nucleus to all tiles within one radius of its centroid.
+
+        Returns:
+
+            order (np.ndarray[int]) - nucleus indices sorted by tile
+
+            offsets (np.ndarray[int]) - start of each tile's nuclei within <order>, length num_tiles+1
+
+        """
+
+        # determine range of tiles spanned by each nucleus
+        first = (self.centroids - self.radius) // self.tile_size
+        last = (self.centroids + self.radius) // self.tile_size
+        first = np.clip(first, 0, np.array(self.tile_shape)-1)
+        last = np.clip(last, 0, np.array(self.tile_shape)-1)
+
+        # enumerate (tile, nucleus) pairs, at most four per nucleus
+        tile_ids, nuclei = [], []
+        for di in (0, 1):
+            for dj in (0, 1):
+                i, j = first[:, 0]+di, first[:, 1]+dj
+                valid = (i <= last[:, 0]) & (j <= last[:, 1])
+                tile_ids.append(np.ravel_multi_index(
+                    (i[valid], j[valid]), self.tile_shape))
+                nuclei.append(valid.nonzero()[0])
+        tile_ids, nuclei = np.concatenate(tile_ids), np.concatenate(nuclei)
+
+        # sort by tile, then by nucleus so overlaps resolve as in SyntheticMicroscopy
+        order = np.lexsort((nuclei, tile_ids))
+        counts = np.bincount(tile_ids, minlength=self.num_tiles)
+        offsets = np.concatenate(([0], np.cumsum(counts)))
+
+        return nuclei[order], offsets
+
+    def get_rngs(self):
+        """ Returns random number generator for each tile, or the global numpy generator for every tile if the image is not seeded. """
+        if self.seed is None:
+            return [np.random] * self.num_tiles
+        seed = self.seed
+        if not isinstance(seed, np.random.SeedSequence):
+            seed = np.random.SeedSequence(seed)
+        return [np.random.default_rng(s) for s in seed.spawn(self.num_tiles)]
+
+    def sample_background(self, shape, rng=None):
+        """ Returns background pixels sampled from a lognormal distribution using <rng>, defaulting to the global numpy generator. """
+        if rng is None:
+            rng = np.random
+        mu, sigma = np.log(self.bg_level), self.bg_noise
+        return np.exp(rng.normal(mu, sigma, size=shape))
+
+    def render_tile(self, x0, x1, y0, y1, nuclei, rng=None):
+        """
+        Render all channels of a single tile.
+
+        Args:
+
+            x0, x1, y0, y1 (int) - tile bounds, in pixels
+
+            nuclei (np.ndarray[int]) - indices of nuclei overlapping the tile
+
+            rng (np.random.Generator) - random number generator, defaults to the global numpy generator
+
+        Returns:
+
+            tile (np.ndarray[float]) - rendered tile, 3 x height x width
+
+            labels (np.ndarray[int]) - segmentation mask of tile, height x width
+
+        """
+
+        shape = (x1-x0, y1-y0)
+        centroids = self.centroids[nuclei] - np.array([x0, y0])
+        rasterizer = self.rasterizer
+        tile = np.zeros((3,)+shape, dtype=precision.get_dtype())
+
+        # draw nuclear stain and clonal marker over background
+        for channel, key in enumerate(('nuclear_stain', 'clonal_marker')):
+            tile[channel] = self.sample_background(shape, rng=rng)
+            means = self.data[key].values[nuclei]
+            stds = self.data[key+'_std'].values[nuclei]
+            rasterizer.draw(tile[channel], centroids, means, stds, replace=True, rng=rng)
+
+        # draw control protein and add bleedthrough
+        means = self.data['control'].values[nuclei]
+        stds = self.data['control_std'].values[nuclei]
+        rasterizer.draw(tile[2], centroids, means, stds, replace=True, rng=rng)
+        rho = self.bleedthrough
+        background = self.sample_background(shape, rng=rng)
+        tile[2] += rho*tile[1] + (1-rho)*background
+
+        # label nuclei by their global index
+        labels = rasterizer.label(shape, centroids)
+        labels[labels >= 0] = nuclei[labels[labels >= 0]]
+
+        return tile, labels
+
+    def cast(self, tile):
+        """ Returns <tile> scaled and cast to the image data type. """
+        if self.dtype.kind in 'iu':
+            info = np.iinfo(self.dtype)
+            tile = np.clip(np.round(tile*self.scale), info.min, info.max)
+        elif self.scale != 1:
+            tile = tile * self.scale
+        return tile.astype(self.dtype)
+
+    def render_tiles(self):
+        """ Render all tiles, writing each to disk and measuring its nuclei. """
+
+        order, offsets = self.assign_nuclei()
+        rngs = self.get_rngs()
+
+        # initialize per-nucleus pixel sums and counts
+        self.sums = np.zeros((3, self.num_nuclei), dtype=np.float64)
+        self.counts = np.zeros(self.num_nuclei, dtype=np.int64)
+
+        for tile_id in range(self.num_tiles):
+            x0, x1, y0, y1 = self.get_tile_bounds(tile_id)
+            nuclei = order[offsets[tile_id]:offsets[tile_id+1]]
+            tile, labels = self.render_tile(x0, x1, y0, y1, nuclei, rng=rngs[tile_id])
+
+            # measure nuclei within tile
+            self.measure_tile(tile, labels)
+
+            # write tile to disk
+            self.im[:, x0:x1, y0:y1] = self.cast(tile)
+
+        self.im.flush()
+
+    def measure_tile(self, tile, labels):
+        """ Accumulate pixel sums and counts for each nucleus in <tile>. """
+        mask = labels >= 0
+        index = labels[mask]
+        n = self.num_nuclei
+        self.counts += np.bincount(index, minlength=n)
+        for channel in range(3):
+            weights = tile[channel][mask]
+            self.sums[channel] += np.bincount(index, weights, minlength=n)
+
+    def measure(self, channel):
+        """ Returns measured level of <channel> in each contour. """
+        with np.errstate(invalid='ignore', divide='ignore'):
+            return self.sums[channel] / self.counts
@@ -0,0 +1,53 @@
+"""
+Floating point precision of culture state, measurements and image buffers.
+
+Cell positions, measurement columns and synthetic microscopy images are stored in double precision by default. Single precision halves their memory footprint and the memory traffic of the kernels that operate on them. The precision is selected at runtime via set_precision, or by the GROWTH_PRECISION environment variable, and applies to arrays created thereafter.
+
+Triangulation, relaxation and segment statistics are computed in double precision regardless of this setting.
+"""
+
+from os import environ
+import numpy as np
+
+
+# available precisions and their floating point types
+PRECISIONS = {'double': np.float64, 'single': np.float32}
+
+# displacement of daughter cells upon division, relative to the spacing between adjacent cells. Single precision requires a larger displacement for daughters to remain distinct.
+JITTER = {'double': 1e-5, 'single': 1e-3}
+
+# active precision, resolved upon first use
+_precision = None
+
+
+def set_precision(name=None):
+    """
+    Select floating point precision.
+
+    Args:
+
+        name (str) - 'double' or 'single', defaults to the GROWTH_PRECISION environment variable or 'double'
+
+    """
+    global _precision
+    if name is None:
+        name = environ.get('GROWTH_PRECISION', 'double')
+    assert name in PRECISIONS, 'Precision must be one of {}.'.format(tuple(PRECISIONS))
+    _precision = name
+
+
+def get_precision():
+    """ Returns name of active precision. """
+    if _precision is None:
+        set_precision()
+    return _precision
+
+
+def get_dtype():
+    """ Returns floating point type of the active precision. """
+    return PRECISIONS[get_precision()]
+
+
+def get_jitter():
+    """ Returns displacement of daughter cells upon division, relative to the spacing between adjacent cells. """
+    return JITTER[get_precision()]
@@ -47,4 +47,5 @@ sweep.build(
     walltime=args['walltime'],
     cores=args['cores'],
     memory=args['memory'],
-    allocation=args['allocation'])
+    allocation=args['allocation'],
+    profile=args['profile'])
@@ -8,12 +8,21 @@ from growth.sweep.simulation import GrowthSimulation
 args = RunArguments(description='Growth job arguments.')
 path = args['path']
 save_history = args['save_history']
+profile = args['profile']
+walltime = args['walltime']
+max_memory = args['max_memory']
+
+# reserve a tenth of the scheduler walltime for saving results
+budget = None
+if walltime is not None:
+    budget = 0.9 * walltime * 3600
 
 
 # ============================= RUN SCRIPT ====================================
 
 
 start_time = time()
+incomplete = []
 
 # run each simulation in job file
 with open(path, 'r') as job_file:
@@ -23,11 +32,23 @@ with open(path, 'r') as job_file:
 
         path = path.strip()
 
+        # allocate remaining walltime, skipping simulations once it is spent
+        remaining = None
+        if budget is not None:
+            remaining = budget - (time() - start_time)
+            if remaining <= 0:
+                incomplete.append(path)
+                continue
+
         # load simulation
         simulation = GrowthSimulation.load(path)
+        if profile:
+            simulation.enable_profiling()
 
-        # run simulation and comparison
-        simulation.run()
+        # run simulation, checkpointing if walltime or memory is exhausted
+        completed = simulation.run(walltime=remaining, max_memory=max_memory, path=path)
+        if not completed:
+            incomplete.append(path)
 
         # save simulation
         simulation.save(path, save_history=save_history)
@@ -35,4 +56,9 @@ with open(path, 'r') as job_file:
 
 # print runtime to standard out
 runtime = time() - start_time
-print('\nSIMULATION COMPLETED IN {:0.2f}.\n'.format(runtime))
+if len(incomplete) > 0:
+    print('\nBUDGET EXHAUSTED AFTER {:0.2f}.'.format(runtime))
+    print('INCOMPLETE SIMULATIONS (RESUBMIT TO RESUME):')
+    print('\n'.join(incomplete)+'\n')
+else:
+    print('\nSIMULATION COMPLETED IN {:0.2f}.\n'.format(runtime))
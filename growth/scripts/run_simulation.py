@@ -8,6 +8,7 @@ from growth.sweep.simulation import GrowthSimulation
 args = RunArguments(description='Growth simulation arguments.')
 path = args['path']
 save_history = args['save_history']
+profile = args['profile']
 
 # ============================= RUN SCRIPT ====================================
 
@@ -15,6 +16,8 @@ start_time = time()
 
 # load simulation
 simulation = GrowthSimulation.load(path)
+if profile:
+    simulation.enable_profiling()
 
 # run simulation and comparison
 simulation.run()
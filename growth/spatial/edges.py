@@ -0,0 +1,110 @@
+import numpy as np
+
+
+class EdgeStatistics:
+    """
+    Statistics describing contacts between adjacent cells. All statistics are evaluated from a single array of unique undirected edges and the genotype pair spanned by each edge.
+
+    Attributes:
+
+        edges (np.ndarray[int]) - unique undirected (i, j) cell pairs with i < j, M x 2
+
+        genotypes (np.ndarray[int]) - cell genotypes, length N
+
+        num_genotypes (int) - number of possible genotypes
+
+        pair_codes (np.ndarray[int]) - genotype pair index of each edge, lower genotype first
+
+    """
+
+    def __init__(self, edges, genotypes, triangulation=None, num_genotypes=3):
+        """
+        Instantiate edge statistics.
+
+        Args:
+
+            edges (np.ndarray[int]) - (from, to) node pairs, possibly including duplicates or both orientations of an edge
+
+            genotypes (np.ndarray[int]) - cell genotypes
+
+            triangulation (LocalTriangulation) - triangulation from which <edges> were drawn, required for interface lengths
+
+            num_genotypes (int) - number of possible genotypes
+
+        """
+        self.edges = self.get_unique_edges(edges)
+        self.genotypes = genotypes
+        self.triangulation = triangulation
+        self.num_genotypes = num_genotypes
+
+        # evaluate genotype pair spanned by each edge
+        pairs = np.sort(genotypes[self.edges], axis=1)
+        self.pair_codes = pairs[:, 0] * num_genotypes + pairs[:, 1]
+
+    @staticmethod
+    def get_unique_edges(edges):
+        """ Returns unique undirected edges with the lower node index first. """
+        edges = np.sort(np.asarray(edges).reshape(-1, 2), axis=1)
+        return np.unique(edges, axis=0)
+
+    @property
+    def size(self):
+        """ Number of cells. """
+        return len(self.genotypes)
+
+    @property
+    def num_edges(self):
+        """ Number of unique edges. """
+        return len(self.edges)
+
+    @property
+    def heterotypic(self):
+        """ Boolean mask of edges connecting differing genotypes. """
+        return self.pair_codes % (self.num_genotypes + 1) != 0
+
+    @property
+    def heterogeneity(self):
+        """ Number of edges connecting differing genotypes per cell. """
+        return self.heterotypic.sum() / self.size
+
+    @property
+    def interface_lengths(self):
+        """ Length of the interface shared by the cells spanning each edge. """
+        if getattr(self, '_interface_lengths', None) is None:
+            assert self.triangulation is not None, 'Triangulation required.'
+            lengths = self.triangulation.get_interface_lengths(self.edges)
+            self._interface_lengths = lengths
+        return self._interface_lengths
+
+    def _pair_matrix(self, weights=None):
+        """ Returns symmetric matrix of <weights> summed over each genotype pair. """
+        K = self.num_genotypes
+        counts = np.bincount(self.pair_codes, weights, minlength=K**2)
+        counts = counts.reshape(K, K)
+        return counts + np.triu(counts, k=1).T
+
+    @property
+    def contact_matrix(self):
+        """ Number of edges between each pair of genotypes, K x K. """
+        return self._pair_matrix()
+
+    @property
+    def interface_matrix(self):
+        """ Total interface length between each pair of genotypes, K x K. """
+        return self._pair_matrix(self.interface_lengths)
+
+    @property
+    def heterotypic_interface_length(self):
+        """ Total interface length between cells of differing genotypes. """
+        return self.interface_lengths[self.heterotypic].sum()
+
+    def to_dict(self):
+        """ Returns dictionary of contact counts between each genotype pair. """
+        K = self.num_genotypes
+        contacts = self.contact_matrix
+        data = {'heterogeneity': self.heterogeneity}
+        for i in range(K):
+            for j in range(i, K):
+                key = 'contacts_{:d}{:d}'.format(i, j)
+                data[key] = contacts[i, j]
+        return data
@@ -0,0 +1,143 @@
+import numpy as np
+from scipy.spatial import cKDTree
+
+
+class SpatialIndex:
+    """
+    KD-tree index supporting batched radius and nearest neighbour queries over a set of moving points.
+
+    Positions may be updated in place. The tree is only rebuilt when the number of points changes or when any point has moved further than <skin> since the last build. In between, radius queries are widened by the largest displacement and then refined against the current positions, so results are always exact.
+
+    Attributes:
+
+        xy (np.ndarray[float]) - current positions, N x 2
+
+        skin (float) - displacement tolerated before the tree is rebuilt
+
+        reference (np.ndarray[float]) - positions at which the tree was built, N x 2
+
+        tree (scipy.spatial.cKDTree) - KD-tree built on reference positions
+
+    """
+
+    def __init__(self, xy, skin=0.):
+        """
+        Instantiate spatial index.
+
+        Args:
+
+            xy (np.ndarray[float]) - positions, N x 2
+
+            skin (float) - displacement tolerated before the tree is rebuilt
+
+        """
+        self.skin = skin
+        self.xy = np.asarray(xy, dtype=np.float64)
+        self.build()
+
+    @property
+    def size(self):
+        """ Number of indexed points. """
+        return len(self.xy)
+
+    @property
+    def displacement(self):
+        """ Largest displacement of any point since the tree was built. """
+        if self.size == 0:
+            return 0.
+        return np.sqrt(((self.xy - self.reference)**2).sum(axis=1).max())
+
+    def build(self):
+        """ Build KD-tree on a copy of current positions, so that it is unaffected by updates in place. """
+        self.reference = self.xy.copy()
+        self.tree = cKDTree(self.reference)
+
+    def update(self, xy):
+        """
+        Update indexed positions, rebuilding the tree only if necessary.
+
+        Args:
+
+            xy (np.ndarray[float]) - positions, N x 2
+
+        """
+        xy = np.asarray(xy, dtype=np.float64)
+        resized = xy.shape != self.reference.shape
+        self.xy = xy
+        if resized or self.displacement > self.skin:
+            self.build()
+
+    def _refine(self, i, j, points, radius):
+        """ Returns (i, j) pairs for which <points>[i] lies within <radius> of indexed point j. """
+        distances = np.sqrt(((points[i] - self.xy[j])**2).sum(axis=1))
+        within = distances <= radius
+        return i[within], j[within]
+
+    def query_radius(self, points, radius):
+        """
+        Find all indexed points within <radius> of each query point.
+
+        Args:
+
+            points (np.ndarray[float]) - query positions, M x 2
+
+            radius (float) - search radius
+
+        Returns:
+
+            query_indices (np.ndarray[int]) - index of query point for each neighbour pair
+
+            indices (np.ndarray[int]) - index of indexed point for each neighbour pair
+
+        """
+        points = np.asarray(points, dtype=np.float64)
+        widened = radius + self.displacement
+        pairs = cKDTree(points).sparse_distance_matrix(
+            self.tree, widened, output_type='ndarray')
+        i, j = pairs['i'].astype(np.int64), pairs['j'].astype(np.int64)
+        return self._refine(i, j, points, radius)
+
+    def query_pairs(self, radius):
+        """
+        Find all pairs of distinct indexed points separated by no more than <radius>, matching the inclusive bound of scipy.spatial.cKDTree.query_pairs.
+
+        Args:
+
+            radius (float) - search radius
+
+        Returns:
+
+            pairs (np.ndarray[int]) - (i, j) index pairs with i < j, M x 2
+
+        """
+        widened = radius + 2*self.displacement
+        pairs = self.tree.query_pairs(widened, output_type='ndarray')
+        i, j = self._refine(pairs[:, 0], pairs[:, 1], self.xy, radius)
+        return np.vstack((i, j)).T
+
+    def query_knn(self, points, k=1):
+        """
+        Find the <k> nearest indexed points to each query point.
+
+        Args:
+
+            points (np.ndarray[float]) - query positions, M x 2
+
+            k (int) - number of neighbours
+
+        Returns:
+
+            distances (np.ndarray[float]) - distance to each neighbour, M x k
+
+            indices (np.ndarray[int]) - index of each neighbour, M x k
+
+        """
+        if self.displacement > 0:
+            self.build()
+        distances, indices = self.tree.query(points, k=k)
+        return distances.reshape(len(points), -1), indices.reshape(len(points), -1)
+
+    def count_radius(self, points, radius):
+        """ Returns number of indexed points within <radius> of each query point. """
+        query_indices, _ = self.query_radius(points, radius)
+        return np.bincount(query_indices, minlength=len(points))
@@ -1,5 +1,7 @@
 import numpy as np
-from scipy.spatial import Delaunay, ConvexHull
+from scipy.spatial import ConvexHull
+
+from .. import kernels
 
 
 class Points:
@@ -17,6 +19,7 @@ class Points:
     def __init__(self, xy):
         self.xy = xy
         self.hull = ConvexHull(xy)
+        self._scale_masks = {}
 
     @property
     def vertex_indices(self):
@@ -52,23 +55,7 @@ class Points:
             centroid (np.ndarray) - 2 x 1
 
         """
-
-        def moment(points):
-
-            # Polygon's signed area, centroid's x and y
-            A, C_x, C_y = 0, 0, 0
-            for i in range(0, len(points) - 1):
-                s = (points[i, 0] * points[i + 1, 1] - points[i + 1, 0] * points[i, 1])
-                A += s
-                C_x += (points[i, 0] + points[i + 1, 0]) * s
-                C_y += (points[i, 1] + points[i + 1, 1]) * s
-            A *= 0.5
-            C_x *= (1.0 / (6.0 * A))
-            C_y *= (1.0 / (6.0 * A))
-            return np.array([[C_x, C_y]])
-
-        shift = points.mean(axis=0)
-        return shift + moment(points-shift)
+        return kernels.polygon_centroid(np.asarray(points, dtype=np.float64)).reshape(1, 2)
 
     @classmethod
     def _scale(cls, points, factor=1.0):
@@ -88,7 +75,7 @@ class Points:
         """
 
         centroid = cls.compute_area_centroid(points).flatten()
-        return np.apply_along_axis(lambda x: centroid + factor*(x-centroid), axis=1, arr=points)
+        return centroid + factor*(points-centroid)
 
     def scale(self, factor=1.0):
         """ Returns scaled points. """
@@ -97,8 +84,11 @@ class Points:
 
     def get_scale_mask(self, factor):
         """ Returns boolean mask of points outside scaled region. """
-        scaled_vertices = self._scale(self.vertices, factor)
-        return self._outside_hull(self.xy, scaled_vertices)
+        if factor not in self._scale_masks:
+            scaled_vertices = self._scale(self.vertices, factor)
+            mask = self._outside_hull(self.xy, scaled_vertices)
+            self._scale_masks[factor] = mask
+        return self._scale_masks[factor]
 
     def scale_filter(self, factor):
         """ Returns points outside scaled region. """
@@ -110,20 +100,31 @@ class Points:
         """
         Returns boolean mask denoting which of <N> points lie outside the convex hull defined by <M> vertices.
 
+        Each point is tested against the half-plane to the left of every hull edge, so no triangulation of the hull is required.
+
         Args:
 
             points (np.ndarray) - N x 2
 
-            hull (np.ndarray) - M x 2
+            hull (np.ndarray) - M x 2, vertices in counterclockwise order
 
         Returns:
 
             outside (np.ndarray[bool]) - length N
 
         """
-        if not isinstance(hull, Delaunay):
-            hull = Delaunay(hull)
-        return hull.find_simplex(points)>=0
+
+        # tolerate points lying on the hull boundary
+        extent = np.abs(hull).max()
+        tol = 1e-12 * max(extent, 1.) ** 2
+
+        inside = np.ones(len(points), dtype=bool)
+        for start, stop in zip(hull, np.roll(hull, -1, axis=0)):
+            dx, dy = stop - start
+            cross = dx*(points[:, 1]-start[1]) - dy*(points[:, 0]-start[0])
+            inside &= cross >= -tol
+
+        return inside
 
     def scatter(self, ax=None, **kwargs):
         """ Scatter points on <ax>. """
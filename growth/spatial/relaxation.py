@@ -0,0 +1,698 @@
+import numpy as np
+from scipy.optimize import minimize
+from scipy.sparse import coo_matrix
+from scipy.sparse.csgraph import dijkstra
+from scipy.spatial import cKDTree
+
+
+def stress(positions, xy, free, inverse_targets, weights, meanweight=0.):
+    """
+    Kamada-Kawai stress energy and its gradient with respect to the free node positions. When all nodes are free, the energy and gradient match those minimized by networkx.kamada_kawai_layout.
+
+    Args:
+
+        positions (np.ndarray[float]) - flattened positions of free nodes
+
+        xy (np.ndarray[float]) - positions of all nodes, N x 2
+
+        free (np.ndarray[int]) - indices of free nodes, length F
+
+        inverse_targets (np.ndarray[float]) - inverse of the target distance between each free node and every node, zero for excluded pairs, F x N. Targets between pairs of free nodes must be symmetric.
+
+        weights (np.ndarray[float]) - weight of each pair, F x N
+
+        meanweight (float) - weight of a parabolic term drawing the mean position of all nodes toward the origin
+
+    Returns:
+
+        energy (float) - stress energy
+
+        gradient (np.ndarray[float]) - flattened gradient for free nodes
+
+    """
+    xy = xy.copy()
+    xy[free] = positions.reshape(-1, 2)
+
+    # evaluate separation between free nodes and all nodes
+    delta = xy[free][:, None, :] - xy[None, :, :]
+    separation = np.sqrt((delta**2).sum(axis=-1))
+    offset = separation * inverse_targets - 1
+    offset[inverse_targets == 0] = 0
+
+    energy = (weights * offset**2).sum()
+
+    # free-free pairs appear in two rows, each at half weight, so every pair contributes its full gradient to each of its free nodes
+    with np.errstate(invalid='ignore', divide='ignore'):
+        scaling = 2 * offset * inverse_targets / separation
+    scaling[~np.isfinite(scaling)] = 0
+    gradient = (scaling[:, :, None] * delta).sum(axis=1)
+
+    # draw mean position toward the origin
+    if meanweight > 0:
+        total = xy.sum(axis=0)
+        energy += 0.5 * meanweight * (total**2).sum()
+        gradient += meanweight * total
+
+    return energy, gradient.ravel()
+
+
+def relax(xy, targets, free, maxiter=None, tol=1e-6, meanweight=0., rng=None):
+    """
+    Minimize Kamada-Kawai stress with respect to a subset of node positions, holding all other nodes fixed.
+
+    Args:
+
+        xy (np.ndarray[float]) - initial positions of all nodes, N x 2
+
+        targets (np.ndarray[float]) - target distance between each free node and every node, infinite for excluded pairs, F x N
+
+        free (np.ndarray[int]) - indices of free nodes, length F
+
+        maxiter (int) - maximum number of optimizer iterations
+
+        tol (float) - convergence tolerance, if None the optimizer defaults are used
+
+        meanweight (float) - weight of a parabolic term drawing the mean position of all nodes toward the origin
+
+        rng (np.random.Generator) - if provided, free nodes are perturbed by a negligible amount to break ties between coincident nodes
+
+    Returns:
+
+        xy (np.ndarray[float]) - relaxed positions of all nodes, N x 2
+
+        result (scipy.optimize.OptimizeResult) - optimizer output, including the stress energy (fun), number of iterations (nit) and whether the optimizer converged (success)
+
+    """
+    xy = np.asarray(xy, dtype=np.float64)
+    free = np.asarray(free, dtype=np.int64)
+
+    # exclude self-pairs and unreachable pairs
+    targets = np.array(targets, dtype=np.float64)
+    targets[np.arange(len(free)), free] = np.inf
+    with np.errstate(divide='ignore'):
+        inverse_targets = np.where(np.isfinite(targets) & (targets > 0), 1/targets, 0)
+
+    # count each free-free pair once, since it appears in two rows
+    weights = np.ones_like(inverse_targets)
+    weights[:, free] = 0.5
+
+    # break ties between coincident nodes, e.g. newly divided daughters
+    initial = xy[free]
+    if rng is not None:
+        initial = initial + rng.normal(scale=1e-9, size=initial.shape)
+
+    options = {} if maxiter is None else {'maxiter': maxiter}
+    result = minimize(stress,
+                      initial.ravel(),
+                      args=(xy, free, inverse_targets, weights, meanweight),
+                      method='L-BFGS-B',
+                      jac=True,
+                      tol=tol,
+                      options=options)
+
+    xy = xy.copy()
+    xy[free] = result.x.reshape(-1, 2)
+    return xy, result
+
+
+def get_overlap(xy, distance):
+    """ Returns fraction of nodes lying within <distance> of their nearest neighbour. """
+    if len(xy) < 2:
+        return 0.
+    distances, _ = cKDTree(xy).query(xy, k=2)
+    return (distances[:, 1] < distance).mean()
+
+
+def sparse_stress(positions, edges, inverse_lengths, repulsive=None):
+    """
+    Stress energy restricted to a sparse set of node pairs, and its gradient with respect to all node positions.
+
+    Args:
+
+        positions (np.ndarray[float]) - flattened positions of all nodes
+
+        edges (np.ndarray[int]) - node pairs, M x 2
+
+        inverse_lengths (np.ndarray[float]) - inverse of the target length of each pair
+
+        repulsive (np.ndarray[bool]) - if True, the pair only resists being closer than its target length
+
+    Returns:
+
+        energy (float) - stress energy
+
+        gradient (np.ndarray[float]) - flattened gradient for all nodes
+
+    """
+    xy = positions.reshape(-1, 2)
+    delta = xy[edges[:, 0]] - xy[edges[:, 1]]
+    separation = np.sqrt((delta**2).sum(axis=1))
+    offset = separation * inverse_lengths - 1
+    if repulsive is not None:
+        offset[repulsive] = np.minimum(offset[repulsive], 0)
+
+    energy = 0.5 * (offset**2).sum()
+
+    # accumulate equal and opposite contributions of each edge
+    with np.errstate(invalid='ignore', divide='ignore'):
+        scaling = offset * inverse_lengths / separation
+    scaling[~np.isfinite(scaling)] = 0
+    force = scaling[:, None] * delta
+    gradient = np.zeros_like(xy)
+    for dim in range(2):
+        gradient[:, dim] = np.bincount(edges[:, 0], force[:, dim], len(xy))
+        gradient[:, dim] -= np.bincount(edges[:, 1], force[:, dim], len(xy))
+
+    return energy, gradient.ravel()
+
+
+def get_contacts(xy, edges, sizes):
+    """
+    Returns pairs of nonadjacent nodes lying closer than the mean square root of their sizes, along with that distance.
+
+    Args:
+
+        xy (np.ndarray[float]) - node positions in units of target edge length, N x 2
+
+        edges (np.ndarray[int]) - undirected edges, each sorted, M x 2
+
+        sizes (np.ndarray[float]) - number of original nodes within each node
+
+    Returns:
+
+        pairs (np.ndarray[int]) - nonadjacent pairs, each sorted, K x 2
+
+        lengths (np.ndarray[float]) - distance below which each pair is repelled
+
+    """
+    radii = np.sqrt(sizes)
+    pairs = cKDTree(xy).query_pairs(r=radii.max(), output_type='ndarray')
+    pairs = np.sort(pairs.reshape(-1, 2), axis=1)
+    lengths = radii[pairs].mean(axis=1)
+    separation = LocalRelaxation.get_lengths(xy, pairs)
+    pairs, lengths = pairs[separation < lengths], lengths[separation < lengths]
+
+    # exclude adjacent pairs
+    size = len(xy)
+    adjacent = np.isin(pairs[:, 0]*size+pairs[:, 1], edges[:, 0]*size+edges[:, 1])
+    return pairs[~adjacent], lengths[~adjacent]
+
+
+def measure_layout(xy, edges, weights=None):
+    """
+    Returns mean relative deviation of edge lengths from their targets, and the smallest distance between any two nodes. Targets are <weights> in units of the median edge length, which is also the unit of separation.
+    """
+    lengths = LocalRelaxation.get_lengths(xy, edges)
+    if weights is not None:
+        lengths = lengths / weights
+    if lengths.size == 0:
+        return 0., np.inf
+    unit = np.median(lengths)
+    distances, _ = cKDTree(xy).query(xy, k=2)
+    return np.abs(lengths / unit - 1).mean(), distances[:, 1].min() / unit
+
+
+def match(adjacency, rounds=5):
+    """
+    Returns random maximal-ish matching of adjacent nodes, in which each node is paired with at most one neighbour.
+
+    In each round, every unmatched node proposes to a random unmatched neighbour, and mutual proposals are accepted.
+
+    Args:
+
+        adjacency (scipy.sparse.csr_matrix) - symmetric adjacency matrix
+
+        rounds (int) - number of proposal rounds
+
+    Returns:
+
+        mates (np.ndarray[int]) - index of the node paired with each node, -1 for unpaired nodes
+
+    """
+    size = adjacency.shape[0]
+    mates = -np.ones(size, dtype=np.int64)
+    for _ in range(rounds):
+
+        # restrict graph to unmatched nodes with unmatched neighbours
+        nodes = (mates < 0).nonzero()[0]
+        graph = adjacency[nodes][:, nodes].tocsr()
+        degree = np.diff(graph.indptr)
+        if not degree.any():
+            break
+
+        # each node proposes to a random neighbour
+        proposing = (degree > 0).nonzero()[0]
+        choice = graph.indptr[proposing] + np.floor(np.random.random(proposing.size)*degree[proposing]).astype(np.int64)
+        proposals = -np.ones(nodes.size, dtype=np.int64)
+        proposals[proposing] = graph.indices[choice]
+
+        # accept mutual proposals
+        accepted = proposing[proposals[proposals[proposing]] == proposing]
+        mates[nodes[accepted]] = nodes[proposals[accepted]]
+
+    return mates
+
+
+def coarsen(xy, edges, lengths, sizes):
+    """
+    Merge matched pairs of adjacent nodes.
+
+    Each merged node is positioned at the size-weighted centroid of its members. Its size is the total number of original nodes it contains, and the target length of each coarse edge is the mean relative length of the edges it replaces, multiplied by the mean square root of the sizes of its nodes.
+
+    Args:
+
+        xy (np.ndarray[float]) - node positions, N x 2
+
+        edges (np.ndarray[int]) - undirected edges without duplicates, M x 2
+
+        lengths (np.ndarray[float]) - target length of each edge
+
+        sizes (np.ndarray[float]) - number of original nodes within each node
+
+    Returns:
+
+        clusters (np.ndarray[int]) - index of the coarse node containing each node
+
+        coarse (tuple) - coarse positions, edges, target lengths and sizes
+
+    """
+
+    # merge matched pairs
+    adjacency = get_adjacency(edges, len(xy))
+    mates = match(adjacency)
+    representatives = np.where(mates >= 0, np.minimum(np.arange(len(xy)), mates), np.arange(len(xy)))
+    _, clusters = np.unique(representatives, return_inverse=True)
+    num_clusters = clusters.max() + 1 if clusters.size > 0 else 0
+
+    # compute size-weighted centroids
+    coarse_sizes = np.bincount(clusters, sizes, num_clusters)
+    coarse_xy = np.vstack([np.bincount(clusters, xy[:, dim]*sizes, num_clusters) for dim in range(2)]).T
+    coarse_xy /= coarse_sizes[:, None]
+
+    # evaluate relative length of each edge
+    relative = lengths / np.sqrt(sizes[edges]).mean(axis=1)
+
+    # merge edges between each pair of clusters
+    coarse_edges = np.sort(clusters[edges], axis=1)
+    external = coarse_edges[:, 0] != coarse_edges[:, 1]
+    coarse_edges, index = np.unique(coarse_edges[external], axis=0, return_inverse=True)
+    index = index.ravel()
+    counts = np.bincount(index, minlength=len(coarse_edges))
+    relative = np.bincount(index, relative[external], len(coarse_edges)) / counts
+    coarse_lengths = relative * np.sqrt(coarse_sizes[coarse_edges]).mean(axis=1)
+
+    return clusters, (coarse_xy, coarse_edges, coarse_lengths, coarse_sizes)
+
+
+def get_adjacency(edges, size, weights=None):
+    """ Returns symmetric sparse adjacency matrix for undirected <edges>, which may include duplicates or both orientations of an edge. """
+    edges = np.sort(np.asarray(edges).reshape(-1, 2), axis=1)
+    if weights is None:
+        weights = np.ones(len(edges), dtype=np.float64)
+    edges, index = np.unique(edges, axis=0, return_index=True)
+    weights = np.asarray(weights, dtype=np.float64)[index]
+    rows = np.concatenate((edges[:, 0], edges[:, 1]))
+    columns = np.concatenate((edges[:, 1], edges[:, 0]))
+    data = np.concatenate((weights, weights))
+    return coo_matrix((data, (rows, columns)), shape=(size, size)).tocsr()
+
+
+def get_ring(adjacency, seeds, k=1):
+    """ Returns boolean mask of nodes within <k> edges of <seeds>. """
+    mask = np.zeros(adjacency.shape[0], dtype=bool)
+    mask[seeds] = True
+    for _ in range(k):
+        mask = mask | (adjacency @ mask.astype(np.float64) > 0)
+    return mask
+
+
+class LocalRelaxation:
+    """
+    Relaxation of the neighbourhood surrounding a set of displaced nodes.
+
+    Nodes within <k> edges of the displaced nodes are free to move. The next <margin> rings of nodes are held fixed and anchor the free nodes in place. Target distances are graph distances within the free and anchoring nodes, scaled by the typical length of undisturbed edges.
+
+    Attributes:
+
+        free (np.ndarray[int]) - indices of free nodes
+
+        anchors (np.ndarray[int]) - indices of fixed anchoring nodes
+
+        nodes (np.ndarray[int]) - free nodes followed by anchoring nodes
+
+        scale (float) - length of a unit edge
+
+        energy (float) - stress energy after relaxation
+
+        iterations (int) - number of optimizer iterations
+
+        converged (bool) - if False, the optimizer stopped before converging
+
+        displacement (float) - largest displacement of a free node, relative to <scale>
+
+        strain (float) - mean relative deviation of edge lengths within the region from their targets
+
+        separation (float) - smallest distance between a free node and any other node in the region, relative to <scale>
+
+    """
+
+    def __init__(self, xy, edges, displaced, k=2, margin=2, weights=None):
+        """
+        Args:
+
+            xy (np.ndarray[float]) - node positions, N x 2
+
+            edges (np.ndarray[int]) - undirected edges, M x 2
+
+            displaced (np.ndarray[int]) - indices of displaced nodes
+
+            k (int) - number of rings of free nodes around displaced nodes
+
+            margin (int) - number of rings of anchoring nodes
+
+            weights (np.ndarray[float]) - length of each edge in units of the unit edge
+
+        """
+        self.xy = np.asarray(xy, dtype=np.float64)
+        self.edges = np.asarray(edges).reshape(-1, 2)
+        self.weights = weights
+        adjacency = get_adjacency(self.edges, len(self.xy), weights)
+
+        # select free and anchoring nodes
+        free = get_ring(adjacency, displaced, k)
+        region = get_ring(adjacency, free.nonzero()[0], margin)
+        self.free = free.nonzero()[0]
+        self.anchors = (region & ~free).nonzero()[0]
+        self.nodes = np.concatenate((self.free, self.anchors))
+
+        # evaluate scale from edges without displaced nodes
+        is_displaced = np.zeros(len(self.xy), dtype=bool)
+        is_displaced[displaced] = True
+        undisturbed = ~is_displaced[self.edges].any(axis=1)
+        lengths = self.get_lengths(self.xy, self.edges[undisturbed])
+        if weights is not None:
+            lengths = lengths / weights[undisturbed]
+        self.scale = np.median(lengths) if lengths.size > 0 else 1.
+
+        # compute graph distances within the region
+        self.adjacency = adjacency[self.nodes][:, self.nodes]
+        indices = np.arange(len(self.free))
+        self.targets = self.scale * dijkstra(self.adjacency, indices=indices)
+
+        self.energy = None
+        self.iterations = None
+        self.converged = None
+        self.displacement = None
+        self.strain = None
+        self.separation = None
+
+    @staticmethod
+    def get_lengths(xy, edges):
+        """ Returns length of each edge. """
+        return np.sqrt(((xy[edges[:, 0]] - xy[edges[:, 1]])**2).sum(axis=1))
+
+    def run(self, maxiter=None):
+        """
+        Relax free nodes.
+
+        Args:
+
+            maxiter (int) - maximum number of optimizer iterations
+
+        Returns:
+
+            xy (np.ndarray[float]) - updated positions of all nodes, N x 2
+
+        """
+
+        # relax free nodes with anchors held fixed
+        free = np.arange(len(self.free))
+        local_xy, result = relax(self.xy[self.nodes], self.targets, free, maxiter=maxiter)
+        self.energy, self.iterations, self.converged = result.fun, result.nit, result.success
+
+        xy = self.xy.copy()
+        xy[self.free] = local_xy[free]
+
+        # measure displacement of free nodes
+        moved = np.sqrt(((xy[self.free] - self.xy[self.free])**2).sum(axis=1))
+        self.displacement = moved.max() / self.scale if moved.size > 0 else 0.
+
+        # measure strain of edges within region
+        in_region = np.isin(self.edges, self.free).any(axis=1)
+        lengths = self.get_lengths(xy, self.edges[in_region])
+        targets = self.scale * (1 if self.weights is None else self.weights[in_region])
+        self.strain = np.abs(lengths / targets - 1).mean() if lengths.size > 0 else 0.
+
+        # measure separation between each free node and its nearest neighbour
+        distances, _ = cKDTree(local_xy).query(local_xy[free], k=2)
+        self.separation = distances[:, 1].min() / self.scale
+
+        return xy
+
+
+class GlobalRelaxation:
+    """
+    Relaxation of all nodes, minimizing the same objective as networkx.kamada_kawai_layout from the same initial positions.
+
+    Target distances are weighted graph distances between every pair of nodes, with disconnected pairs held far apart, and a weak parabolic term draws the mean position toward the origin. The relaxed layout is centered and rescaled such that its largest coordinate matches a prescribed radius.
+
+    Attributes:
+
+        xy (np.ndarray[float]) - initial node positions, N x 2
+
+        targets (np.ndarray[float]) - graph distance between each pair of nodes, N x N
+
+        energy (float) - stress energy after relaxation, in units of graph distance
+
+        iterations (int) - number of optimizer iterations
+
+        converged (bool) - if False, the optimizer stopped before converging
+
+        strain (float) - mean relative deviation of edge lengths from their targets after rescaling
+
+        separation (float) - smallest distance between any two nodes after rescaling, relative to the typical edge length
+
+    """
+
+    # target distance between disconnected nodes
+    disconnected = 1e6
+
+    # weight of the term drawing the mean position toward the origin, as in networkx
+    meanweight = 1e-3
+
+    def __init__(self, xy, edges, weights=None):
+        """
+        Args:
+
+            xy (np.ndarray[float]) - node positions, N x 2
+
+            edges (np.ndarray[int]) - undirected edges, M x 2
+
+            weights (np.ndarray[float]) - length of each edge
+
+        """
+        self.xy = np.asarray(xy, dtype=np.float64)
+        self.edges = np.asarray(edges).reshape(-1, 2)
+        self.weights = weights
+
+        # compute graph distances between all nodes
+        adjacency = get_adjacency(self.edges, len(self.xy), weights)
+        self.targets = dijkstra(adjacency)
+        self.targets[~np.isfinite(self.targets)] = self.disconnected
+
+        self.energy = None
+        self.iterations = None
+        self.converged = None
+        self.strain = None
+        self.separation = None
+
+    def run(self, center=None, scale=1., maxiter=None, tol=None):
+        """
+        Relax all nodes.
+
+        Args:
+
+            center (np.ndarray[float]) - center position of relaxed layout
+
+            scale (float) - largest coordinate of relaxed layout relative to its center
+
+            maxiter (int) - maximum number of optimizer iterations
+
+            tol (float) - convergence tolerance, if None the optimizer defaults are used
+
+        Returns:
+
+            xy (np.ndarray[float]) - updated positions of all nodes, N x 2
+
+        """
+        if center is None:
+            center = np.zeros(2, dtype=float)
+
+        free = np.arange(len(self.xy))
+        xy, result = relax(self.xy, self.targets, free, maxiter=maxiter, tol=tol, meanweight=self.meanweight)
+        self.energy, self.iterations, self.converged = result.fun, result.nit, result.success
+
+        # center and rescale layout
+        xy -= xy.mean(axis=0)
+        limit = np.abs(xy).max()
+        if limit > 0:
+            xy *= scale / limit
+        xy += center
+
+        # measure strain of edges relative to the typical edge length
+        self.strain, self.separation = measure_layout(xy, self.edges, self.weights)
+
+        return xy
+
+
+class MultilevelRelaxation:
+    """
+    Coarse-to-fine relaxation of all nodes.
+
+    The graph is recursively coarsened by merging matched pairs of adjacent nodes until no more than <coarsest> nodes remain. The coarsest graph is relaxed as in GlobalRelaxation, using graph distances between all pairs of nodes. Positions are then prolongated to each finer level by moving every node along with the coarse node that contains it, and each level is smoothed by minimizing stress over its edges alone.
+
+    Long-range rearrangements are thereby resolved on small graphs, so each finer level only requires a bounded number of smoothing iterations, each of which is linear in its number of edges. Since the graph shrinks geometrically with each coarsening, the cost of each relaxation is near-linear in the number of nodes. The relaxed layout is centered and rescaled as in GlobalRelaxation.
+
+    Attributes:
+
+        levels (list of tuple) - positions, edges, target lengths and sizes of the nodes at each level, from finest to coarsest
+
+        clusters (list of np.ndarray[int]) - index of the coarse node containing each node, for each level but the coarsest
+
+        rounds (int) - largest number of smoothing rounds on each finer level
+
+        smoothing (int) - maximum number of optimizer iterations per smoothing round
+
+        energy (float) - stress energy over the edges and contacts of the finest level after relaxation
+
+        iterations (int) - total number of optimizer iterations over all levels
+
+        converged (bool) - if False, relaxation of the coarsest level or a smoothing round was cut short by the iteration cap passed to run
+
+        strain (float) - mean relative deviation of edge lengths from their targets after rescaling
+
+        separation (float) - smallest distance between any two nodes after rescaling, relative to the typical edge length
+
+    """
+
+    def __init__(self, xy, edges, weights=None, coarsest=500, rounds=3, smoothing=100):
+        """
+        Args:
+
+            xy (np.ndarray[float]) - node positions, N x 2
+
+            edges (np.ndarray[int]) - undirected edges, M x 2
+
+            weights (np.ndarray[float]) - length of each edge
+
+            coarsest (int) - largest number of nodes in the coarsest graph
+
+            rounds (int) - largest number of smoothing rounds on each finer level, with contacts between nodes updated before each round
+
+            smoothing (int) - maximum number of optimizer iterations per smoothing round
+
+        """
+        self.rounds = rounds
+        self.smoothing = smoothing
+        xy = np.asarray(xy, dtype=np.float64)
+        self.edges = np.asarray(edges).reshape(-1, 2)
+        self.weights = weights
+
+        # remove duplicate edges
+        edges = np.sort(self.edges, axis=1)
+        lengths = np.ones(len(edges)) if weights is None else np.asarray(weights, dtype=np.float64)
+        edges, index = np.unique(edges, axis=0, return_index=True)
+        lengths = lengths[index]
+
+        # express positions in units of target edge length
+        if len(edges) > 0:
+            xy = xy / np.median(LocalRelaxation.get_lengths(xy, edges) / lengths)
+
+        # coarsen graph until it is sufficiently small or stops shrinking
+        self.levels = [(xy, edges, lengths, np.ones(len(xy)))]
+        self.clusters = []
+        while len(self.levels[-1][0]) > coarsest:
+            clusters, coarse = coarsen(*self.levels[-1])
+            if len(coarse[0]) > 0.95 * len(self.levels[-1][0]):
+                break
+            self.clusters.append(clusters)
+            self.levels.append(coarse)
+
+        self.energy = None
+        self.iterations = None
+        self.converged = None
+        self.strain = None
+        self.separation = None
+
+    def run(self, center=None, scale=1., maxiter=None, tol=None):
+        """
+        Relax all nodes.
+
+        Args:
+
+            center (np.ndarray[float]) - center position of relaxed layout
+
+            scale (float) - largest coordinate of relaxed layout relative to its center
+
+            maxiter (int) - maximum number of optimizer iterations on the coarsest level and per smoothing round, the latter never exceeding <smoothing>
+
+            tol (float) - convergence tolerance, if None the optimizer defaults are used
+
+        Returns:
+
+            xy (np.ndarray[float]) - updated positions of all nodes, N x 2
+
+        """
+        if center is None:
+            center = np.zeros(2, dtype=float)
+        capped = maxiter is not None and maxiter < self.smoothing
+        options = {'maxiter': maxiter if capped else self.smoothing}
+
+        # relax coarsest graph using graph distances between all nodes
+        coarse_xy, edges, lengths, _ = self.levels[-1]
+        targets = dijkstra(get_adjacency(edges, len(coarse_xy), lengths))
+        targets[~np.isfinite(targets)] = GlobalRelaxation.disconnected
+        free = np.arange(len(coarse_xy))
+        xy, result = relax(coarse_xy, targets, free, maxiter=maxiter, tol=tol, meanweight=GlobalRelaxation.meanweight)
+        self.iterations, self.converged = result.nit, result.success
+        self.energy = result.fun
+
+        # prolongate positions to each finer level and smooth
+        for level in range(len(self.clusters)-1, -1, -1):
+            fine_xy, edges, lengths, sizes = self.levels[level]
+            clusters = self.clusters[level]
+            xy = xy[clusters] + fine_xy - coarse_xy[clusters]
+            coarse_xy = fine_xy
+
+            # repel nonadjacent nodes in contact, refreshing contacts after each round of smoothing
+            for _ in range(self.rounds):
+                contacts, contact_lengths = get_contacts(xy, edges, sizes)
+                pairs = np.vstack((edges, contacts))
+                targets = np.concatenate((lengths, contact_lengths))
+                repulsive = np.arange(len(pairs)) >= len(edges)
+
+                result = minimize(sparse_stress,
+                                  xy.ravel(),
+                                  args=(pairs, 1/targets, repulsive),
+                                  method='L-BFGS-B',
+                                  jac=True,
+                                  tol=tol,
+                                  options=options)
+                xy = result.x.reshape(-1, 2)
+                self.iterations += result.nit
+                self.energy = result.fun
+                if len(contacts) == 0:
+                    break
+            if capped:
+                self.converged = self.converged and result.success
+
+        # center and rescale layout
+        xy = xy - xy.mean(axis=0)
+        limit = np.abs(xy).max()
+        if limit > 0:
+            xy *= scale / limit
+        xy += center
+
+        self.strain, self.separation = measure_layout(xy, self.edges, self.weights)
+
+        return xy
@@ -2,6 +2,8 @@ import numpy as np
 from matplotlib.tri import Triangulation
 from scipy.spatial import ConvexHull
 
+from .. import kernels
+
 
 class LocalTriangulation(Triangulation):
     """
@@ -75,6 +77,66 @@ class LocalTriangulation(Triangulation):
         #return self.filter_hull(self.edge_list)
         #return self.filter_longest_edge(self.edge_list, self.edge_lengths)
 
+    @property
+    def circumcenters(self):
+        """ Circumcenter of each triangle. """
+        ax, bx, cx = self.x[self.triangles].T
+        ay, by, cy = self.y[self.triangles].T
+        d = 2 * (ax*(by-cy) + bx*(cy-ay) + cx*(ay-by))
+        a2, b2, c2 = ax**2+ay**2, bx**2+by**2, cx**2+cy**2
+        ux = (a2*(by-cy) + b2*(cy-ay) + c2*(ay-by)) / d
+        uy = (a2*(cx-bx) + b2*(ax-cx) + c2*(bx-ax)) / d
+        return np.vstack((ux, uy)).T
+
+    def get_interface_lengths(self, edges):
+        """
+        Returns length of the Voronoi edge dual to each of <edges>, i.e. the length of the interface shared by the two adjacent cells. For edges on the boundary of the triangulation, the interface extends from the circumcenter of the single adjacent triangle to the edge midpoint. Circumcenters of sliver triangles, which typically line the culture boundary, lie far beyond the adjacent cells, so each circumcenter is drawn toward the edge midpoint until it lies within one edge length of it.
+
+        Args:
+
+            edges (np.ndarray[int]) - (from, to) node pairs drawn from the triangulation, M x 2
+
+        Returns:
+
+            lengths (np.ndarray[float]) - interface lengths, length M
+
+        """
+
+        # each row of the edge list belongs to triangle (row % num_triangles)
+        n = self.size
+        keys = np.sort(self.edge_list, axis=1) @ np.array([n, 1])
+        triangles = np.arange(len(keys)) % self.num_triangles
+        order = np.argsort(keys, kind='stable')
+        keys, triangles = keys[order], triangles[order]
+
+        # find the one or two triangles adjacent to each edge
+        edges = np.sort(edges, axis=1)
+        query = edges @ np.array([n, 1])
+        first = np.searchsorted(keys, query, side='left')
+        count = np.searchsorted(keys, query, side='right') - first
+        second = np.minimum(first + 1, len(keys) - 1)
+
+        # find circumcenters, limiting their distance from the edge midpoint
+        midpoints = np.vstack((self.x[edges].mean(axis=1), self.y[edges].mean(axis=1))).T
+        max_offsets = self.evaluate_edge_lengths(edges, self.x, self.y)
+        centers = self.circumcenters
+        a, b = centers[triangles[first]], centers[triangles[second]]
+        b[count < 2] = midpoints[count < 2]
+        a = self._limit_offset(midpoints, a, max_offsets)
+        b = self._limit_offset(midpoints, b, max_offsets)
+
+        return np.sqrt(((a - b)**2).sum(axis=1))
+
+    @staticmethod
+    def _limit_offset(origins, points, max_offsets):
+        """ Returns <points> drawn toward <origins> until they lie within <max_offsets>. """
+        offsets = points - origins
+        distances = np.sqrt((offsets**2).sum(axis=1))
+        with np.errstate(invalid='ignore', divide='ignore'):
+            scaling = np.minimum(1, max_offsets / distances)
+        scaling[distances == 0] = 1
+        return origins + offsets * scaling.reshape(-1, 1)
+
     def compile_edge_list(self):
         """ Returns list of (node_from, node_to) tuples. """
         edges = []
@@ -98,6 +160,14 @@ class LocalTriangulation(Triangulation):
         """ Returns index of first edge containing <node>. """
         return (edges==node).any(axis=1).nonzero()[0][0]
 
+    @staticmethod
+    def find_connecting_edges(edges, nodes):
+        """ Returns first of <edges> containing each of <nodes>. Raises ValueError if no edge contains a node. """
+        indices = kernels.first_edges(edges, nodes)
+        if (indices < 0).any():
+            raise ValueError('No edge contains nodes {}.'.format(nodes[indices < 0]))
+        return edges[indices]
+
     @classmethod
     def filter_edges(cls, nodes, edges, lengths, max_length=0.1):
         """ Returns all edges less than <max_length>, with at least one edge containing each node. """
@@ -115,8 +185,7 @@ class LocalTriangulation(Triangulation):
 
         # add shortest edge for each disconnected node
         if disconnected.size > 0:
-            f = np.vectorize(lambda node: cls.find_first_edge(rejected, node))
-            connecting = rejected[f(disconnected)]
+            connecting = cls.find_connecting_edges(rejected, disconnected)
             accepted = np.vstack((accepted, connecting))
 
         return accepted
@@ -139,8 +208,7 @@ class LocalTriangulation(Triangulation):
 
         # add shortest edge for each disconnected node
         if disconnected.size > 0:
-            f = np.vectorize(lambda node: cls.find_first_edge(rejected, node))
-            connecting = rejected[f(disconnected)]
+            connecting = cls.find_connecting_edges(rejected, disconnected)
             accepted = np.vstack((accepted, connecting))
 
         return accepted
@@ -236,8 +304,7 @@ class LocalTriangulation(Triangulation):
 
         # add shortest edge for each disconnected node
         if disconnected.size > 0:
-            f = np.vectorize(lambda node: self.find_first_edge(rejected, node))
-            connecting = rejected[f(disconnected)]
+            connecting = self.find_connecting_edges(rejected, disconnected)
             accepted = np.vstack((accepted, connecting, connecting[::-1]))
 
         return accepted
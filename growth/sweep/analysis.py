@@ -1,5 +1,6 @@
 import numpy as np
-import matplotlib.pyplot as plt
+from ..imports import lazy_import
+plt = lazy_import('matplotlib.pyplot')
 
 
 class SweepResults:
@@ -46,7 +47,7 @@ class SweepResults:
         ax.set_title(attribute)
         return fig
 
-    def _plot(self, zz, figsize=(2, 2), cmap=plt.cm.viridis):
+    def _plot(self, zz, figsize=(2, 2), cmap='viridis'):
         """
         Plot 2D grid.
         """
@@ -46,6 +46,30 @@ class RunArguments(ArgumentParser):
                default=False,
                required=False)
 
+          # add keyword argument for walltime
+          self.add_argument(
+               '-w', '--walltime',
+               help='Walltime, in hours.',
+               type=int,
+               default=None,
+               required=False)
+
+          # add keyword argument for memory budget
+          self.add_argument(
+               '--max_memory',
+               help='Resident memory budget, in GB.',
+               type=float,
+               default=None,
+               required=False)
+
+          # add keyword argument for profiling
+          self.add_argument(
+               '--profile',
+               help='Record time spent in each phase of growth.',
+               type=str2bool,
+               default=False,
+               required=False)
+
      def parse(self):
           """ Parse arguments. """
           self.args = vars(self.parse_args())
@@ -59,6 +83,9 @@ class SweepArguments(RunArguments):
 
           super().add_arguments()
 
+          # default to ten hour walltime for job submissions
+          self.set_defaults(walltime=10)
+
           # add keyword argument for first recombination start generation
           self.add_argument('-fs', '--first_start',
                               help='First recombination start generation.',
@@ -129,13 +156,6 @@ class SweepArguments(RunArguments):
                               default=1,
                               required=False)
 
-          # add keyword argument for estimated run time
-          self.add_argument('-w', '--walltime',
-                              help='Estimated run time.',
-                              type=int,
-                              default=10,
-                              required=False)
-
           # add keyword argument for number of cores
           self.add_argument('-c', '--cores',
                               help='Number of cores.',
@@ -1,8 +1,10 @@
 import numpy as np
-import pandas as pd
+from ..imports import lazy_import
+pd = lazy_import('pandas')
 from os.path import join
 from ..visualization.batch import BatchVisualization
 from .simulation import GrowthSimulation
+from .metrics import MetricEvaluator
 
 
 class Batch(BatchVisualization):
@@ -26,6 +28,27 @@ class Batch(BatchVisualization):
         data['replicate_id'] = np.arange(self.size)
         return data
 
+    def evaluate(self, metrics=None, **kwargs):
+        """
+        Evaluate metrics for each simulation.
+
+        Args:
+
+            metrics (list) - metric names or Metric instances, defaults to all registered metrics
+
+            kwargs: keyword arguments for MetricEvaluator
+
+        Returns:
+
+            data (pd.DataFrame) - one row per simulation
+
+        """
+        evaluator = MetricEvaluator(metrics, **kwargs)
+        paths = [join(self.root, path) for path in self.paths]
+        data = evaluator.evaluate(paths)
+        data['replicate_id'] = np.arange(self.size)
+        return data
+
     def __getitem__(self, index):
         """ Returns simulation instance. """
         return self.load_simulation(index)
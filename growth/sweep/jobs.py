@@ -9,6 +9,7 @@ from datetime import datetime
 
 from .simulation import GrowthSimulation
 from .batch import Batch
+from .metrics import MetricEvaluator
 
 
 class JobProperties:
@@ -114,7 +115,7 @@ class Job(JobProperties):
         return job
 
     @staticmethod
-    def build_run_script(path, script_name, save_history):
+    def build_run_script(path, script_name, save_history, profile=False):
         """
         Writes bash run script for local use.
 
@@ -126,6 +127,8 @@ class Job(JobProperties):
 
             save_history (bool) - if True, save simulation history
 
+            profile (bool) - if True, record time spent in each phase of growth
+
         """
 
         # define paths
@@ -149,8 +152,8 @@ class Job(JobProperties):
         job_script.write('while read P; do\n')
         job_script.write('echo "Processing batch ${P}"\n')
         job_script.write('python ./scripts/{:s}'.format(script_name)+' ${P} ')
-        args = (save_history,)
-        job_script.write('-s {:d}\n'.format(*args))
+        args = (save_history, profile)
+        job_script.write('-s {:d} --profile {:d}\n'.format(*args))
         job_script.write('done < ./batches/index.txt \n')
         job_script.write('echo "Job completed at `date`"\n')
         job_script.write('exit\n')
@@ -168,7 +171,8 @@ class Job(JobProperties):
                                 walltime=10,
                                 allocation='p30653',
                                 cores=1,
-                                memory=4):
+                                memory=4,
+                                profile=False):
         """
         Writes job submission script for QUEST.
 
@@ -188,6 +192,8 @@ class Job(JobProperties):
 
             memory (int) - memory per batch, GB
 
+            profile (bool) - if True, record time spent in each phase of growth
+
         """
 
         # define paths
@@ -242,8 +248,8 @@ class Job(JobProperties):
 
         # run script
         job_script.write('python ./scripts/{:s}'.format(script_name)+' ${P} ')
-        args = (save_history,)
-        job_script.write('-s {:d}\n'.format(*args))
+        args = (save_history, profile, walltime, memory)
+        job_script.write('-s {:d} --profile {:d} -w {:d} --max_memory {:d}\n'.format(*args))
         job_script.write('EOJ\n')
         job_script.write('`\n\n')
         # ============= end submission script for individual batch ============
@@ -340,6 +346,7 @@ class Job(JobProperties):
               allocation='p30653',
               cores=1,
               memory=4,
+              profile=False,
               **sim_kw):
         """
         Build job directory tree. Instantiates and saves a simulation instance for each parameter set, then generates a single shell script to submit each simulation as a separate job.
@@ -358,6 +365,8 @@ class Job(JobProperties):
 
             memory (int) - memory per batch, GB
 
+            profile (bool) - if True, record time spent in each phase of growth
+
             sim_kw (dict) - keyword arguments for simulation
 
         """
@@ -369,10 +378,7 @@ class Job(JobProperties):
         self.sim_kw = sim_kw
 
         # build simulations
-        for i, parameters in enumerate(self.parameters):
-            simulation_path = join(self.path, 'simulations', '{:d}'.format(i))
-            self.simulation_paths[i] = relpath(simulation_path, self.path)
-            self.build_simulation(parameters, simulation_path, **sim_kw)
+        self.build_simulations(**sim_kw)
 
         # save serialized job
         with open(join(self.path, 'job.pkl'), 'wb') as file:
@@ -384,7 +390,8 @@ class Job(JobProperties):
         # build job run script
         self.build_run_script(self.path,
                               self.script_name,
-                              save_history)
+                              save_history,
+                              profile=profile)
 
         # build job submission script
         self.build_submission_script(self.path,
@@ -393,7 +400,27 @@ class Job(JobProperties):
                                      walltime=walltime,
                                      allocation=allocation,
                                      cores=cores,
-                                     memory=memory)
+                                     memory=memory,
+                                     profile=profile)
+
+    def get_simulation_path(self, index):
+        """ Returns path to directory for simulation <index>, registering its relative path. """
+        simulation_path = join(self.path, 'simulations', '{:d}'.format(index))
+        self.simulation_paths[index] = relpath(simulation_path, self.path)
+        return simulation_path
+
+    def build_simulations(self, **kwargs):
+        """
+        Builds and saves a simulation instance for each parameter set.
+
+        Args:
+
+            kwargs: keyword arguments for simulation
+
+        """
+        for i, parameters in enumerate(self.parameters):
+            simulation_path = self.get_simulation_path(i)
+            self.build_simulation(parameters, simulation_path, **kwargs)
 
     @classmethod
     def build_simulation(cls, parameters, simulation_path, **kwargs):
@@ -451,3 +478,23 @@ class Job(JobProperties):
         """
         f = lambda path: func(GrowthSimulation.load(path))
         return {i: f(p) for i, p in self.simulation_paths.items()}
+
+    def evaluate(self, metrics=None, **kwargs):
+        """
+        Evaluates metrics for all simulations.
+
+        Args:
+
+            metrics (list) - metric names or Metric instances, defaults to all registered metrics
+
+            kwargs: keyword arguments for MetricEvaluator
+
+        Returns:
+
+            data (pd.DataFrame) - one row per simulation, indexed by simulation_id
+
+        """
+        evaluator = MetricEvaluator(metrics, **kwargs)
+        ids = sorted(self.simulation_paths.keys())
+        paths = [join(self.path, self.simulation_paths[i]) for i in ids]
+        return evaluator.evaluate(paths, index=ids)
@@ -0,0 +1,246 @@
+from concurrent.futures import ThreadPoolExecutor, ProcessPoolExecutor
+import numpy as np
+from ..imports import lazy_import
+pd = lazy_import('pandas')
+
+from .simulation import GrowthSimulation
+
+
+class Metric:
+    """
+    Named summary statistic evaluated on a single culture.
+
+    Metric functions accept a culture along with any keyword arguments and return either a scalar or a dictionary of scalars, in which case each entry is stored as a separate column. Intermediate structures such as the triangulation, edge list, patch labels and clone labels are cached on the culture, so all metrics evaluated on the same culture share them.
+
+    Attributes:
+
+        name (str) - metric name
+
+        func (function) - function evaluating the metric on a culture
+
+        kwargs (dict) - keyword arguments for <func>
+
+    """
+
+    def __init__(self, name, func, **kwargs):
+        self.name = name
+        self.func = func
+        self.kwargs = kwargs
+
+    def __repr__(self):
+        return 'Metric({:s})'.format(self.name)
+
+    def __call__(self, culture):
+        """ Evaluate metric on <culture>. """
+        return self.func(culture, **self.kwargs)
+
+
+# registry of available metrics, keyed by name
+METRICS = {}
+
+
+def register(name, func=None, **kwargs):
+    """
+    Register metric under <name>. May be used as a decorator.
+
+    Args:
+
+        name (str) - metric name
+
+        func (function) - function evaluating the metric on a culture
+
+        kwargs: keyword arguments for <func>, e.g. a border scaling factor
+
+    """
+    def decorator(func):
+        METRICS[name] = Metric(name, func, **kwargs)
+        return func
+    if func is None:
+        return decorator
+    return decorator(func)
+
+
+def get_metrics(metrics=None):
+    """ Returns list of Metric instances from names or Metric instances. Defaults to all registered metrics. """
+    if metrics is None:
+        return list(METRICS.values())
+    if isinstance(metrics, (str, Metric)):
+        metrics = [metrics]
+    return [m if isinstance(m, Metric) else METRICS[m] for m in metrics]
+
+
+@register('population')
+def population(culture):
+    """ Number of cells. """
+    return culture.size
+
+
+@register('percent_heterozygous')
+def percent_heterozygous(culture):
+    """ Fraction of population with heterozygous chromosomes. """
+    return culture.percent_heterozygous
+
+
+@register('transclone_edges')
+def transclone_edges(culture):
+    """ Number of edges connecting differing genotypes per cell. """
+    return culture.heterogeneity
+
+
+@register('contacts')
+def contacts(culture):
+    """ Number of edges between each pair of genotypes. """
+    data = culture.edge_statistics.to_dict()
+    data.pop('heterogeneity')
+    return data
+
+
+def _summarize(sizes, prefix, plural):
+    """ Returns summary statistics for list of <sizes>. """
+    sizes = np.asarray(sizes)
+    if sizes.size == 0:
+        mean, median, variation = np.nan, np.nan, np.nan
+    else:
+        mean, median = sizes.mean(), np.median(sizes)
+        variation = sizes.std() / mean
+    return {
+        'num_{:s}'.format(plural): sizes.size,
+        'mean_{:s}_size'.format(prefix): mean,
+        'median_{:s}_size'.format(prefix): median,
+        '{:s}_size_variation'.format(prefix): variation}
+
+
+@register('interior_clones', factor=0.8)
+@register('clones')
+def clone_statistics(culture, factor=None):
+    """ Number of coherent clones along with clone size statistics, optionally excluding the border region beyond the scaling <factor>. """
+    data = _summarize(culture.get_clone_sizes(factor=factor), 'clone', 'clones')
+    if factor is not None:
+        data = {'interior_'+k: v for k, v in data.items()}
+    return data
+
+
+@register('patches')
+def patch_statistics(culture, genotypes=(0, 2)):
+    """ Number of recombinant patches along with patch size and shape statistics. """
+    patches = culture.get_patches(genotypes)
+    data = _summarize(patches.sizes, 'patch', 'patches')
+    data['mean_patch_compactness'] = np.nanmean(patches.compactness) if patches.num_patches > 0 else np.nan
+    return data
+
+
+@register('clones_per_patch')
+def clones_per_patch(culture):
+    """ Mean number of coherent clones per recombinant patch. """
+    num_patches = culture.num_patches
+    if num_patches == 0:
+        return np.nan
+    return len(culture.clone_sizes_per_patch) / num_patches
+
+
+@register('loci')
+def locus_statistics(culture):
+    """ Recombinant fraction, patch, clone and contact statistics at each additional locus. """
+    data = {}
+    for locus, row in culture.locus_statistics.iloc[1:].iterrows():
+        data.update({'{:s}_{:d}'.format(k, locus): v for k, v in row.items()})
+    return data
+
+
+def evaluate(simulation, metrics=None):
+    """
+    Evaluate metrics on a single simulation.
+
+    Args:
+
+        simulation (GrowthSimulation or str) - simulation instance or path to a saved simulation
+
+        metrics (list) - metric names or Metric instances, defaults to all registered metrics
+
+    Returns:
+
+        results (dict) - simulation parameters (if available) followed by metric values
+
+    """
+    if isinstance(simulation, str):
+        simulation = GrowthSimulation.load(simulation)
+    results = dict(getattr(simulation, 'parameters', {}))
+    for metric in get_metrics(metrics):
+        value = metric(simulation)
+        if isinstance(value, dict):
+            results.update(value)
+        else:
+            results[metric.name] = value
+    return results
+
+
+class MetricEvaluator:
+    """
+    Class for evaluating a common set of metrics over many simulations.
+
+    Simulations are evaluated concurrently. When simulations are specified by path, each worker loads its own simulation so that only paths and results are exchanged between processes.
+
+    Attributes:
+
+        metrics (list of Metric) - metrics evaluated for each simulation
+
+        max_workers (int) - number of simulations evaluated concurrently
+
+        processes (bool) - if True, evaluate simulations in a process pool
+
+    """
+
+    def __init__(self, metrics=None, max_workers=None, processes=True):
+        """
+        Instantiate evaluator.
+
+        Args:
+
+            metrics (list) - metric names or Metric instances, defaults to all registered metrics
+
+            max_workers (int) - number of simulations evaluated concurrently, defaults to the executor's default
+
+            processes (bool) - if True, evaluate simulations in a process pool rather than a thread pool. Metric functions must then be importable at module level.
+
+        """
+        self.metrics = get_metrics(metrics)
+        self.max_workers = max_workers
+        self.processes = processes
+
+    @property
+    def names(self):
+        """ Names of evaluated metrics. """
+        return [metric.name for metric in self.metrics]
+
+    @property
+    def executor(self):
+        """ Executor used to evaluate simulations. """
+        if self.processes:
+            return ProcessPoolExecutor(max_workers=self.max_workers)
+        return ThreadPoolExecutor(max_workers=self.max_workers)
+
+    def evaluate(self, simulations, index=None):
+        """
+        Evaluate metrics over many simulations.
+
+        Args:
+
+            simulations (iterable) - simulation instances or paths to saved simulations
+
+            index (iterable) - identifier of each simulation, defaults to its position
+
+        Returns:
+
+            data (pd.DataFrame) - one row per simulation, one column per parameter or metric value
+
+        """
+        simulations = list(simulations)
+        metrics = [self.metrics] * len(simulations)
+        if self.max_workers == 1:
+            results = list(map(evaluate, simulations, metrics))
+        else:
+            with self.executor as executor:
+                results = list(executor.map(evaluate, simulations, metrics))
+        data = pd.DataFrame(results, index=index)
+        data.index.name = 'simulation_id'
+        return data.reset_index()
@@ -1,15 +1,19 @@
 from os.path import join, isdir
 from os import mkdir
+from time import time
 from functools import reduce
 from operator import add
 import numpy as np
 
 from ..cells.cultures import Culture
-from ..cells.cells import Cell
+from ..cells.cells import Cell, founder_chromosomes
 
 
 class GrowthSimulation(Culture):
 
+    # number of cells in seed population
+    seed_size = 4
+
     def __init__(self,
                  division_rate=0.1,
                  recombination_rate=0.1,
@@ -17,16 +21,56 @@ class GrowthSimulation(Culture):
                  recombination_duration=4,
                  min_population=11,
                  reference_population=None,
+                 seed=None,
+                 num_loci=1,
+                 inoculum=None,
                  **kwargs):
+        """
+        Args:
+
+            seed (int) - seed of the random number generator. A seed reproduces a simulation under the same version of the package, but not simulations run before division draws were batched in Cell.divide_cells.
+
+            num_loci (int) - number of independent loci tracked per cell
+
+            inoculum (Inoculum) - starter population, if None a seed population of <seed_size> cells is grown
+
+            kwargs: keyword arguments for Culture
+
+        """
 
         if reference_population is None:
             reference_population = 2**min_population
 
-        # define seed population
-        seed_size = 4
+        # seed random number generator
+        self.seed = seed
+        self.seed_generator(0)
+
+        # define seed population, unless an inoculum is provided
+        if inoculum is None:
+            seed = self.grow_seed(recombination_rate, recombination_start, recombination_duration, num_loci)
+        else:
+            seed, num_loci = inoculum, inoculum.num_loci
+
+        # instantiate culture
+        super().__init__(starter=seed,
+                         reference_population=reference_population,
+                         num_loci=num_loci,
+                         **kwargs)
+
+        # store additional properties
+        self.division_rate = division_rate
+        self.recombination_rate = recombination_rate
+        self.recombination_start = recombination_start
+        self.recombination_duration = recombination_duration
+        self.min_population = min_population
+        self.completed = False
+
+    def grow_seed(self, recombination_rate, recombination_start, recombination_duration, num_loci=1):
+        """ Returns seed population grown by dividing randomly selected cells, with recombination active between populations of 2**<recombination_start> and 2**(<recombination_start> + <recombination_duration>). """
+        seed_size = self.seed_size
         start = 2**recombination_start
         stop = 2**(recombination_start+recombination_duration)
-        seed = [Cell()]
+        seed = [Cell(chromosomes=founder_chromosomes(num_loci))]
         while len(seed) < seed_size:
 
             # determine whether recombination is active
@@ -40,19 +84,15 @@ class GrowthSimulation(Culture):
 
             # choose a random cell for division
             cell_id = np.random.randint(0, population)
-            seed.extend(seed.pop(cell_id).divide(rate))
+            seed.extend(seed.pop(cell_id).divide(rate, num_loci=num_loci))
 
-        # instantiate culture
-        super().__init__(starter=seed,
-                         reference_population=reference_population,
-                         **kwargs)
+        return seed
 
-        # store additional properties
-        self.division_rate = division_rate
-        self.recombination_rate = recombination_rate
-        self.recombination_start = recombination_start
-        self.recombination_duration = recombination_duration
-        self.min_population = min_population
+    def seed_generator(self, *key):
+        """ Seeds the global random number generator with a stream determined by the simulation seed and <key>. Does nothing if the simulation is unseeded. """
+        if getattr(self, 'seed', None) is not None:
+            sequence = np.random.SeedSequence([self.seed, *key])
+            np.random.seed(sequence.generate_state(4))
 
     def save(self, path, save_history=True):
         """ Save pickled object to <path/simulation.pkl>. """
@@ -62,13 +102,39 @@ class GrowthSimulation(Culture):
             mkdir(path)
         super().save(join(path, 'simulation.pkl'), save_history=save_history)
 
+        # write profiling records alongside simulation
+        if self.profiling and len(self.profiler) > 0:
+            self.profiler.save(join(path, 'profile.csv'))
+
     @classmethod
     def load(cls, path):
         """ Load pickled instance from <path/simulation.pkl>. """
         return super().load(join(path, 'simulation.pkl'))
 
-    def run(self):
-        """ Run growth simulation. """
+    def run(self, walltime=None, max_memory=None, checkpoint_interval=None, path=None):
+        """
+        Run growth simulation, optionally within a walltime or memory budget. If the budget is exhausted, growth stops early and <completed> is set to False. The simulation is checkpointed to <path>, if provided, and calling run on the saved simulation resumes growth.
+
+        Args:
+
+            walltime (float) - time budget, seconds
+
+            max_memory (float) - budget for the resident memory currently in use by the process (not its peak), GB
+
+            checkpoint_interval (float) - seconds between periodic checkpoints
+
+            path (str) - simulation directory to which checkpoints are saved
+
+        Returns:
+
+            completed (bool) - if True, simulation reached its final population
+
+        """
+
+        start_time = time()
+
+        # seed random number generator, drawing a new stream upon resumption
+        self.seed_generator(1, self.generation)
 
         # define population windows
         pop0 = int(2**self.recombination_start)
@@ -77,20 +143,32 @@ class GrowthSimulation(Culture):
         if pop1 > pop2:
             pop1 = pop2
 
-        # growth before recombination_rate
-        self.grow(min_population=pop0,
-                 division_rate=self.division_rate,
-                 recombination_rate=0.)
-
-        # growth with recombination_rate
-        self.grow(min_population=pop1,
-                 division_rate=self.division_rate,
-                 recombination_rate=self.recombination_rate)
-
-        # growth after recombination_rate
-        self.grow(min_population=pop2,
-                 division_rate=self.division_rate,
-                 recombination_rate=0.)
+        # define growth stages, those already completed return immediately
+        stages = [
+            (pop0, 0.),                         # before recombination
+            (pop1, self.recombination_rate),    # with recombination
+            (pop2, 0.)]                         # after recombination
+
+        self.completed = False
+        for population, recombination_rate in stages:
+
+            # allocate remaining walltime
+            remaining = None
+            if walltime is not None:
+                remaining = walltime - (time() - start_time)
+
+            completed = self.grow(min_population=population,
+                                  division_rate=self.division_rate,
+                                  recombination_rate=recombination_rate,
+                                  walltime=remaining,
+                                  max_memory=max_memory,
+                                  checkpoint_path=path,
+                                  checkpoint_interval=checkpoint_interval)
+            if not completed:
+                return False
+
+        self.completed = True
+        return True
 
     def branch(self, t=None):
         """ Returns copy of culture at generation <t> including history. """
@@ -100,6 +178,7 @@ class GrowthSimulation(Culture):
         sim.recombination_start = self.recombination_start
         sim.recombination_duration = self.recombination_duration
         sim.min_population = self.min_population
+        sim.seed = self.seed
         return sim
 
     def freeze(self, t):
@@ -110,18 +189,27 @@ class GrowthSimulation(Culture):
         sim.recombination_start = self.recombination_start
         sim.recombination_duration = self.recombination_duration
         sim.min_population = self.min_population
+        sim.seed = self.seed
         return sim
 
     @property
-    def results(self):
-        """ Returns simulation results in dictionary format. """
+    def parameters(self):
+        """ Returns simulation parameters in dictionary format. """
         return {
             'division_rate': self.division_rate,
             'recombination_rate': self.recombination_rate,
             'recombination_start': self.recombination_start,
-            'recombination_duration': self.recombination_duration,
+            'recombination_duration': self.recombination_duration}
+
+    @property
+    def results(self):
+        """ Returns simulation results in dictionary format. """
+        clone_sizes = np.array(self.get_clone_sizes())
+        results = self.parameters
+        results.update({
             'population': self.size,
             'transclone_edges': self.heterogeneity,
             'percent_heterozygous': self.percent_heterozygous,
-            'num_clones': self.clones.num_clones,
-            'clone_size_variation': self.clones.size_variation}
+            'num_clones': clone_sizes.size,
+            'clone_size_variation': clone_sizes.std() / clone_sizes.mean()})
+        return results
@@ -1,7 +1,8 @@
 from os.path import isdir, exists, join
 from os import mkdir
 import numpy as np
-import pandas as pd
+from ..imports import lazy_import
+pd = lazy_import('pandas')
 import pickle
 from ..visualization.sweep import SweepVisualization
 from .jobs import Job
@@ -60,7 +61,10 @@ class Sweep(Job, SweepProperties, SweepVisualization):
 
                  # arguments defining simulation size
                  min_population=11,
-                 num_replicates=10):
+                 num_replicates=10,
+
+                 # argument defining random number streams
+                 seed=None):
 
         # set division rate
         self.division_rate = division_rate
@@ -84,6 +88,9 @@ class Sweep(Job, SweepProperties, SweepVisualization):
         self.max_rate = max_rate
         self.num_rates = num_rates
 
+        # set root seed from which all simulation seeds are spawned
+        self.seed = seed
+
         # construct parameter array
         parameters = np.array(list(zip(*[grid.ravel() for grid in self.grid])))
         parameters = np.repeat(parameters, repeats=num_replicates, axis=0)
@@ -133,7 +140,7 @@ class Sweep(Job, SweepProperties, SweepVisualization):
             recombination_rate=recombination_rate,
             recombination_start=recombination_start,
             recombination_duration=self.duration,
-            final_population=self.min_population,
+            min_population=self.min_population,
             **kwargs)
 
         # create simulation directory
@@ -143,6 +150,84 @@ class Sweep(Job, SweepProperties, SweepVisualization):
         # save simulation
         simulation.save(simulation_path)
 
+    def build_prefix(self, recombination_start, **kwargs):
+        """
+        Returns simulation grown to the onset of recombination. Growth prior to recombination does not depend on the recombination rate, so a single prefix may be shared by all recombination rates.
+
+        Args:
+
+            recombination_start (int) - generation at which recombination begins
+
+            kwargs: keyword arguments for GrowthSimulation
+
+        """
+        simulation = GrowthSimulation(
+            division_rate=self.division_rate,
+            recombination_rate=0.,
+            recombination_start=recombination_start,
+            recombination_duration=self.duration,
+            min_population=self.min_population,
+            **kwargs)
+        simulation.seed_generator(1, simulation.generation)
+        simulation.grow(min_population=int(2**recombination_start),
+                        division_rate=self.division_rate,
+                        recombination_rate=0.)
+        return simulation
+
+    def build_simulations(self, **kwargs):
+        """
+        Builds and saves a simulation instance for each parameter set.
+
+        Growth prior to the onset of recombination is simulated once for each start generation and replicate, then branched into one continuation per recombination rate. Each simulation and each shared prefix is assigned an independent seed spawned from the sweep seed. Prefixes are only shared when recombination begins after the seed population is formed, since otherwise the seed population itself depends on the recombination rate.
+
+        Args:
+
+            kwargs: keyword arguments for GrowthSimulation
+
+        """
+
+        # spawn independent seeds for simulations and shared prefixes
+        root = np.random.SeedSequence(self.seed)
+        simulation_seeds, prefix_seeds = root.spawn(2)
+        to_int = lambda x: int(x.generate_state(1, dtype=np.uint64)[0])
+        simulation_seeds = [to_int(x) for x in simulation_seeds.spawn(self.N)]
+
+        # register simulation paths in order
+        simulation_paths = [self.get_simulation_path(i) for i in range(self.N)]
+
+        # group simulations sharing a start generation and replicate index
+        groups = {}
+        for i, (start, _) in enumerate(self.parameters):
+            key = (start, i % self.num_replicates)
+            groups.setdefault(key, []).append(i)
+        prefix_seeds = [to_int(x) for x in prefix_seeds.spawn(len(groups))]
+
+        for (start, _), indices in groups.items():
+
+            # grow shared prefix
+            prefix = None
+            if 2**start >= GrowthSimulation.seed_size:
+                prefix_seed = prefix_seeds.pop(0)
+                prefix = self.build_prefix(start, seed=prefix_seed, **kwargs)
+
+            for i in indices:
+                simulation_path = simulation_paths[i]
+                seed = simulation_seeds[i]
+
+                # build independent simulation
+                if prefix is None:
+                    self.build_simulation(self.parameters[i], simulation_path,
+                                          seed=seed, **kwargs)
+                    continue
+
+                # branch shared prefix
+                simulation = prefix.branch()
+                simulation.recombination_rate = self.parameters[i][1]
+                simulation.seed = seed
+                if not isdir(simulation_path):
+                    mkdir(simulation_path)
+                simulation.save(simulation_path)
+
     def aggregate(self):
         """ Aggregate results from all sweeps. """
 
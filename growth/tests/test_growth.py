@@ -0,0 +1,128 @@
+from unittest import TestCase
+from tempfile import TemporaryDirectory
+from os.path import join, exists
+import numpy as np
+from growth import Culture
+from growth.cells.scheduler import DivisionScheduler
+from growth.sweep.simulation import GrowthSimulation
+
+
+class TestEventGrowth(TestCase):
+    """
+    Tests for event-driven growth.
+    """
+
+    def test00_doubling(self):
+        """ Check that every cell divides in every generation when division is certain. """
+        culture = Culture(reference_population=32)
+        generations = culture.grow_events(32, division_rate=1.0, relax_interval=3)
+        self.assertEqual(generations, 3)
+        self.assertEqual(culture.size, 32)
+        self.assertEqual(culture.generation, 1)
+
+    def test01_history(self):
+        """ Check that relaxation preserves earlier history entries and that cells which neither divide nor move are shared between entries. """
+        np.random.seed(0)
+        culture = Culture(reference_population=50)
+        culture.grow_events(50, division_rate=0.3, relax_interval=2)
+        history = [np.array([cell.xy for cell in cells]) for cells in culture.history]
+        culture.grow_events(100, division_rate=0.1, max_iters=1, relaxation='local', max_strain=1., min_separation=0.)
+        for xy, cells in zip(history, culture.history):
+            self.assertTrue(np.array_equal(xy, np.array([cell.xy for cell in cells])))
+        self.assertEqual(culture.relaxation_trace['mode'].iloc[-1], 'local')
+        parents = set(map(id, culture.parents))
+        self.assertTrue(any(id(cell) in parents for cell in culture.cells))
+
+    def test02_branch(self):
+        """ Check that relaxing a branch leaves the original culture unchanged. """
+        np.random.seed(0)
+        culture = Culture(reference_population=50)
+        culture.grow_events(50, division_rate=0.3)
+        positions = lambda x: np.array([cell.xy for cell in x.cells])
+        xy = positions(culture)
+        for relaxation in ('global', 'local'):
+            branch = culture.branch()
+            branch._daughters = culture._daughters
+            record = branch.move(relaxation=relaxation, max_strain=1., min_separation=0.)
+            self.assertEqual(record['mode'], relaxation)
+            self.assertFalse(np.array_equal(positions(branch), xy))
+            self.assertTrue(np.array_equal(positions(culture), xy))
+
+    def test03_scheduler(self):
+        """ Check that pending divisions persist between runs and only visit cells due to divide. """
+        np.random.seed(0)
+        scheduler = DivisionScheduler(division_rate=0.5)
+        cells = Culture.inoculate(4)
+        for _ in range(3):
+            scheduler.run(cells, num_generations=2)
+            self.assertEqual(scheduler.size, len(cells))
+            scheduled = np.concatenate([np.concatenate(x) for x in scheduler.pending.values()])
+            self.assertTrue(np.array_equal(np.sort(scheduled), np.arange(len(cells))))
+            self.assertTrue(min(scheduler.pending) > scheduler.generation)
+        self.assertEqual(scheduler.generation, 6)
+
+
+class TestAdaptiveRelaxation(TestCase):
+    """
+    Tests for adaptive relaxation scheduling.
+    """
+
+    def test00_interval(self):
+        """ Check that relaxation is skipped between intervals and performed before growth stops. """
+        culture = Culture(reference_population=50)
+        culture.grow(50, division_rate=0.5, relax_interval=3, maxiter=50)
+        trace = culture.relaxation_trace
+        self.assertEqual(len(trace), culture.generation)
+        self.assertIn('skipped', set(trace['mode']))
+        self.assertEqual(trace['mode'].iloc[-1], 'global')
+
+
+class TestBudget(TestCase):
+    """
+    Tests for growth within walltime and memory budgets.
+    """
+
+    def setUp(self):
+        self.tmpdir = TemporaryDirectory()
+
+    def tearDown(self):
+        self.tmpdir.cleanup()
+
+    def test00_walltime(self):
+        """ Check that an exhausted walltime stops growth before the first generation and writes a checkpoint. """
+        path = join(self.tmpdir.name, 'culture.pkl')
+        culture = Culture(reference_population=50)
+        for walltime in (0, -100):
+            completed = culture.grow(50, walltime=walltime, checkpoint_path=path)
+            self.assertFalse(completed)
+            self.assertEqual(culture.generation, 0)
+        self.assertTrue(exists(path))
+
+    def test01_resume(self):
+        """ Check that growth resumed from a checkpoint reaches the target population. """
+        path = join(self.tmpdir.name, 'culture.pkl')
+        culture = Culture(reference_population=50)
+        culture.grow(50, division_rate=0.5, max_iters=2)
+        self.assertFalse(culture.grow(50, walltime=1e-6, checkpoint_path=path))
+        generation = culture.generation
+        resumed = Culture.load(path)
+        self.assertEqual(resumed.generation, generation)
+        self.assertTrue(resumed.grow(50, division_rate=0.5))
+        self.assertTrue(resumed.size >= 50)
+
+    def test02_memory(self):
+        """ Check that the memory budget is evaluated against memory currently in use. """
+        culture = Culture(reference_population=50)
+        self.assertFalse(culture.grow(50, max_memory=1e-6))
+        self.assertTrue(culture.grow(50, division_rate=0.5, max_memory=1e3))
+
+    def test03_simulation(self):
+        """ Check that a simulation records whether it completed, and completes once resumed. """
+        path = join(self.tmpdir.name, 'simulation')
+        simulation = GrowthSimulation(min_population=6, seed=0)
+        self.assertFalse(simulation.run(walltime=0, path=path))
+        self.assertFalse(simulation.completed)
+        resumed = GrowthSimulation.load(path)
+        self.assertTrue(resumed.run(path=path))
+        self.assertTrue(resumed.completed)
+        self.assertTrue(resumed.size >= 2**6)
@@ -0,0 +1,24 @@
+from unittest import TestCase
+import subprocess
+import sys
+
+
+class TestImports(TestCase):
+    """
+    Tests for deferred imports of heavy dependencies.
+    """
+
+    def loaded(self, name, modules):
+        """ Returns which of <modules> are loaded upon importing <name> in a fresh interpreter. """
+        code = 'import sys, {:s}; print(*[m for m in {!r} if m in sys.modules])'.format(name, modules)
+        output = subprocess.run([sys.executable, '-c', code], capture_output=True, text=True, check=True)
+        return output.stdout.split()
+
+    def test00_headless(self):
+        """ Check that a simulation worker does not import plotting, statistics or data frame libraries. """
+        modules = ('matplotlib.pyplot', 'scipy.stats', 'pandas')
+        self.assertEqual(self.loaded('growth.sweep.simulation', modules), [])
+
+    def test01_lazy(self):
+        """ Check that importing the package does not import its submodules. """
+        self.assertEqual(self.loaded('growth', ('growth.cells', 'numpy')), [])
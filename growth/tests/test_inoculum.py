@@ -0,0 +1,29 @@
+from unittest import TestCase
+import numpy as np
+from growth import Culture
+from growth.cells.inoculum import Inoculum, get_lineages
+
+
+class TestInoculum(TestCase):
+    """
+    Tests for array-based seeding of starter populations.
+    """
+
+    def test00_lineages(self):
+        """ Check that seeded lineages form a full binary tree. """
+        lineages = get_lineages(11)
+        self.assertEqual(len(set(lineages)), 11)
+        self.assertEqual(sorted(lineages), list(lineages))
+        for lineage in lineages:
+            sibling = lineage[:-1] + ('1' if lineage[-1] == '0' else '0')
+            self.assertTrue(any(x.startswith(sibling) for x in lineages))
+
+    def test01_colonies(self):
+        """ Grow a culture from several founder colonies of differing genotypes. """
+        inoculum = Inoculum.colonies([(0, 0), (2, 0)], 50, reference_population=100, genotypes=[0, 2])
+        culture = Culture(starter=inoculum, reference_population=100)
+        self.assertEqual(culture.size, 100)
+        self.assertEqual(list(np.bincount(culture.genotypes)), [50, 0, 50])
+        self.assertEqual(culture.clone_labels.max(), 1)
+        culture.grow(150, division_rate=0.3)
+        self.assertTrue(culture.size >= 150)
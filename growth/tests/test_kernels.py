@@ -0,0 +1,71 @@
+from unittest import TestCase, skipUnless
+import numpy as np
+from growth import Culture, kernels
+from growth.kernels import numpy_kernels
+
+
+@skipUnless('numba' in kernels.available_backends(), 'Numba is not installed.')
+class TestBackends(TestCase):
+    """
+    Tests for agreement between kernel backends.
+    """
+
+    @classmethod
+    def setUpClass(cls):
+        from growth.kernels import numba_kernels
+        cls.backends = (numpy_kernels, numba_kernels)
+        np.random.seed(0)
+
+    def compare(self, name, *args):
+        """ Assert that kernel <name> returns the same result on both backends. """
+        a, b = [getattr(backend, name)(*args) for backend in self.backends]
+        if isinstance(a, tuple):
+            for x, y in zip(a, b):
+                self.assertTrue(np.allclose(x, y))
+        else:
+            self.assertTrue(np.allclose(a, b))
+
+    def test00_divide(self):
+        """ Check division kernel. """
+        xy = np.random.random((100, 2))
+        chromosomes = np.random.randint(0, 2**8, size=(100, 2))
+        recombined = np.random.randint(0, 2**8, size=100)
+        jitter = np.random.normal(size=(100, 2, 2))
+        self.compare('divide', xy, chromosomes, recombined, jitter)
+
+    def test01_geometry(self):
+        """ Check polygon centroid and edge search kernels. """
+        self.compare('polygon_centroid', np.random.random((20, 2)))
+        edges = np.random.randint(0, 50, size=(100, 2))
+        self.compare('first_edges', edges, np.array([0, 10, 49, 60]))
+
+    def test02_lineages(self):
+        """ Check lineage encoding kernel. """
+        lineages = np.array(['', '0', '1', '0110', '111'], dtype=str)
+        chars = np.ascontiguousarray(lineages).view(np.uint32).reshape(5, -1)
+        self.compare('encode_lineages', chars)
+
+    def test03_accumulate(self):
+        """ Check pixel accumulation kernel. """
+        ims = [np.zeros((10, 10)), np.zeros((10, 10))]
+        rows, cols = np.random.randint(0, 10, size=(2, 500))
+        values = np.random.random(500)
+        for im, backend in zip(ims, self.backends):
+            backend.accumulate(im, rows, cols, values)
+        self.assertTrue(np.allclose(*ims))
+
+    def test04_growth(self):
+        """ Check that identically seeded cultures grow identically on both backends. """
+        cultures = []
+        for backend in ('numpy', 'numba'):
+            kernels.set_backend(backend)
+            np.random.seed(0)
+            culture = Culture(reference_population=50, num_loci=2)
+            culture.grow(100, division_rate=0.3, recombination_rate=0.3)
+            cultures.append(culture)
+        kernels.set_backend()
+        a, b = cultures
+        self.assertEqual(list(a.lineages), list(b.lineages))
+        self.assertTrue(np.array_equal(a.locus_genotypes, b.locus_genotypes))
+        self.assertTrue(np.array_equal(a.xy, b.xy))
+        self.assertTrue(np.array_equal(a.clone_labels, b.clone_labels))
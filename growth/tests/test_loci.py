@@ -0,0 +1,36 @@
+from unittest import TestCase
+import numpy as np
+from growth import Culture
+from growth.cells.patches import label_patches
+from growth.cells.clones import label_clones
+
+
+class TestMultipleLoci(TestCase):
+    """
+    Tests for growth with multiple bit-packed loci.
+    """
+
+    @classmethod
+    def setUpClass(cls):
+        """ Grow a culture tracking several loci. """
+        np.random.seed(0)
+        cls.culture = Culture(reference_population=100, num_loci=4)
+        cls.culture.grow(100, division_rate=0.3, recombination_rate=0.3)
+
+    def test00_genotypes(self):
+        """ Check that the first locus matches the single-locus genotypes. """
+        genotypes = self.culture.locus_genotypes
+        self.assertEqual(genotypes.shape, (self.culture.size, 4))
+        self.assertTrue(np.isin(genotypes, (0, 1, 2)).all())
+        self.assertTrue((genotypes[:, 0] == self.culture.genotypes).all())
+
+    def test01_labels(self):
+        """ Check that labels computed across loci match those computed for each locus. """
+        genotypes = self.culture.locus_genotypes
+        edges = self.culture.edge_statistics.edges
+        for locus in range(4):
+            patches = label_patches(edges, genotypes[:, locus])
+            clones = label_clones(self.culture.lineages, genotypes[:, locus])
+            self.assertTrue((self.culture.locus_patch_labels[:, locus] == patches).all())
+            self.assertTrue((self.culture.locus_clone_labels[:, locus] == clones).all())
+        self.assertEqual(len(self.culture.locus_statistics), 4)
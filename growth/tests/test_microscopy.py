@@ -0,0 +1,248 @@
+from unittest import TestCase
+from tempfile import TemporaryDirectory
+from os.path import join
+import numpy as np
+import matplotlib
+matplotlib.use('Agg')
+import matplotlib.pyplot as plt
+from scipy import ndimage
+from scipy.ndimage import maximum_filter
+from pandas import DataFrame
+from growth.microscopy import SyntheticMicroscopy, TiledSyntheticMicroscopy
+from growth.microscopy import MicroscopyPipeline, SegmentStatistics
+from growth.microscopy.images import ScalarImage
+from growth.microscopy.nucleus import Nucleus, NucleusRasterizer, disk
+
+
+class TestRasterizer(TestCase):
+    """
+    Tests for batched nucleus rasterization.
+    """
+
+    @classmethod
+    def setUpClass(cls):
+        """ Initialize nuclear positions and levels. """
+        cls.centroids = np.random.randint(6, 94, size=(50, 2))
+        cls.means = np.random.lognormal(0, 0.3, size=50)
+        cls.stds = cls.means * 0.1
+
+    def test00_replace(self):
+        """ Check that batched drawing matches drawing individual nuclei. """
+
+        # draw individual nuclei
+        np.random.seed(0)
+        expected = np.zeros((100, 100), dtype=np.float64)
+        for xy, mean, std in zip(self.centroids, self.means, self.stds):
+            nucleus = Nucleus(xy, mean, std)
+            nucleus.draw(expected, replace=True)
+
+        # draw all nuclei at once
+        np.random.seed(0)
+        im = np.zeros((100, 100), dtype=np.float64)
+        NucleusRasterizer().draw(im, self.centroids, self.means, self.stds, replace=True)
+
+        self.assertTrue(np.allclose(im, expected))
+
+    def test01_add(self):
+        """ Check that overlapping nuclei accumulate when added. """
+        rasterizer = NucleusRasterizer(radius=3)
+        centroids = np.array([[10, 10], [10, 10]])
+        im = np.zeros((20, 20), dtype=np.float64)
+        rasterizer.draw(im, centroids, np.ones(2), np.zeros(2))
+        self.assertTrue(np.allclose(im[10, 10], 2.))
+        self.assertEqual((im > 0).sum(), rasterizer.num_pixels)
+
+    def test02_replace_overlaps(self):
+        """ Check that overlapping nuclei take the value of the nucleus with the largest label. """
+        rasterizer = NucleusRasterizer(radius=6)
+        means = np.arange(1, len(self.centroids)+1, dtype=np.float64)
+        im = np.zeros((100, 100))
+        rasterizer.draw(im, self.centroids, means, np.zeros(len(means)), replace=True)
+        labels = rasterizer.label((100, 100), self.centroids)
+        self.assertTrue(np.allclose(im[labels >= 0], means[labels[labels >= 0]]))
+        self.assertTrue((im[labels < 0] == 0).all())
+
+    def test03_label(self):
+        """ Check that rasterized labels match a maximum filter. """
+        mask = np.ones((100, 100), dtype=np.int64) * -1
+        mask[tuple(self.centroids.T)] = np.arange(len(self.centroids))
+        expected = maximum_filter(mask, footprint=disk(6))
+        labels = NucleusRasterizer().label((100, 100), self.centroids)
+        self.assertTrue(np.array_equal(labels, expected))
+
+
+class TestTiledMicroscopy(TestCase):
+    """
+    Tests for tiled synthetic microscopy.
+    """
+
+    @classmethod
+    def setUpClass(cls):
+        """ Initialize synthetic measurements. """
+        xy = np.random.uniform(-1, 1, size=(500, 2))
+        cls.data = DataFrame(xy, columns=['x', 'y'])
+        for key in ('nuclear_stain', 'clonal_marker', 'control'):
+            cls.data[key] = np.random.lognormal(0, 0.3, size=500)
+            cls.data[key+'_std'] = cls.data[key] * 0.1
+        cls.tmpdir = TemporaryDirectory()
+
+    @classmethod
+    def tearDownClass(cls):
+        """ Remove on-disk images. """
+        cls.tmpdir.cleanup()
+
+    def render(self, name, **kwargs):
+        """ Returns tiled image rendered with a fixed seed. """
+        np.random.seed(0)
+        path = join(self.tmpdir.name, name)
+        kwargs = dict(height=300, width=400, path=path, **kwargs)
+        return TiledSyntheticMicroscopy(self.data.copy(), 0.5, **kwargs)
+
+    def test00_single_tile(self):
+        """ Check that a single tile reproduces the dense image. """
+        np.random.seed(0)
+        dense = SyntheticMicroscopy(self.data.copy(), 0.5, height=300, width=400)
+        tiled = self.render('single.npy', tile_size=400, dtype=np.float64)
+        self.assertTrue(np.array_equal(dense.im, tiled.im))
+
+    def test01_tiles(self):
+        """ Check that merged tile measurements cover every nuclear pixel. """
+        dense = SyntheticMicroscopy(self.data.copy(), height=300, width=400)
+        tiled = self.render('tiles.npy', tile_size=64, dtype=np.uint16)
+        labels = dense.segmentation
+        counts = np.bincount(labels[labels >= 0], minlength=len(self.data))
+        self.assertTrue(np.array_equal(counts, tiled.counts))
+        self.assertEqual(tiled.im.dtype, np.uint16)
+
+    def test02_seed(self):
+        """ Check that seeded tiled renders are reproducible regardless of the global random state. """
+        kwargs = dict(tile_size=64, dtype=np.float32)
+        first = self.render('seed_a.npy', seed=0, **kwargs)
+        second = self.render('seed_b.npy', seed=0, **kwargs)
+        np.random.seed(1)
+        path = join(self.tmpdir.name, 'seed_c.npy')
+        third = TiledSyntheticMicroscopy(self.data.copy(), 0.5, height=300, width=400, path=path, seed=0, **kwargs)
+        other = self.render('seed_d.npy', seed=1, **kwargs)
+        self.assertTrue(np.array_equal(first.im, second.im))
+        self.assertTrue(np.array_equal(first.im, third.im))
+        self.assertFalse(np.array_equal(first.im, other.im))
+
+
+class TestMicroscopyPipeline(TestCase):
+    """
+    Tests for concurrent synthetic microscopy.
+    """
+
+    @classmethod
+    def setUpClass(cls):
+        """ Initialize synthetic measurements for several fields. """
+        cls.fields = []
+        for _ in range(3):
+            xy = np.random.uniform(-1, 1, size=(200, 2))
+            data = DataFrame(xy, columns=['x', 'y'])
+            for key in ('nuclear_stain', 'clonal_marker', 'control'):
+                data[key] = np.random.lognormal(0, 0.3, size=200)
+                data[key+'_std'] = data[key] * 0.1
+            cls.fields.append(data)
+
+    def test00_channels(self):
+        """ Check that seeded channels are reproducible when drawn concurrently. """
+        kwargs = dict(bleedthrough=0.5, height=200, width=200, seed=0)
+        serial = SyntheticMicroscopy(self.fields[0].copy(), **kwargs)
+        threaded = SyntheticMicroscopy(self.fields[0].copy(), num_threads=3, **kwargs)
+        self.assertTrue(np.array_equal(serial.im, threaded.im))
+
+    def test01_fields(self):
+        """ Check that fields are reproducible regardless of worker count. """
+        kwargs = dict(seed=0, height=200, width=200)
+        serial = MicroscopyPipeline(self.fields, max_workers=1, **kwargs).render()
+        pooled = MicroscopyPipeline(self.fields, max_workers=3, **kwargs).render()
+        for a, b in zip(serial, pooled):
+            self.assertTrue(np.array_equal(a.im, b.im))
+        self.assertFalse(np.array_equal(serial[0].im, serial[1].im))
+
+
+class TestSegmentStatistics(TestCase):
+    """
+    Tests for per-segment pixel statistics.
+    """
+
+    def test00_statistics(self):
+        """ Check statistics against scipy.ndimage. """
+        im = np.random.lognormal(size=(2, 50, 50))
+        labels = np.random.randint(-1, 20, size=(50, 50))
+        index = np.arange(20)
+        statistics = SegmentStatistics(im, labels).to_dataframe()
+        for channel in range(2):
+            prefix = 'ch{:d}_'.format(channel)
+            for key in ('mean', 'standard_deviation', 'median', 'sum'):
+                expected = getattr(ndimage, key)(im[channel], labels, index)
+                column = dict(standard_deviation='std', sum='integrated')
+                values = statistics[prefix+column.get(key, key)].values
+                self.assertTrue(np.allclose(values, expected))
+
+
+class TestAttributeMasks(TestCase):
+    """
+    Tests for nucleus attribute masks.
+    """
+
+    @classmethod
+    def setUpClass(cls):
+        """ Initialize a small synthetic image. """
+        xy = np.random.uniform(-1, 1, size=(50, 2))
+        data = DataFrame(xy, columns=['x', 'y'])
+        for key in ('nuclear_stain', 'clonal_marker', 'control'):
+            data[key] = np.random.lognormal(0, 0.3, size=50)
+            data[key+'_std'] = data[key] * 0.1
+        cls.image = SyntheticMicroscopy(data, height=100, width=100)
+
+    def test00_lookup(self):
+        """ Check that masks built with a lookup table match filling each nucleus in turn. """
+        attributes = ['clonal_marker', 'control']
+        masks = self.image.build_attribute_masks(attributes)
+        segmentation = self.image.segmentation
+        for attribute in attributes:
+            expected = np.zeros(segmentation.shape, dtype=np.float64)
+            for label, value in enumerate(self.image.data[attribute]):
+                expected[segmentation == label] = value
+            self.assertTrue(np.array_equal(masks[attribute].mask, segmentation < 0))
+            self.assertTrue(np.array_equal(masks[attribute].filled(0), expected))
+
+    def test01_index(self):
+        """ Check that masks match nuclei to measurements by index and retain the dtype of each attribute. """
+        data = self.image.data
+        image = SyntheticMicroscopy(data.iloc[::-1].copy(), height=100, width=100)
+        image.data['genotype'] = np.where(image.data.clonal_marker > 1, 'high', 'low')
+        image.data['group'] = image.data['genotype'].astype('category')
+        masks = image.build_attribute_masks(['clonal_marker', 'genotype', 'group'])
+        segmentation = image.segmentation
+        foreground = segmentation >= 0
+        expected = image.data.loc[segmentation[foreground]]
+        self.assertTrue(np.array_equal(masks['clonal_marker'][foreground], expected.clonal_marker.values))
+        self.assertEqual(list(masks['genotype'][foreground]), list(expected.genotype))
+        self.assertEqual(list(masks['group'][foreground]), list(expected.genotype))
+
+
+class TestRendering(TestCase):
+    """
+    Smoke tests for rendering images with the default colormap.
+    """
+
+    def test00_render(self):
+        """ Check that a scalar image renders without a colormap. """
+        image = ScalarImage(10, 10)
+        image.fill()
+        image.render()
+        plt.close('all')
+
+    def test01_render_mask(self):
+        """ Check that a nucleus attribute mask renders. """
+        xy = np.random.uniform(-1, 1, size=(20, 2))
+        data = DataFrame(xy, columns=['x', 'y'])
+        for key in ('nuclear_stain', 'clonal_marker', 'control'):
+            data[key] = np.random.lognormal(0, 0.3, size=20)
+            data[key+'_std'] = data[key] * 0.1
+        image = SyntheticMicroscopy(data, height=50, width=50)
+        image.render_mask('clonal_marker')
+        plt.close('all')
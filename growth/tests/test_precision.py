@@ -0,0 +1,55 @@
+from unittest import TestCase
+import numpy as np
+from growth import Culture, precision
+from growth.cells.cells import Cell
+from growth.sweep.metrics import evaluate
+
+
+class TestPrecision(TestCase):
+    """
+    Tests for single precision culture state, measurements and images.
+    """
+
+    metrics = ('population', 'percent_heterozygous', 'transclone_edges', 'clones', 'patches')
+
+    @classmethod
+    def grow(cls, name):
+        """ Returns culture grown with a fixed seed at precision <name> along with its metrics. """
+        precision.set_precision(name)
+        np.random.seed(0)
+        culture = Culture(reference_population=200)
+        culture.grow(200, division_rate=0.2, recombination_rate=0.2)
+        return culture, evaluate(culture, cls.metrics)
+
+    @classmethod
+    def setUpClass(cls):
+        """ Grow identically seeded cultures in double and single precision. """
+        cls.double, cls.double_metrics = cls.grow('double')
+        cls.single, cls.single_metrics = cls.grow('single')
+
+    @classmethod
+    def tearDownClass(cls):
+        precision.set_precision()
+
+    def test00_dtypes(self):
+        """ Check that positions, measurements and images are stored in single precision. """
+        precision.set_precision('single')
+        self.assertEqual(self.single.xy.dtype, np.float32)
+        measurements = self.single.measure(ambiguity=0.1)
+        floats = measurements.select_dtypes('float')
+        self.assertTrue((floats.dtypes == np.float32).all())
+        image = self.single.generate_microscopy(0.1, 0., 0.1)
+        self.assertEqual(image.im.dtype, np.float32)
+
+    def test01_growth(self):
+        """ Check that metrics independent of cell positions are unchanged by the precision of growth. """
+        for key in ('population', 'percent_heterozygous', 'num_clones', 'mean_clone_size'):
+            self.assertEqual(self.double_metrics[key], self.single_metrics[key])
+
+    def test02_metrics(self):
+        """ Check that spatial metrics are unchanged within tolerance when positions are rounded to single precision. """
+        cells = [Cell(cell.xy.astype(np.float32), cell.chromosomes, cell.lineage)
+                 for cell in self.double.cells]
+        rounded = evaluate(Culture(cells, reference_population=200), self.metrics)
+        for key, value in self.double_metrics.items():
+            self.assertAlmostEqual(value, rounded[key], delta=1e-3*abs(value))
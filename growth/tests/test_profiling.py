@@ -0,0 +1,49 @@
+from unittest import TestCase
+from tempfile import TemporaryDirectory
+from os.path import join
+import numpy as np
+from pandas import read_csv
+from growth import Culture
+from growth.sweep.simulation import GrowthSimulation
+
+
+class TestProfiling(TestCase):
+    """
+    Tests for growth instrumentation.
+    """
+
+    def test00_records(self):
+        """ Check that one record with non-negative phase times, summing to no more than the total, is written per generation. """
+        np.random.seed(0)
+        culture = Culture(reference_population=50)
+        culture.enable_profiling()
+        culture.grow(50, division_rate=0.5)
+        data = culture.profiler.to_dataframe()
+        self.assertEqual(len(data), culture.generation)
+        self.assertEqual(list(data.generation), list(range(1, culture.generation+1)))
+        phases = data[list(culture.profiler.phases)]
+        self.assertTrue((phases >= 0).all().all())
+        self.assertTrue((phases.sum(axis=1) <= data.total).all())
+        self.assertEqual(data.population.iloc[-1], culture.size)
+
+    def test01_disabled(self):
+        """ Check that cultures are not instrumented unless profiling is enabled. """
+        culture = Culture(reference_population=20)
+        culture.grow(20, division_rate=0.5)
+        self.assertNotIn('_profiler', culture.__dict__)
+        culture.enable_profiling()
+        culture.disable_profiling()
+        culture.grow(40, division_rate=0.5)
+        self.assertNotIn('_profiler', culture.__dict__)
+        self.assertFalse(culture.profiling)
+
+    def test02_save(self):
+        """ Check that saving a profiled simulation writes its profile alongside. """
+        simulation = GrowthSimulation(0.5, 0.2, recombination_duration=2, min_population=5, seed=0)
+        simulation.enable_profiling()
+        simulation.run()
+        with TemporaryDirectory() as path:
+            simulation.save(path)
+            profile = read_csv(join(path, 'profile.csv'))
+        self.assertEqual(len(profile), len(simulation.profiler))
+        self.assertEqual(profile.population.iloc[-1], simulation.size)
@@ -0,0 +1,192 @@
+from unittest import TestCase
+import numpy as np
+import networkx as nx
+from scipy.spatial.distance import cdist
+from growth import Culture
+from growth.spatial.index import SpatialIndex
+from growth.spatial.triangulation import LocalTriangulation
+from growth.spatial.edges import EdgeStatistics
+from growth.spatial.relaxation import LocalRelaxation, GlobalRelaxation, MultilevelRelaxation
+from growth.cells.patches import Patches, label_patches
+from growth.cells.clones import label_clones
+
+
+class TestSpatialIndex(TestCase):
+    """
+    Tests for spatial index queries.
+    """
+
+    @classmethod
+    def setUpClass(cls):
+        """ Initialize spatial index. """
+        cls.xy = np.random.random((500, 2))
+        cls.index = SpatialIndex(cls.xy, skin=0.05)
+
+    def brute_force_pairs(self, xy, radius):
+        """ Returns set of (i, j) pairs within <radius>. """
+        i, j = ((cdist(xy, xy) <= radius) & ~np.eye(len(xy), dtype=bool)).nonzero()
+        return set(zip(i[i<j], j[i<j]))
+
+    def test00_pairs(self):
+        """ Check radius pairs against brute force. """
+        pairs = set(map(tuple, self.index.query_pairs(0.05)))
+        self.assertEqual(pairs, self.brute_force_pairs(self.xy, 0.05))
+
+    def test01_update(self):
+        """ Check that queries remain exact after points move without a rebuild. """
+        xy = self.xy + np.random.normal(scale=0.005, size=self.xy.shape)
+        tree = self.index.tree
+        self.index.update(xy)
+        self.assertTrue(self.index.tree is tree)
+        pairs = set(map(tuple, self.index.query_pairs(0.05)))
+        self.assertEqual(pairs, self.brute_force_pairs(xy, 0.05))
+
+    def test02_in_place(self):
+        """ Check that queries remain exact after positions are updated in place. """
+        xy = self.xy.copy()
+        index = SpatialIndex(xy, skin=0.05)
+        xy += np.random.uniform(-0.03, 0.03, size=xy.shape)
+        index.update(xy)
+        counts = index.count_radius(xy[:20], 0.05)
+        expected = (cdist(xy[:20], xy) <= 0.05).sum(axis=1)
+        self.assertTrue(np.array_equal(counts, expected))
+        pairs = set(map(tuple, index.query_pairs(0.05)))
+        self.assertEqual(pairs, self.brute_force_pairs(xy, 0.05))
+
+    def test03_boundary(self):
+        """ Check that pairs separated by exactly the search radius are included. """
+        index = SpatialIndex(np.array([[0., 0.], [0.5, 0.], [1.5, 0.]]), skin=0.1)
+        self.assertEqual(index.query_pairs(0.5).tolist(), [[0, 1]])
+
+
+class TestTriangulation(TestCase):
+    """
+    Tests for triangulation-derived interface lengths.
+    """
+
+    def test00_sliver(self):
+        """ Check that interfaces of a sliver triangle extend no further than one edge length from each edge midpoint. """
+        x, y = np.array([0., 1., 0.5]), np.array([0., 0., 0.01])
+        triangulation = LocalTriangulation(x, y)
+        edges = np.array([[0, 1], [1, 2], [0, 2]])
+        lengths = triangulation.get_interface_lengths(edges)
+        limits = triangulation.evaluate_edge_lengths(edges, x, y)
+        self.assertTrue((lengths <= limits + 1e-12).all())
+        self.assertAlmostEqual(lengths[0], 1.)
+
+    def test01_connecting_edges(self):
+        """ Check that connecting edges are found for each node, and that a node absent from all edges raises an error. """
+        edges = np.array([[0, 1], [2, 1], [3, 2]])
+        connecting = LocalTriangulation.find_connecting_edges(edges, np.array([2, 3]))
+        self.assertEqual(connecting.tolist(), [[2, 1], [3, 2]])
+        with self.assertRaises(ValueError):
+            LocalTriangulation.find_connecting_edges(edges, np.array([2, 4]))
+
+
+class TestEdgeStatistics(TestCase):
+    """
+    Tests for genotype edge statistics.
+    """
+
+    def test00_contacts(self):
+        """ Check contact counts for a small graph. """
+        edges = np.array([[0, 1], [1, 0], [1, 2], [2, 3], [3, 0], [0, 1]])
+        genotypes = np.array([0, 0, 1, 2])
+        statistics = EdgeStatistics(edges, genotypes)
+        expected = np.array([[1, 1, 1], [1, 0, 1], [1, 1, 0]])
+        self.assertEqual(statistics.num_edges, 4)
+        self.assertTrue(np.array_equal(statistics.contact_matrix, expected))
+        self.assertAlmostEqual(statistics.heterogeneity, 3/4)
+
+
+class TestRelaxation(TestCase):
+    """
+    Tests for local and global relaxation.
+    """
+
+    def test00_chain(self):
+        """ Check that displaced nodes of a chain return to their equilibrium spacing. """
+        xy = np.vstack((np.arange(7), np.zeros(7))).T.astype(float)
+        edges = np.vstack((np.arange(6), np.arange(1, 7))).T
+        displaced = xy.copy()
+        displaced[3] = (3.2, 0.3)
+        displaced[2] = (2.1, 0.)
+        relaxation = LocalRelaxation(displaced, edges, [3], k=1)
+        self.assertEqual(sorted(relaxation.free), [2, 3, 4])
+        relaxed = relaxation.run()
+        self.assertLess(relaxation.energy, 1e-4)
+        self.assertTrue(np.allclose(relaxed[:, 0], xy[:, 0], atol=1e-2))
+
+    def test01_global(self):
+        """ Check that global relaxation reproduces the Kamada-Kawai layout. """
+        graph = nx.grid_2d_graph(4, 4)
+        graph = nx.convert_node_labels_to_integers(graph)
+        np.random.seed(0)
+        xy = np.random.random((16, 2))
+        expected = nx.kamada_kawai_layout(graph, pos=dict(enumerate(xy)))
+        expected = np.array([expected[i] for i in range(16)])
+        relaxation = GlobalRelaxation(xy, np.array(graph.edges()))
+        relaxed = relaxation.run()
+        self.assertTrue(relaxation.converged)
+
+        # layouts may differ by a rotation and the accompanying rescaling
+        relaxed, expected = cdist(relaxed, relaxed), cdist(expected, expected)
+        self.assertTrue(np.allclose(relaxed/relaxed.max(), expected/expected.max(), atol=1e-3))
+
+    def test02_multilevel(self):
+        """ Check that multilevel relaxation restores a distorted lattice. """
+        graph = nx.triangular_lattice_graph(30, 60)
+        graph = nx.convert_node_labels_to_integers(graph, label_attribute='position')
+        xy = np.array([graph.nodes[i]['pos'] for i in range(len(graph))])
+        np.random.seed(0)
+        distorted = xy * (1 + 0.5*xy[:, :1]/xy[:, 0].max()) + np.random.normal(scale=0.1, size=xy.shape)
+        relaxation = MultilevelRelaxation(distorted, np.array(graph.edges()), coarsest=100)
+        relaxation.run()
+        self.assertGreater(len(relaxation.levels), 2)
+        self.assertLess(relaxation.strain, 0.05)
+        self.assertGreater(relaxation.separation, 0.8)
+
+    def test03_culture(self):
+        """ Check that global relaxation of a small culture matches networkx.kamada_kawai_layout without drawing random numbers. """
+        np.random.seed(0)
+        culture = Culture(reference_population=50)
+        culture.grow(50, division_rate=0.5)
+        graph = culture.weighted_xy_graph
+        radius = np.sqrt(culture.size / culture.reference_population)
+        expected = nx.kamada_kawai_layout(graph, pos=dict(enumerate(culture.xy)), scale=radius, weight='weight')
+        expected = np.array([expected[i] for i in range(culture.size)])
+
+        state = np.random.get_state()[1].copy()
+        culture.move()
+        self.assertTrue(np.array_equal(np.random.get_state()[1], state))
+        self.assertTrue(np.allclose(culture.xy, expected, atol=1e-6*radius))
+
+
+class TestPatches(TestCase):
+    """
+    Tests for patch labeling.
+    """
+
+    def test00_labels(self):
+        """ Check patch sizes and boundaries for a small graph. """
+        edges = np.array([[0, 1], [1, 2], [2, 3], [3, 4], [4, 5], [1, 4]])
+        genotypes = np.array([0, 0, 2, 2, 0, 1])
+        labels = label_patches(edges, genotypes)
+        patches = Patches(labels, genotypes, include=(0, 2),
+                          edge_statistics=EdgeStatistics(edges, genotypes))
+        self.assertEqual(patches.num_patches, 2)
+        self.assertEqual(sorted(patches.sizes), [2, 3])
+        self.assertEqual(sorted(patches.boundary_edges), [2, 3])
+
+    def test01_clones(self):
+        """ Check clone labels for a small phylogenetic tree. """
+        lineages = ['00', '010', '011', '10', '11']
+        genotypes = np.array([0, 0, 0, 0, 2])
+        labels = label_clones(lineages, genotypes)
+        self.assertTrue(np.array_equal(labels, [0, 0, 0, 1, 2]))
+
+    def test02_incomplete(self):
+        """ Check that clones of an incomplete phylogenetic tree are not labeled. """
+        for lineages in (['00', '011', '10', '11'], ['01', '10']):
+            with self.assertRaises(ValueError):
+                label_clones(lineages, np.zeros(len(lineages), dtype=int))
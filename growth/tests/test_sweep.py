@@ -0,0 +1,80 @@
+from unittest import TestCase
+from tempfile import TemporaryDirectory
+import numpy as np
+from growth.sweep.sweep import Sweep
+from growth.sweep.simulation import GrowthSimulation
+from growth.sweep.metrics import MetricEvaluator
+
+
+class TestMetricEvaluator(TestCase):
+    """
+    Tests for batch evaluation of metrics across simulations.
+    """
+
+    metrics = ('population', 'percent_heterozygous', 'transclone_edges', 'clones')
+
+    @classmethod
+    def setUpClass(cls):
+        """ Run two small simulations with differing recombination rates. """
+        cls.simulations = []
+        for seed, recombination_rate in enumerate((0.2, 0.5)):
+            simulation = GrowthSimulation(0.5, recombination_rate, recombination_duration=3, min_population=6, seed=seed)
+            simulation.run()
+            cls.simulations.append(simulation)
+
+    def test00_processes(self):
+        """ Check that metrics evaluated in a process pool match those evaluated directly on each simulation. """
+        evaluator = MetricEvaluator(self.metrics, max_workers=2, processes=True)
+        data = evaluator.evaluate(self.simulations)
+
+        # one row per simulation, identified by simulation_id and followed by parameters and metric values
+        self.assertEqual(len(data), len(self.simulations))
+        self.assertEqual(list(data.simulation_id), [0, 1])
+        columns = ['simulation_id'] + list(self.simulations[0].parameters)
+        columns += ['population', 'percent_heterozygous', 'transclone_edges']
+        columns += ['num_clones', 'mean_clone_size', 'median_clone_size', 'clone_size_variation']
+        self.assertEqual(list(data.columns), columns)
+
+        for row, simulation in zip(data.itertuples(), self.simulations):
+            self.assertEqual(row.recombination_rate, simulation.recombination_rate)
+            self.assertEqual(row.population, simulation.size)
+            self.assertAlmostEqual(row.percent_heterozygous, simulation.percent_heterozygous)
+            self.assertAlmostEqual(row.transclone_edges, simulation.heterogeneity)
+            clone_sizes = np.asarray(simulation.get_clone_sizes())
+            self.assertEqual(row.num_clones, clone_sizes.size)
+            self.assertAlmostEqual(row.mean_clone_size, clone_sizes.mean())
+
+
+class TestSweep(TestCase):
+    """
+    Tests for building parameter sweeps.
+    """
+
+    def test00_shared_prefix(self):
+        """ Check that simulations sharing a start generation and replicate branch from a common prefix with independent seeds. """
+        sweep = Sweep(division_rate=0.5, duration=1, first_start=3, last_start=3,
+                      min_rate=0.2, max_rate=0.8, num_rates=2,
+                      min_population=5, num_replicates=2, seed=0)
+        with TemporaryDirectory() as directory:
+            sweep.make_directory(directory)
+            sweep.build_simulations()
+            simulations = [sweep.load_simulation(i) for i in range(sweep.N)]
+
+        # simulations 0 and 2, and 1 and 3, share a start and replicate but differ in rate
+        for i, j in ((0, 2), (1, 3)):
+            a, b = simulations[i], simulations[j]
+            self.assertNotEqual(a.recombination_rate, b.recombination_rate)
+            self.assertNotEqual(a.seed, b.seed)
+            self.assertEqual(len(a.history), len(b.history))
+            for cells_a, cells_b in zip(a.history, b.history):
+                xy_a = np.array([cell.xy for cell in cells_a])
+                xy_b = np.array([cell.xy for cell in cells_b])
+                self.assertTrue(np.array_equal(xy_a, xy_b))
+
+        # replicates grow from distinct prefixes
+        self.assertFalse(np.array_equal(simulations[0].xy, simulations[1].xy))
+
+        # each simulation runs to completion
+        for simulation in simulations:
+            self.assertTrue(simulation.run())
+            self.assertGreaterEqual(simulation.size, 2**5)
@@ -1,7 +1,7 @@
 import numpy as np
-import matplotlib.pyplot as plt
-from matplotlib import animation
-from matplotlib.animation import FuncAnimation
+from ..imports import lazy_import
+plt = lazy_import('matplotlib.pyplot')
+animation = lazy_import('matplotlib.animation')
 from matplotlib.colors import Normalize
 
 
@@ -59,7 +59,7 @@ class Animation:
         self.update(self.frames[0], kwargs)
 
         # generate animation
-        animation = FuncAnimation(fig,
+        anim = animation.FuncAnimation(fig,
                            func=self.update,
                            frames=self.frames,
                            interval=interval,
@@ -67,7 +67,7 @@ class Animation:
                            fargs=(kwargs,),
                            repeat_delay=repeat_delay)
 
-        return animation
+        return anim
 
     def get_video(self, **kwargs):
         return self.animate(**kwargs).to_html5_video()
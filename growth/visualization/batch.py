@@ -1,6 +1,7 @@
 from math import floor
 import numpy as np
-import matplotlib.pyplot as plt
+from ..imports import lazy_import
+plt = lazy_import('matplotlib.pyplot')
 
 
 class BatchVisualization:
@@ -1,12 +1,13 @@
-import matplotlib.pyplot as plt
-from matplotlib.colorbar import ColorbarBase
+from ..imports import lazy_import
+plt = lazy_import('matplotlib.pyplot')
+colorbar = lazy_import('matplotlib.colorbar')
 from matplotlib.colors import Normalize
 
 
 class ColorBar:
     def __init__(self,
                  figsize=(2, 0.1),
-                 cmap=plt.cm.viridis,
+                 cmap='viridis',
                  vlim=(0, 1),
                  orient='horizontal',
                  label=None):
@@ -25,7 +26,7 @@ class ColorBar:
         return fig, ax
 
     def render(self):
-        cbar = ColorbarBase(self.ax,
+        cbar = colorbar.ColorbarBase(self.ax,
                             cmap=self.cmap,
                             norm=self.norm,
                             orientation=self.orient)
@@ -46,4 +47,4 @@ class ColorBar:
 class ErrorColorBar(ColorBar):
 
     def __init__(self, **kwargs):
-        super().__init__(cmap=plt.cm.seismic, **kwargs)
+        super().__init__(cmap='seismic', **kwargs)
@@ -1,5 +1,6 @@
 import numpy as np
-import matplotlib.pyplot as plt
+from ..imports import lazy_import
+plt = lazy_import('matplotlib.pyplot')
 from matplotlib.colors import Normalize
 from .animation import Animation
 
@@ -19,13 +20,15 @@ class CultureVisualization:
              colorby='genotype',
              tri=False,
              s=2,
-             cmap=plt.cm.viridis):
+             cmap=None):
         """
         Scatter cells in space.
 
         """
 
         # evaluate marker colors
+        if cmap is None:
+            cmap = plt.cm.viridis
         if colorby == 'genotype':
             norm = Normalize(0, 2)
             c = cmap(norm(self.genotypes))
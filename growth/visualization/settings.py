@@ -1,6 +1,7 @@
 __author__ = 'Sebastian Bernasek'
 
-import matplotlib.pyplot as plt
+from ..imports import lazy_import
+plt = lazy_import('matplotlib.pyplot')
 
 # labels
 labelpad = 1
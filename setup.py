@@ -12,7 +12,7 @@ setup(
     version='v0.1',
     author='Sebastian Bernasek',
     author_email='sebastian@u.northwestern.com',
-    packages=find_packages(exclude=('tests', 'scripts', 'sweep')),
+    packages=find_packages(exclude=('tests', 'scripts', 'sweep', 'benchmarks')),
     scripts=[],
     url='https://github.com/sebastianbernasek/growth',
     license='MIT',
@@ -25,6 +25,7 @@ setup(
         "scipy >= 1.1.0",
         "networkx>=2.2",
         "pandas>=0.23.4"],
+    extras_require={'jit': ['numba>=0.50']},
     tests_require=['nose'],
     test_suite='nose.collector'
 )